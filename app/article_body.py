@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+
+from .cassette import default_cassette
+from .http_cache import DEFAULT_HEADERS, default_http_cache
+from .text_tokens import estimate_tokens
+
+
+# 본문이 아닐 가능성이 높은 블록 (class/id 기준)
+_BOILERPLATE_RE = re.compile(
+    r"(comment|footer|header|gnb|lnb|nav|menu|share|sns|social|related|recommend|banner|"
+    r"\bads?\b|advert|sponsor|copyright|subscribe|popular|ranking|breadcrumb|sidebar|aside)",
+    re.I,
+)
+_BODY_HINT_RE = re.compile(r"(article|news_?body|newsct|news_?view|content_?body|view_?cont|body_?text|본문)", re.I)
+# 본문 안에 섞여 나오는 꼬리 문구
+_TAIL_RE = re.compile(r"(무단\s*전재|재배포\s*금지|저작권자|ⓒ|©|Copyright|기자\s*[\w.-]+@|구독하기|좋아요|많이 본 뉴스)", re.I)
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_NUMBER_RE = re.compile(r"\d[\d,.]*\s*(%|퍼센트|억|만|천|조|원|명|개|건|배|위|년|개월|주|일)?")
+
+
+def _link_density(el: Any) -> float:
+    text = el.get_text(" ", strip=True)
+    if not text:
+        return 1.0
+    linked = sum(len(a.get_text(" ", strip=True)) for a in el.find_all("a"))
+    return linked / len(text)
+
+
+def extract_main_text(html: str) -> Dict[str, str]:
+    """
+    Returns {"title", "canonical", "text"}.
+    - script/style/nav/footer 등과 boilerplate class/id 블록 제거
+    - articleBody/본문 힌트 블록 우선, 없으면 링크 비율이 낮고 텍스트가 가장 긴 블록
+    - 짧은 줄 중 저작권/기자 꼬리 문구는 제거
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    canonical = ""
+    link = soup.find("link", attrs={"rel": "canonical"})
+    if link and link.get("href"):
+        canonical = str(link["href"]).strip()
+    if not canonical:
+        og = soup.find("meta", attrs={"property": "og:url"})
+        canonical = str(og.get("content") or "").strip() if og else ""
+    og_title = soup.find("meta", attrs={"property": "og:title"})
+    title = str(og_title.get("content") or "").strip() if og_title else (soup.title.get_text(strip=True) if soup.title else "")
+
+    for tag in soup(["script", "style", "noscript", "iframe", "form", "nav", "header", "footer", "aside", "button", "svg"]):
+        tag.decompose()
+    for el in soup.find_all(True):
+        if el.attrs is None:
+            continue
+        marker = " ".join(el.get("class") or []) + " " + str(el.get("id") or "")
+        if el.name not in ("html", "body") and _BOILERPLATE_RE.search(marker) and not _BODY_HINT_RE.search(marker):
+            el.decompose()
+
+    best = soup.find(attrs={"itemprop": "articleBody"}) or soup.find("article")
+    if best is None:
+        hinted = [
+            el
+            for el in soup.find_all(["div", "section", "td"])
+            if _BODY_HINT_RE.search(" ".join(el.get("class") or []) + " " + str(el.get("id") or ""))
+        ]
+        candidates = hinted or soup.find_all(["div", "section", "td"])
+        scored = [
+            (len(el.get_text(" ", strip=True)), el)
+            for el in candidates
+            if _link_density(el) < 0.5
+        ]
+        best = max(scored, key=lambda x: x[0])[1] if scored else (soup.body or soup)
+
+    lines: List[str] = []
+    for raw in best.get_text("\n").split("\n"):
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        if len(line) < 40 and _TAIL_RE.search(line):
+            continue
+        lines.append(line)
+    return {"title": title, "canonical": canonical, "text": "\n".join(lines)}
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENT_SPLIT_RE.split(text or "") if s and len(s.strip()) >= 8]
+
+
+def build_excerpt(text: str, *, aliases: Sequence[str] = (), budget_tokens: int = 600, lead: int = 2) -> str:
+    """
+    토큰 예산 안에서 추출용 발췌를 만든다.
+    - 리드(앞 lead 문장)는 항상 먼저
+    - 나머지는 수치 포함(+2/개, 최대 +4), 회사 별칭 언급(+2) 점수가 높은 문장부터 예산까지
+    - 고른 문장은 원문 순서대로 이어 붙인다
+    """
+    sents = split_sentences(text)
+    if not sents:
+        return ""
+    names = [a.lower() for a in aliases if a]
+
+    def score(s: str) -> int:
+        sc = min(4, 2 * len([m for m in _NUMBER_RE.finditer(s) if m.group(1)]))
+        if any(n in s.lower() for n in names):
+            sc += 2
+        return sc
+
+    chosen: List[int] = []
+    used = 0
+    for i in range(min(lead, len(sents))):
+        t = estimate_tokens(sents[i])
+        if used + t > budget_tokens and chosen:
+            break
+        chosen.append(i)
+        used += t
+
+    rest = sorted(
+        (i for i in range(len(chosen), len(sents)) if score(sents[i]) > 0),
+        key=lambda i: (-score(sents[i]), i),
+    )
+    for i in rest:
+        t = estimate_tokens(sents[i])
+        if used + t > budget_tokens:
+            continue
+        chosen.append(i)
+        used += t
+    return "\n".join(sents[i] for i in sorted(chosen))
+
+
+_GNEWS_HOST = "news.google.com"
+_GNEWS_ID_RE = re.compile(r"^/(?:rss/)?articles/([A-Za-z0-9_-]+)")
+_GNEWS_BATCH_URL = "https://news.google.com/_/DotsSplashUi/data/batchexecute"
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid", "spm"}
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+
+def canonical_url(url: str) -> str:
+    """
+    캐시/요청 키용 URL 정규화: 트래킹 파라미터(utm_* 등)와 #fragment 제거, 호스트 소문자.
+    나머지 쿼리(기사 id 등)는 순서까지 그대로 둔다.
+    """
+    try:
+        parts = urlsplit((url or "").strip())
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+    query = "&".join(
+        kv
+        for kv in parts.query.split("&")
+        if kv and not (k := kv.split("=", 1)[0].lower()).startswith("utm_") and k not in _TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def _host(url: str) -> str:
+    try:
+        host = (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def _gnews_id(url: str) -> Optional[str]:
+    # news.google.com/rss/articles/<id> 형태의 Google News RSS 링크면 기사 id
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if (parts.hostname or "").lower() != _GNEWS_HOST:
+        return None
+    m = _GNEWS_ID_RE.match(parts.path)
+    return m.group(1) if m else None
+
+
+def _decode_gnews_id(article_id: str) -> Optional[str]:
+    # 구형 id("CBMi...")는 언론사 URL을 담은 protobuf의 base64 → 네트워크 없이 꺼낸다
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    m = re.search(rb"https?://[\x21-\x7e]+", raw)
+    return m.group(0).decode("ascii") if m else None
+
+
+@dataclass(frozen=True)
+class ArticleFetcher:
+    """
+    기사 원문 병렬 수집 + 본문 추출 + 캐시.
+
+    data/cache/articles/
+      - <canonical URL hash>.json: {"canonical", "title", "text", "fetched_at"} (원문 URL이 달라도 같은 기사는 한 번만)
+      - alias/<요청 URL hash>: canonical URL (리다이렉트 URL → 기사)
+    - 요청 URL은 canonical_url()로 트래킹 파라미터를 떼고 조회/요청 (utm_* 만 다른 URL은 한 번만 받음)
+    - Google News RSS 링크(news.google.com/rss/articles/...)는 언론사 기사 URL로 풀어서 받는다
+      (못 풀면 받지 않음 → RSS 요약)
+    - 페이지의 canonical이 받은 URL과 다른 호스트면 캐시 키로 쓰지 않는다 (받은 URL 기준)
+    - 공용 세션(default_http_cache().session, 연결 재사용) + workers 스레드, record/replay 대상
+    - 실패(HTTP 오류/본문 없음)는 캐시하지 않는다 → 호출자는 RSS 요약으로 대체
+    """
+    cache_dir: Path = Path("data/cache/articles")
+    workers: int = 6
+    timeout: int = 15
+    min_chars: int = 200
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    @staticmethod
+    def from_env() -> "ArticleFetcher":
+        try:
+            workers = int(os.environ.get("ARTICLE_FETCH_WORKERS") or 6)
+        except ValueError:
+            workers = 6
+        return ArticleFetcher(cache_dir=Path(os.environ.get("ARTICLE_CACHE_DIR", "data/cache/articles")), workers=workers)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _alias_path(self, url: str) -> Path:
+        return self.cache_dir / "alias" / _sha(url)
+
+    def _body_path(self, canonical: str) -> Path:
+        return self.cache_dir / f"{_sha(canonical)}.json"
+
+    def cached(self, url: str) -> Optional[Dict[str, Any]]:
+        url = canonical_url(url)
+        alias = self._alias_path(url)
+        canonical = alias.read_text(encoding="utf-8").strip() if alias.exists() else url
+        p = self._body_path(canonical)
+        if not p.exists():
+            return None
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return None
+
+    def _write(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+
+    def _resolve_remote(self, article_id: str) -> Optional[str]:
+        # 신형 id는 기사 페이지의 서명(data-n-a-sg/ts)으로 batchexecute에 원문 URL을 묻는다
+        session = default_http_cache().session
+        page_url = f"https://{_GNEWS_HOST}/rss/articles/{article_id}"
+
+        def get() -> Dict[str, Any]:
+            page = session.get(page_url, headers=DEFAULT_HEADERS, timeout=self.timeout)
+            sig = re.search(r'data-n-a-sg="([^"]+)"', page.text)
+            ts = re.search(r'data-n-a-ts="([^"]+)"', page.text)
+            if page.status_code >= 400 or not sig or not ts:
+                return {"url": ""}
+            inner = [
+                "garturlreq",
+                [["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1, None, None, None, None, None, 0, 1],
+                 "X", "X", 1, [1, 1, 1], 1, 1, None, 0, 0, None, 0],
+                article_id,
+                int(ts.group(1)),
+                sig.group(1),
+            ]
+            req = [[["Fbv4je", json.dumps(inner), None, "generic"]]]
+            r = session.post(
+                _GNEWS_BATCH_URL,
+                data={"f.req": json.dumps(req)},
+                headers={**DEFAULT_HEADERS, "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"},
+                timeout=self.timeout,
+            )
+            if r.status_code >= 400:
+                raise RuntimeError(f"HTTP {r.status_code}")
+            # 응답: )]}'\n\n[[..., ..., "<json>"]] → json의 [1]이 원문 URL
+            outer = json.loads(r.text.split("\n\n", 1)[1])
+            return {"url": str(json.loads(outer[0][2])[1])}
+
+        try:
+            found = default_cassette().call("http", {"url": page_url, "op": "resolve"}, get, label=page_url)["url"]
+        except Exception as e:
+            print(f"[WARN] google news link resolve failed: {page_url} / {type(e).__name__}: {e}")
+            return None
+        return found or None
+
+    def resolve(self, url: str) -> str:
+        """
+        Google News RSS 링크면 언론사 기사 URL, 아니면 그대로. 못 풀면 원래 URL.
+        """
+        article_id = _gnews_id(url)
+        if article_id is None:
+            return url
+        found = _decode_gnews_id(article_id) or self._resolve_remote(article_id)
+        if not found or _gnews_id(found) is not None:
+            self._count("unresolved")
+            return url
+        self._count("resolved")
+        return canonical_url(found)
+
+    def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        url = canonical_url(url)
+        hit = self.cached(url)
+        if hit is not None:
+            self._count("cached")
+            return hit
+
+        target = self.resolve(url)
+        if _host(target) == _GNEWS_HOST:
+            # Google News 중간 페이지는 기사 본문이 아니다
+            self._count("no_body")
+            return None
+        if target != url:
+            hit = self.cached(target)
+            if hit is not None:
+                self._count("cached")
+                self._write(self._alias_path(url), hit.get("canonical") or target)
+                return hit
+
+        session = default_http_cache().session
+
+        def get() -> Dict[str, Any]:
+            r = session.get(target, headers=DEFAULT_HEADERS, timeout=self.timeout)
+            if "charset" not in (r.headers.get("Content-Type") or "").lower():
+                r.encoding = r.apparent_encoding
+            return {"status": r.status_code, "url": r.url, "text": r.text, "bytes": len(r.content)}
+
+        try:
+            r = default_cassette().call("http", {"url": target}, get, label=target)
+            if r["status"] >= 400:
+                raise RuntimeError(f"HTTP {r['status']}")
+            main = extract_main_text(r["text"])
+        except Exception as e:
+            self._count("failed")
+            print(f"[WARN] article fetch failed: {target} / {type(e).__name__}: {e}")
+            return None
+
+        self._count("bytes", int(r.get("bytes", 0)))
+        if len(main["text"]) < self.min_chars:
+            # 리다이렉트/동의 페이지 등: 본문이 아님
+            self._count("no_body")
+            return None
+
+        fetched = canonical_url(r.get("url") or target)
+        if _host(fetched) == _GNEWS_HOST:
+            self._count("no_body")
+            return None
+        canonical = canonical_url(main["canonical"]) if main["canonical"] else fetched
+        if _host(canonical) != _host(fetched):
+            # 다른 사이트(포털/구글 등)를 가리키는 canonical은 믿지 않는다
+            self._count("canonical_rejected")
+            canonical = fetched
+        body = {
+            "canonical": canonical,
+            "title": main["title"],
+            "text": main["text"],
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        p = self._body_path(canonical)
+        if p.exists():
+            # 다른 URL로 이미 받은 같은 기사
+            self._count("canonical_hit")
+        else:
+            self._write(p, json.dumps(body, ensure_ascii=False))
+            self._count("fetched")
+        for u in {url, target}:
+            if u != canonical:
+                self._write(self._alias_path(u), canonical)
+        return body
+
+    def fetch_many(self, urls: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns {요청 URL: body}. 실패한 URL은 빠진다. 정규화하면 같은 URL은 한 번만 받는다.
+        """
+        keys = {u: canonical_url(u) for u in urls}
+        todo = list(dict.fromkeys(keys.values()))
+        if not todo:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(todo)))) as pool:
+            bodies = dict(zip(todo, pool.map(self.fetch, todo)))
+        return {u: bodies[k] for u, k in keys.items() if bodies.get(k) is not None}
+
+    def summary_line(self) -> str:
+        s = self.stats
+        line = (
+            f"캐시 {s.get('cached', 0)} / 신규 {s.get('fetched', 0)} / 같은 기사 {s.get('canonical_hit', 0)} / "
+            f"본문없음 {s.get('no_body', 0)} / 실패 {s.get('failed', 0)}"
+        )
+        if s.get("unresolved"):
+            line += f" / 구글뉴스 링크 미해석 {s['unresolved']}"
+        if s.get("excerpts"):
+            line += (
+                f" / 발췌 평균 {s.get('excerpt_tokens', 0) // s['excerpts']}토큰 "
+                f"(본문 평균 {s.get('body_tokens', 0) // s['excerpts']})"
+            )
+        return line
+
+    def excerpt(self, body: Dict[str, Any], *, aliases: Sequence[str], budget_tokens: int) -> str:
+        ex = build_excerpt(body.get("text", ""), aliases=aliases, budget_tokens=budget_tokens)
+        self._count("excerpts")
+        self._count("excerpt_tokens", estimate_tokens(ex))
+        self._count("body_tokens", estimate_tokens(body.get("text", "")))
+        return ex
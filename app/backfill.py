@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .collector_rss import collect_news_for_competitor
+from .dedup import dedup_by_url
+from .fact_extractor_vertex import FactExtractor
+from .runtime import env_int, fact_store, to_utc, vertex_llm_from_env
+from .storage_fact import FactStore
+
+
+@dataclass(frozen=True)
+class Chunk:
+    competitor: str
+    start: date  # 포함
+    end: date    # 미포함
+
+    @property
+    def name(self) -> str:
+        return f"{self.start.isoformat()}_{self.end.isoformat()}"
+
+
+def split_range(since: date, until: date, *, step_days: int) -> List[tuple[date, date]]:
+    """
+    [since, until] 구간(양끝 포함)을 step_days 단위 [start, end) 창으로 나눈다.
+    """
+    out: List[tuple[date, date]] = []
+    d = since
+    last = until + timedelta(days=1)
+    while d < last:
+        e = min(d + timedelta(days=step_days), last)
+        out.append((d, e))
+        d = e
+    return out
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """
+    과거 기간 Fact 백필.
+
+    - 기간을 일/주 단위 창으로 나눠 Google News after:/before: 로 경쟁사별 수집
+    - 창(chunk) 단위로 병렬 처리, LLM 호출은 VertexLLM의 RateLimiter로 제한
+      (--qpm, 기본 LLM_QPM 또는 60. 한도 없이 병렬 워커를 띄우지 않는다)
+    - payload는 기사 발행일 파티션(data/facts/<published_date>)에 저장
+    - 끝난 창은 data/backfill/<competitor>/<start>_<end>.json 마커로 기록 → 재실행 시 스킵
+    - 여러 경쟁사 창에 같이 잡힌 기사는 먼저 선점한 창 하나만 추출 (창 간 URL 중복 제거)
+    """
+    extractor: FactExtractor
+    store: FactStore
+    state_dir: Path = Path("data/backfill")
+    max_items_per_chunk: int = 0  # 0 = 제한 없음
+    _claimed: Set[str] = field(default_factory=set, compare=False, repr=False)
+    _claim_lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    def _marker(self, chunk: Chunk) -> Path:
+        return self.state_dir / chunk.competitor / f"{chunk.name}.json"
+
+    def is_done(self, chunk: Chunk) -> bool:
+        return self._marker(chunk).exists()
+
+    def _claim(self, url: str) -> bool:
+        # 병렬 창끼리 같은 URL을 동시에 추출하지 않도록 선점
+        with self._claim_lock:
+            if url in self._claimed:
+                return False
+            self._claimed.add(url)
+            return True
+
+    def _release(self, url: str) -> None:
+        with self._claim_lock:
+            self._claimed.discard(url)
+
+    def run_chunk(self, chunk: Chunk) -> Dict[str, int]:
+        items = collect_news_for_competitor(chunk.competitor, after=chunk.start, before=chunk.end)
+        items = dedup_by_url(items, lambda x: x.url)
+
+        lo = datetime.combine(chunk.start, datetime.min.time(), tzinfo=timezone.utc)
+        hi = datetime.combine(chunk.end, datetime.min.time(), tzinfo=timezone.utc)
+
+        stats = {"collected": len(items), "saved": 0, "skipped_dup": 0, "skipped_range": 0, "failed": 0}
+        processed = 0
+        capped = False
+        for it in items:
+            pub = to_utc(it.published_at)
+            if pub is None or not (lo <= pub < hi):
+                stats["skipped_range"] += 1
+                continue
+            if self.store.exists_any(url=it.url):
+                stats["skipped_dup"] += 1
+                continue
+            if self.max_items_per_chunk and processed >= self.max_items_per_chunk:
+                capped = True
+                break
+            if not self._claim(it.url):
+                stats["skipped_dup"] += 1
+                continue
+            processed += 1
+
+            published_date = pub.strftime("%Y-%m-%d")
+            try:
+                fact_json = self.extractor.extract(
+                    source=it.source,
+                    url=it.url,
+                    title=it.title,
+                    raw_text=it.raw_summary or it.title,
+                )
+                self.store.save(
+                    url=it.url,
+                    source=it.source,
+                    title=it.title,
+                    published_date=published_date,
+                    fact_json=fact_json,
+                    date_utc=published_date,
+                )
+                stats["saved"] += 1
+            except Exception as e:
+                self._release(it.url)
+                stats["failed"] += 1
+                print(f"[WARN] backfill extract failed: {it.url} / {type(e).__name__}: {e}")
+
+        # 실패/상한 도달이 있으면 마커를 남기지 않아 다음 실행에서 이어서 처리
+        if not stats["failed"] and not capped:
+            p = self._marker(chunk)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(json.dumps(stats), encoding="utf-8")
+        return stats
+
+    def run(self, chunks: List[Chunk], *, workers: int = 4) -> Dict[str, int]:
+        totals = {"chunks": 0, "chunks_skipped": 0, "chunks_failed": 0}
+        pending = []
+        for c in chunks:
+            if self.is_done(c):
+                totals["chunks_skipped"] += 1
+            else:
+                pending.append(c)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(self.run_chunk, c): c for c in pending}
+            for fut in as_completed(futures):
+                c = futures[fut]
+                try:
+                    stats = fut.result()
+                except Exception as e:
+                    totals["chunks_failed"] += 1
+                    print(f"[WARN] backfill chunk failed: {c.competitor} {c.name} / {type(e).__name__}: {e}")
+                    continue
+                totals["chunks"] += 1
+                for k, v in stats.items():
+                    totals[k] = totals.get(k, 0) + v
+                print(f"[BACKFILL] {c.competitor} {c.name}: {stats}")
+        return totals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.backfill", description="과거 기간 Fact 백필")
+    ap.add_argument("--since", required=True, help="YYYY-MM-DD (포함)")
+    ap.add_argument("--until", required=True, help="YYYY-MM-DD (포함)")
+    ap.add_argument("--chunk", choices=("day", "week"), default="week")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--competitors", help="쉼표 구분 (기본: COMPETITORS env)")
+    ap.add_argument("--max-items-per-chunk", type=int, default=0)
+    ap.add_argument("--qpm", type=int, default=env_int("LLM_QPM", 0) or 60, help="LLM 분당 호출 한도 (기본: LLM_QPM 또는 60)")
+    args = ap.parse_args(argv)
+    if args.qpm <= 0:
+        raise SystemExit("--qpm must be > 0: backfill workers need an LLM rate limit")
+
+    competitors_raw = args.competitors or os.environ.get("COMPETITORS", "")
+    competitors = [c.strip() for c in competitors_raw.split(",") if c.strip()]
+    if not competitors:
+        raise SystemExit("No competitors: pass --competitors or set COMPETITORS")
+
+    windows = split_range(
+        date.fromisoformat(args.since),
+        date.fromisoformat(args.until),
+        step_days=1 if args.chunk == "day" else 7,
+    )
+    chunks = [Chunk(competitor=c, start=s, end=e) for c in competitors for s, e in windows]
+
+    backfill = Backfill(
+        extractor=FactExtractor(llm=vertex_llm_from_env("extract", qpm=args.qpm)),
+        store=fact_store(),
+        max_items_per_chunk=args.max_items_per_chunk,
+    )
+    totals = backfill.run(chunks, workers=args.workers)
+    print(f"[BACKFILL] done: {totals}")
+
+
+if __name__ == "__main__":
+    main()
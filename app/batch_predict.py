@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from .collector_rss import Item
+from .fact_extractor_vertex import FactExtractor
+from .fact_payload import FactPayload
+from .json_repair import repair_json, validate
+from .runtime import fact_store, vertex_llm_from_env
+from .signal_classifier_vertex import SignalClassifier
+from .storage_fact import FactStore, fact_key, url_key
+
+
+# 배치 출력 한 줄 -> (key, 응답 텍스트, 오류)
+Result = Tuple[str, str, str]
+
+
+def to_batch_line(key: str, req: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    generate_json 인자 -> Vertex 배치 예측 입력 한 줄 (GenerateContentRequest)
+    key는 최상위 필드와 labels 양쪽에 넣는다 (출력에 request가 그대로 되돌아옴)
+    """
+    return {
+        "key": key,
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": req["user_input"]}]}],
+            "systemInstruction": {"parts": [{"text": req["system_instruction"]}]},
+            "generationConfig": {
+                "temperature": req["temperature"],
+                "maxOutputTokens": req["max_output_tokens"],
+                "responseMimeType": "application/json",
+            },
+            "labels": {"key": key},
+        },
+    }
+
+
+def _request_digest(request: Dict[str, Any]) -> str:
+    # key 필드가 출력에 남지 않는 경우 요청 본문으로 매칭
+    return hashlib.sha256(json.dumps(request.get("contents"), sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def parse_output_line(line: Dict[str, Any], by_digest: Dict[str, str]) -> Result:
+    request = line.get("request") or {}
+    key = line.get("key") or (request.get("labels") or {}).get("key") or by_digest.get(_request_digest(request), "")
+    status = line.get("status")
+    if status:
+        return key, "", str(status)
+    try:
+        cand = (line.get("response") or {})["candidates"][0]
+        text = "".join(p.get("text", "") for p in cand["content"]["parts"])
+    except (KeyError, IndexError, TypeError):
+        return key, "", "no candidates"
+    if "MAX_TOKENS" in str(cand.get("finishReason", "")) and not text:
+        return key, "", "MAX_TOKENS"
+    return key, text.strip(), ""
+
+
+class Submitter(Protocol):
+    """
+    배치 작업 제출/상태/결과 스트리밍.
+    - submit: 요청 JSONL을 올리고 job id 반환
+    - poll: "running" | "succeeded" | "failed"
+    - results: 출력 JSONL 줄(dict)을 순서대로
+    """
+
+    name: str
+
+    def submit(self, requests_path: Path, job_name: str) -> str: ...
+
+    def poll(self, job_id: str) -> str: ...
+
+    def results(self, job_id: str) -> Iterator[Dict[str, Any]]: ...
+
+
+# (system_instruction, user_input, temperature, max_output_tokens) -> 응답 텍스트
+Respond = Callable[[str, str, float, int], str]
+
+
+@dataclass(frozen=True)
+class LocalSubmitter:
+    """
+    GCP 없이 배치 흐름을 돌리는 대체 제출기.
+    제출 시 요청 파일을 respond로 한 줄씩 처리해 data/batch/local/<job_id>/predictions.jsonl에
+    Vertex와 같은 출력 형식으로 쓰고, 상태는 status 파일로 남긴다.
+    """
+    respond: Respond
+    base_dir: Path = Path("data/batch/local")
+    name: str = "local"
+
+    def submit(self, requests_path: Path, job_name: str) -> str:
+        job_id = f"{job_name}-{int(time.time())}"
+        d = self.base_dir / job_id
+        d.mkdir(parents=True, exist_ok=True)
+        (d / "status").write_text("running", encoding="utf-8")
+        with requests_path.open(encoding="utf-8") as src, (d / "predictions.jsonl").open("w", encoding="utf-8") as out:
+            for raw in src:
+                line = json.loads(raw)
+                req = line["request"]
+                cfg = req.get("generationConfig") or {}
+                try:
+                    text = self.respond(
+                        req["systemInstruction"]["parts"][0]["text"],
+                        req["contents"][0]["parts"][0]["text"],
+                        float(cfg.get("temperature", 0.0)),
+                        int(cfg.get("maxOutputTokens", 2048)),
+                    )
+                    line["response"] = {"candidates": [{"content": {"parts": [{"text": text}]}, "finishReason": "STOP"}]}
+                    line["status"] = ""
+                except Exception as e:
+                    line["status"] = f"{type(e).__name__}: {e}"
+                out.write(json.dumps(line, ensure_ascii=False) + "\n")
+        (d / "status").write_text("succeeded", encoding="utf-8")
+        return job_id
+
+    def poll(self, job_id: str) -> str:
+        p = self.base_dir / job_id / "status"
+        return p.read_text(encoding="utf-8").strip() if p.exists() else "failed"
+
+    def results(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        with (self.base_dir / job_id / "predictions.jsonl").open(encoding="utf-8") as f:
+            for raw in f:
+                if raw.strip():
+                    yield json.loads(raw)
+
+
+@dataclass(frozen=True)
+class VertexBatchSubmitter:
+    """
+    Vertex AI 배치 예측 (요청/결과는 GCS 경유).
+    gcs_prefix 예: gs://bucket/batch
+    """
+    project_id: str
+    region: str
+    model_name: str
+    gcs_prefix: str
+    name: str = "vertex"
+
+    def _bucket_path(self, uri: str) -> Tuple[str, str]:
+        bucket, _, path = uri[len("gs://"):].partition("/")
+        return bucket, path
+
+    def submit(self, requests_path: Path, job_name: str) -> str:
+        import vertexai
+        from google.cloud import storage
+        from vertexai.batch_prediction import BatchPredictionJob
+
+        vertexai.init(project=self.project_id, location=self.region)
+        prefix = f"{self.gcs_prefix.rstrip('/')}/{job_name}"
+        bucket, path = self._bucket_path(f"{prefix}/requests.jsonl")
+        storage.Client(project=self.project_id).bucket(bucket).blob(path).upload_from_filename(str(requests_path))
+        job = BatchPredictionJob.submit(
+            source_model=self.model_name,
+            input_dataset=f"{prefix}/requests.jsonl",
+            output_uri_prefix=f"{prefix}/output",
+        )
+        return job.resource_name
+
+    def _job(self, job_id: str):
+        import vertexai
+        from vertexai.batch_prediction import BatchPredictionJob
+
+        vertexai.init(project=self.project_id, location=self.region)
+        return BatchPredictionJob(job_id)
+
+    def poll(self, job_id: str) -> str:
+        job = self._job(job_id)
+        job.refresh()
+        if not job.has_ended:
+            return "running"
+        return "succeeded" if job.has_succeeded else "failed"
+
+    def results(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        from google.cloud import storage
+
+        bucket, path = self._bucket_path(self._job(job_id).output_location)
+        client = storage.Client(project=self.project_id)
+        for blob in client.list_blobs(bucket, prefix=path):
+            if not blob.name.endswith(".jsonl"):
+                continue
+            with blob.open("r", encoding="utf-8") as f:
+                for raw in f:
+                    if raw.strip():
+                        yield json.loads(raw)
+
+
+@dataclass(frozen=True)
+class BatchRun:
+    """
+    배치 작업 하나: data/batch/<name>/
+      - requests.jsonl: 제출한 요청
+      - meta.jsonl: key별 결과 저장에 필요한 원본 정보
+      - job.json: 제출 기록 (있으면 재제출 없이 이어서 대기 → 중단 후 재실행 가능)
+      - done.json: 결과 반영 완료 통계
+    """
+    submitter: Submitter
+    name: str
+    base_dir: Path = Path("data/batch")
+    poll_sec: float = 30.0
+    timeout_sec: float = 6 * 3600
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def dir(self) -> Path:
+        return self.base_dir / self.name
+
+    def prepare(self, entries: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        entries: (key, generate_json 인자, meta). 이미 제출된 작업이면 그대로 둔다.
+        """
+        if (self.dir / "job.json").exists():
+            return sum(1 for _ in (self.dir / "meta.jsonl").open(encoding="utf-8"))
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with (self.dir / "requests.jsonl").open("w", encoding="utf-8") as rq, (self.dir / "meta.jsonl").open(
+            "w", encoding="utf-8"
+        ) as mt:
+            for key, req, meta in entries:
+                rq.write(json.dumps(to_batch_line(key, req), ensure_ascii=False) + "\n")
+                mt.write(json.dumps({"key": key, "meta": meta, "schema": req.get("schema")}, ensure_ascii=False) + "\n")
+        return len(entries)
+
+    def submit(self) -> str:
+        p = self.dir / "job.json"
+        if p.exists():
+            job = json.loads(p.read_text(encoding="utf-8"))
+            if job.get("submitter") == self.submitter.name:
+                return job["job_id"]
+        job_id = self.submitter.submit(self.dir / "requests.jsonl", self.name)
+        p.write_text(
+            json.dumps(
+                {
+                    "job_id": job_id,
+                    "submitter": self.submitter.name,
+                    "submitted_at": datetime.now(timezone.utc).isoformat(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        return job_id
+
+    def wait(self, job_id: str) -> str:
+        t0 = time.monotonic()
+        while True:
+            state = self.submitter.poll(job_id)
+            if state != "running":
+                return state
+            if time.monotonic() - t0 > self.timeout_sec:
+                raise TimeoutError(f"batch job still running after {self.timeout_sec:.0f}s: {job_id}")
+            print(f"[BATCH] {self.name}: running ({time.monotonic() - t0:.0f}s)")
+            time.sleep(self.poll_sec)
+
+    def parsed(self, job_id: str) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]], str]]:
+        """
+        결과를 스트리밍하며 key로 meta와 짝지어 (meta, JSON 값 또는 None, 오류)를 낸다.
+        meta는 메모리에 올리지만 출력 파일은 한 줄씩 읽는다.
+        """
+        metas: Dict[str, Dict[str, Any]] = {}
+        with (self.dir / "meta.jsonl").open(encoding="utf-8") as f:
+            for raw in f:
+                m = json.loads(raw)
+                metas[m["key"]] = m
+        by_digest: Dict[str, str] = {}
+        with (self.dir / "requests.jsonl").open(encoding="utf-8") as f:
+            for raw in f:
+                line = json.loads(raw)
+                by_digest[_request_digest(line["request"])] = line["key"]
+
+        seen = set()
+        for line in self.submitter.results(job_id):
+            key, text, err = parse_output_line(line, by_digest)
+            m = metas.get(key)
+            if m is None or key in seen:
+                self._count("unmatched")
+                continue
+            seen.add(key)
+            if err:
+                yield m["meta"], None, err
+                continue
+            res = repair_json(text)
+            if res is None:
+                yield m["meta"], None, "not valid JSON"
+                continue
+            if res.repaired:
+                self._count("repaired")
+            errors = validate(res.value, m["schema"]) if m.get("schema") else []
+            yield m["meta"], (None if errors else res.value), "; ".join(errors[:3])
+        self.stats["missing"] = len(metas) - len(seen)
+
+    def _count(self, key: str) -> None:
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    def run(self, apply: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> Dict[str, int]:
+        """
+        제출(또는 이어서) → 완료 대기 → 결과마다 apply(meta, value). 실패 항목은 저장하지 않으므로
+        다음 온라인/배치 실행에서 다시 대상이 된다.
+        """
+        done = self.dir / "done.json"
+        if done.exists():
+            return json.loads(done.read_text(encoding="utf-8"))
+        job_id = self.submit()
+        state = self.wait(job_id)
+        if state != "succeeded":
+            raise RuntimeError(f"batch job {state}: {job_id}")
+        self.stats.update({"saved": 0, "failed": 0})
+        for meta, value, err in self.parsed(job_id):
+            if value is None:
+                self._count("failed")
+                print(f"[WARN] batch result failed: {meta.get('url', '')} / {err}")
+                continue
+            apply(meta, value)
+            self._count("saved")
+        done.write_text(json.dumps(self.stats), encoding="utf-8")
+        return dict(self.stats)
+
+
+def extract_entries(items: List[Item], *, partition_by_published: bool) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    out = []
+    for it in items:
+        published_date = it.published_at.strftime("%Y-%m-%d") if it.published_at else None
+        req = FactExtractor.request(source=it.source, url=it.url, title=it.title, raw_text=it.raw_summary or it.title)
+        meta = {
+            "url": it.url,
+            "source": it.source,
+            "title": it.title,
+            "published_date": published_date,
+            "date_utc": published_date if partition_by_published else None,
+        }
+        out.append((url_key(it.url), req, meta))
+    return out
+
+
+def save_fact(store: FactStore) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    def apply(meta: Dict[str, Any], fact_json: Dict[str, Any]) -> None:
+        store.save(
+            url=meta["url"],
+            source=meta["source"],
+            title=meta["title"],
+            published_date=meta["published_date"],
+            fact_json=fact_json,
+            date_utc=meta.get("date_utc"),
+        )
+
+    return apply
+
+
+def classify_entries(payloads: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    out = []
+    for d in payloads:
+        p = FactPayload.from_dict(d)
+        if not p.has_fact:
+            continue
+        # 온라인 분류(_classify_cached)와 같은 입력
+        req = SignalClassifier.request(p.fact_dict())
+        out.append((fact_key(d), req, {"url": (d.get("meta") or {}).get("url", ""), "payload": d}))
+    return out
+
+
+def record_signal(store: FactStore) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    def apply(meta: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        store.record_signal(meta["payload"], signal)
+
+    return apply
+
+
+def _collect(competitors: List[str], since: Optional[date], until: Optional[date]) -> List[Item]:
+    from .backfill import split_range
+    from .collector_rss import collect_news_for_competitor
+    from .dedup import dedup_by_url
+
+    items: List[Item] = []
+    for c in competitors:
+        if since and until:
+            for s, e in split_range(since, until, step_days=7):
+                items.extend(collect_news_for_competitor(c, after=s, before=e))
+        else:
+            items.extend(collect_news_for_competitor(c))
+    return dedup_by_url(items, lambda x: x.url)
+
+
+def _submitter(kind: str, base_dir: Path, stage: str) -> Submitter:
+    if kind == "vertex":
+        llm = vertex_llm_from_env(stage)
+        prefix = os.environ.get("BATCH_GCS_PREFIX", "").strip()
+        if not prefix:
+            raise SystemExit("Missing env: BATCH_GCS_PREFIX (gs://bucket/path)")
+        return VertexBatchSubmitter(llm.project_id, llm.region, llm.model_name, prefix)
+
+    # 로컬: 온라인 호출로 처리 (IO_MODE=replay면 녹화 응답으로 GCP 없이)
+    llm = vertex_llm_from_env(stage)
+
+    def respond(system: str, user: str, temperature: float, max_output_tokens: int) -> str:
+        text, _ = llm._generate_text(system, user, temperature=temperature, max_output_tokens=max_output_tokens)
+        return text
+
+    return LocalSubmitter(respond, base_dir=base_dir / "local")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .timeline_index import TimelineIndex
+
+    ap = argparse.ArgumentParser(prog="python -m app.batch_predict", description="Fact 추출/신호 분류 배치 예측")
+    ap.add_argument("cmd", choices=("extract", "classify"))
+    ap.add_argument("--submitter", choices=("vertex", "local"), default="vertex")
+    ap.add_argument("--name", help="작업 이름 (같은 이름으로 재실행하면 이어서 대기/반영)")
+    ap.add_argument("--base-dir", default="data/batch")
+    ap.add_argument("--poll-sec", type=float, default=30.0)
+    ap.add_argument("--competitors", help="extract: 쉼표 구분 (기본: COMPETITORS env)")
+    ap.add_argument("--since", help="extract: YYYY-MM-DD 백필 시작 (없으면 현재 RSS)")
+    ap.add_argument("--until", help="extract: YYYY-MM-DD 백필 끝 (포함)")
+    ap.add_argument("--days", type=int, default=90, help="classify: 최근 N일 Fact 중 미분류만")
+    ap.add_argument("--facts-dir", default="data/facts")
+    args = ap.parse_args(argv)
+
+    base_dir = Path(args.base_dir)
+    name = args.name or f"{args.cmd}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M')}"
+    timeline = TimelineIndex()
+    store = fact_store(timeline)
+
+    if args.cmd == "extract":
+        competitors = [c.strip() for c in (args.competitors or os.environ.get("COMPETITORS", "")).split(",") if c.strip()]
+        if not competitors:
+            raise SystemExit("No competitors: pass --competitors or set COMPETITORS")
+        since = date.fromisoformat(args.since) if args.since else None
+        until = date.fromisoformat(args.until) if args.until else None
+        entries: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+        if not (base_dir / name / "job.json").exists():
+            items = [it for it in _collect(competitors, since, until) if not store.exists_any(url=it.url)]
+            entries = extract_entries(items, partition_by_published=since is not None)
+        apply = save_fact(store)
+    else:
+        from .facts_read import read_fact_payloads
+        from .storage_fact import payload_date
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=args.days)).strftime("%Y-%m-%d")
+        payloads = []
+        for d in read_fact_payloads(args.facts_dir):
+            try:
+                if not isinstance(d, dict) or not isinstance(d.get("fact"), dict) or not d["fact"].get("facts"):
+                    continue
+                if (payload_date(d) or "") >= cutoff and timeline.lookup(d) is None:
+                    payloads.append(d)
+            except Exception as e:
+                print(f"[WARN] fact record skipped: {type(e).__name__}: {e}")
+        entries = classify_entries(payloads)
+        apply = record_signal(store)
+
+    run = BatchRun(_submitter(args.submitter, base_dir, args.cmd), name, base_dir=base_dir, poll_sec=args.poll_sec)
+    n = run.prepare(entries)
+    if not n:
+        print(f"[BATCH] {name}: nothing to submit")
+        return
+    print(f"[BATCH] {name}: {n} requests via {run.submitter.name}")
+    print(f"[BATCH] {name}: {run.run(apply)}")
+
+
+if __name__ == "__main__":
+    main()
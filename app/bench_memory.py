@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .collector_rss import Item
+from .fact_payload import FactPayload
+from .facts_read import read_fact_payloads
+
+
+@dataclass
+class _PlainItem:
+    # 변경 전 collector_rss.Item (slots 없음) 비교용
+    title: str
+    url: str
+    published_at: Optional[datetime]
+    source: str
+    raw_summary: str
+
+
+def _sample_payload(i: int) -> Dict[str, Any]:
+    company = ("사람인", "잡코리아", "리멤버")[i % 3]
+    return {
+        "meta": {
+            "url": f"https://news.example.com/articles/{i}",
+            "source": "Google News RSS",
+            "title": f"{company}, 채용 플랫폼 신규 기능 출시 #{i}",
+            "published_date": "2026-10-01",
+            "collected_at_utc": "2026-10-02T00:30:00+00:00",
+        },
+        "fact": {
+            "source": "Google News RSS",
+            "url": f"https://news.example.com/articles/{i}",
+            "date_in_text": None,
+            "company": company,
+            "facts": [
+                {
+                    "what_happened": f"{company}가 AI 추천 기능을 출시했다 ({i})",
+                    "is_new_or_change": "new",
+                    "related_area": "상품",
+                    "numbers": [{"name": "이용자 수", "value": f"{i}만 명"}],
+                }
+            ],
+            "uncertain": [],
+        },
+    }
+
+
+def _measure(build: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    n = len(data)
+    del data
+    return (after - before) // max(n, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.bench_memory", description="레코드당 메모리 사용량 비교")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--facts-dir", help="실제 data/facts를 샘플로 사용 (n개가 될 때까지 반복)")
+    args = ap.parse_args(argv)
+
+    if args.facts_dir:
+        base = read_fact_payloads(args.facts_dir) or [_sample_payload(0)]
+        raw = [json.dumps(base[i % len(base)], ensure_ascii=False) for i in range(args.n)]
+    else:
+        raw = [json.dumps(_sample_payload(i), ensure_ascii=False) for i in range(args.n)]
+
+    # 파일에서 읽는 것과 같게: 레코드마다 새로 json.loads
+    dict_bytes = _measure(lambda: [json.loads(r) for r in raw])
+    rec_bytes = _measure(lambda: [FactPayload.from_dict(json.loads(r)) for r in raw])
+
+    now = datetime.now(timezone.utc)
+
+    def items(cls: Any) -> List[Any]:
+        return [
+            cls(
+                title=f"title {i}",
+                url=f"https://news.example.com/{i}",
+                published_at=now,
+                # feedparser처럼 항목마다 새 문자열 객체
+                source=" ".join(("Google", "News", "RSS")),
+                raw_summary=f"summary {i}",
+            )
+            for i in range(args.n)
+        ]
+
+    plain_item_bytes = _measure(lambda: items(_PlainItem))
+    slot_item_bytes = _measure(lambda: items(Item))
+
+    print(f"records: {args.n}")
+    print(f"fact payload: dict {dict_bytes} B/rec -> FactPayload {rec_bytes} B/rec "
+          f"({100 - rec_bytes * 100 // max(dict_bytes, 1)}% smaller)")
+    print(f"rss item:     dataclass {plain_item_bytes} B/rec -> slots {slot_item_bytes} B/rec "
+          f"({100 - slot_item_bytes * 100 // max(plain_item_bytes, 1)}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import argparse
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class CassetteMiss(KeyError):
+    """
+    replay 중 녹화되지 않은 요청
+    """
+
+
+def _key(kind: str, request: Dict[str, Any]) -> str:
+    raw = json.dumps([kind, request], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+@dataclass
+class Cassette:
+    """
+    외부 I/O(RSS/공고 HTML, Vertex, Slack) 녹화/재생.
+
+    IO_MODE=record: 모든 외부 호출의 응답과 소요 시간을 기록해 종료 시 CASSETTE_PATH(gzip JSONL)에 저장
+    IO_MODE=replay: 같은 요청을 메모리에서 응답 (네트워크/Vertex 초기화 없음)
+      - 같은 요청이 여러 번 녹화됐으면 녹화 순서대로, 다 쓰면 마지막 응답을 반복
+      - IO_REPLAY_LATENCY=1.0 이면 녹화된 소요 시간만큼 대기 (0이면 대기 없음)
+      - now()는 녹화 시각을 돌려줘서 lookback/cutoff 계산이 녹화 당시와 같다
+      - isolate_data(): 녹화 시작 시점의 data/ 스냅샷을 임시 작업 디렉터리에 풀어 그 위에서 재생
+        (facts/인덱스/큐/워터마크/HTTP 캐시가 녹화 당시와 같고, 실제 data/는 건드리지 않는다)
+    요청 본문은 저장하지 않고 해시 key만 남긴다 (프롬프트/웹훅 URL 비노출, 파일 크기 절약).
+    """
+    mode: str = "off"
+    path: Path = Path("data/cassettes/weekly.jsonl.gz")
+    latency_scale: float = 0.0
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _entries: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    _replay: Dict[str, Deque[Dict[str, Any]]] = field(default_factory=dict, repr=False)
+    _last: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    stats: Dict[str, Dict[str, int]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def active(self) -> bool:
+        return self.recording or self.replaying
+
+    def now(self) -> datetime:
+        return self.recorded_at if self.replaying else datetime.now(timezone.utc)
+
+    def _count(self, kind: str, key: str) -> None:
+        s = self.stats.setdefault(kind, {})
+        s[key] = s.get(key, 0) + 1
+
+    def call(
+        self,
+        kind: str,
+        request: Dict[str, Any],
+        fn: Callable[[], Dict[str, Any]],
+        *,
+        label: str = "",
+        replay_default: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        fn()은 JSON 직렬화 가능한 응답 dict를 반환해야 한다.
+        fn()이 던진 예외도 기록해 replay에서 같은 메시지의 RuntimeError로 재현한다.
+        replay_default가 있으면 녹화에 없는 요청도 실패 대신 그 응답을 쓴다 (예: Slack 본문이 바뀐 경우).
+        """
+        if not self.active:
+            return fn()
+
+        key = _key(kind, request)
+        if self.replaying:
+            return self._play(kind, key, replay_default)
+
+        t0 = time.perf_counter()
+        entry: Dict[str, Any] = {"kind": kind, "key": key, "label": label[:200]}
+        try:
+            entry["response"] = fn()
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - t0) * 1000)
+            with self._lock:
+                self._entries.append(entry)
+                self._count(kind, "recorded")
+        return entry["response"]
+
+    def _play(self, kind: str, key: str, default: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            q = self._replay.get(key)
+            entry = q.popleft() if q else self._last.get(key)
+            if entry is None:
+                self._count(kind, "miss")
+            else:
+                self._last[key] = entry
+                self._count(kind, "hit")
+
+        if entry is None:
+            if default is not None:
+                return default
+            raise CassetteMiss(f"{kind} request not in cassette ({key})")
+
+        if self.latency_scale > 0:
+            time.sleep(entry.get("ms", 0) / 1000 * self.latency_scale)
+        if "error" in entry:
+            raise RuntimeError(f"[replay] {entry['error']}")
+        return entry["response"]
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.path.with_name(self.path.name.split(".")[0] + ".data.tar.gz")
+
+    def isolate_data(self, data_dir: Path = Path("data")) -> Optional[Path]:
+        """
+        record: 실행 전 data_dir(카세트 디렉터리 제외)을 snapshot_path에 저장.
+        replay: 스냅샷을 IO_REPLAY_WORKDIR(없으면 임시 디렉터리)에 풀고 그리로 chdir → 작업 디렉터리 반환.
+        상대 경로(data/..., reports/...)를 쓰는 모든 단계가 스냅샷 위에서 돈다.
+        """
+        if self.recording:
+            self.path = self.path.resolve()
+            cassette_dir = self.path.parent
+            cassette_dir.mkdir(parents=True, exist_ok=True)
+            with tarfile.open(self.snapshot_path, "w:gz") as tar:
+                if data_dir.exists():
+                    tar.add(
+                        data_dir,
+                        filter=lambda ti: None if (Path(ti.name).resolve() == cassette_dir) else ti,
+                    )
+            return None
+        if not self.replaying:
+            return None
+        snapshot = self.snapshot_path.resolve()
+        if not snapshot.exists():
+            print(f"[WARN] replay without data snapshot: {snapshot} (현재 data/ 상태에 따라 결과가 달라질 수 있음)")
+            return None
+        workdir = Path(os.environ.get("IO_REPLAY_WORKDIR") or tempfile.mkdtemp(prefix="replay-")).resolve()
+        workdir.mkdir(parents=True, exist_ok=True)
+        with tarfile.open(snapshot, "r:gz") as tar:
+            tar.extractall(workdir, filter="data")
+        self.path = self.path.resolve()
+        os.chdir(workdir)
+        return workdir
+
+    def load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            self.recorded_at = datetime.fromisoformat(header["recorded_at"])
+            for line in f:
+                if line.strip():
+                    e = json.loads(line)
+                    self._replay.setdefault(e["key"], deque()).append(e)
+
+    def save(self) -> Optional[Path]:
+        if not self.recording:
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            entries = list(self._entries)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": 1, "recorded_at": self.recorded_at.isoformat()}) + "\n")
+            for e in entries:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+        tmp.replace(self.path)
+        return self.path
+
+    def summary_lines(self) -> List[str]:
+        return [
+            f"{kind}: " + ", ".join(f"{k} {v}" for k, v in sorted(s.items()))
+            for kind, s in sorted(self.stats.items())
+        ]
+
+
+_default_cassette: Optional[Cassette] = None
+
+
+def default_cassette() -> Cassette:
+    global _default_cassette
+    if _default_cassette is None:
+        mode = (os.environ.get("IO_MODE") or "off").strip().lower()
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Invalid IO_MODE: {mode}")
+        try:
+            scale = float(os.environ.get("IO_REPLAY_LATENCY") or 0)
+        except ValueError:
+            scale = 0.0
+        c = Cassette(
+            mode=mode,
+            path=Path(os.environ.get("CASSETTE_PATH", "data/cassettes/weekly.jsonl.gz")),
+            latency_scale=scale,
+        )
+        if c.replaying:
+            c.load()
+        if c.recording:
+            # 중간에 실패해도 그때까지의 녹화는 남긴다
+            atexit.register(c.save)
+        _default_cassette = c
+    return _default_cassette
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.cassette", description="녹화된 외부 I/O 요약")
+    ap.add_argument("path", nargs="?", default="data/cassettes/weekly.jsonl.gz")
+    args = ap.parse_args(argv)
+
+    c = Cassette(mode="replay", path=Path(args.path))
+    c.load()
+    by_kind: Dict[str, List[int]] = {}
+    for q in c._replay.values():
+        for e in q:
+            s = by_kind.setdefault(e["kind"], [0, 0, 0])
+            s[0] += 1
+            s[1] += e.get("ms", 0)
+            s[2] += 1 if "error" in e else 0
+    print(f"recorded_at: {c.recorded_at.isoformat()}")
+    for kind, (n, ms, errors) in sorted(by_kind.items()):
+        print(f"{kind}: {n} calls, {ms / 1000:.1f}s recorded, {errors} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import sys
 import urllib.parse
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
 
 import feedparser
 
+from .http_cache import HttpCache, default_http_cache
+from .poll_schedule import default_poll_scheduler
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     title: str
     url: str
     published_at: Optional[datetime]
     source: str
     raw_summary: str
+    # 기사 원 출처 사이트 (Google News RSS의 <source url>, 없으면 "")
+    publisher_url: str = ""
+
+    def __post_init__(self) -> None:
+        self.source = sys.intern(self.source)
 
 
 def google_news_rss_url(query: str, hl: str = "ko", gl: str = "KR", ceid: str = "KR:ko") -> str:
@@ -23,30 +32,105 @@ def google_news_rss_url(query: str, hl: str = "ko", gl: str = "KR", ceid: str =
     return f"https://news.google.com/rss/search?q={q}&hl={hl}&gl={gl}&ceid={ceid}"
 
 
-def fetch_rss(url: str, source_name: str) -> List[Item]:
-    feed = feedparser.parse(url)
-    items: List[Item] = []
+def _parse_rss_entries(body: str) -> List[Dict[str, Any]]:
+    feed = feedparser.parse(body)
+    entries: List[Dict[str, Any]] = []
 
     for e in feed.entries:
         published_at = None
         # feedparser may expose 'published_parsed'
         if getattr(e, "published_parsed", None):
-            published_at = datetime(*e.published_parsed[:6], tzinfo=timezone.utc)
+            published_at = datetime(*e.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+
+        src = getattr(e, "source", None) or {}
+        entries.append(
+            {
+                "title": getattr(e, "title", "").strip(),
+                "url": getattr(e, "link", "").strip(),
+                "published_at": published_at,
+                "raw_summary": getattr(e, "summary", "").strip(),
+                "publisher_url": (src.get("href") or "").strip(),
+            }
+        )
+    return entries
+
+
+_RSS_PARSER_KEY = "rss-v2"
+
+
+def fetch_rss(
+    url: str,
+    source_name: str,
+    *,
+    cache: Optional[HttpCache] = None,
+    stats_key: Optional[str] = None,
+) -> List[Item]:
+    # 조건부 GET + 본문이 같으면 feedparser 생략 (http_cache)
+    cache = cache or default_http_cache()
+    entries = cache.fetch_parsed(
+        url,
+        source=stats_key or source_name,
+        parse=_parse_rss_entries,
+        parser_key=_RSS_PARSER_KEY,
+    )
+    return _to_items(entries, source_name)
 
+
+def _to_items(entries: List[Dict[str, Any]], source_name: str) -> List[Item]:
+    items: List[Item] = []
+    for e in entries:
         items.append(
             Item(
-                title=getattr(e, "title", "").strip(),
-                url=getattr(e, "link", "").strip(),
-                published_at=published_at,
+                title=e["title"],
+                url=e["url"],
+                published_at=datetime.fromisoformat(e["published_at"]) if e["published_at"] else None,
                 source=source_name,
-                raw_summary=getattr(e, "summary", "").strip(),
+                raw_summary=e["raw_summary"],
+                publisher_url=e.get("publisher_url", ""),
             )
         )
     return items
 
 
-def collect_news_for_competitor(competitor_name: str) -> List[Item]:
+def _news_query(competitor_name: str) -> str:
     # You can refine queries per competitor.
-    query = f"{competitor_name} 채용 플랫폼 OR 채용서비스 OR 공고 OR 업데이트 OR 투자 OR 제휴"
+    return f"{competitor_name} 채용 플랫폼 OR 채용서비스 OR 공고 OR 업데이트 OR 투자 OR 제휴"
+
+
+def collect_news_for_competitor(
+    competitor_name: str,
+    *,
+    after: Optional[date] = None,
+    before: Optional[date] = None,
+) -> List[Item]:
+    query = _news_query(competitor_name)
+    # 백필용 기간 지정 (Google News 검색 연산자)
+    if after:
+        query += f" after:{after.isoformat()}"
+    if before:
+        query += f" before:{before.isoformat()}"
     url = google_news_rss_url(query)
-    return fetch_rss(url, source_name="Google News RSS")
+    return fetch_rss(url, source_name="Google News RSS", stats_key=f"rss:{competitor_name}")
+
+
+def poll_news_for_competitor(
+    competitor_name: str,
+    *,
+    is_known: Optional[Callable[[str], bool]] = None,
+) -> List[Item]:
+    """
+    ADAPTIVE_POLL_MODE=true면 폴링 간격이 안 된 피드는 네트워크 없이 직전 파싱 결과를 반환하고,
+    폴링한 피드는 새 URL 여부로 간격을 조정한다. (꺼져 있으면 collect_news_for_competitor와 같음)
+    """
+    key = f"rss:{competitor_name}"
+    poller = default_poll_scheduler()
+    if not poller.is_due(key):
+        url = google_news_rss_url(_news_query(competitor_name))
+        entries = default_http_cache().peek_parsed(url, source=key, parser_key=_RSS_PARSER_KEY)
+        if entries is not None:
+            poller.skip(key)
+            return _to_items(entries, "Google News RSS")
+
+    items = collect_news_for_competitor(competitor_name)
+    poller.observe(key, [it.url for it in items], is_known=is_known)
+    return items
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -29,9 +29,51 @@ class CompanyMapper:
             }
         )
 
+    def aliases(self, key: str) -> List[str]:
+        """
+        키(saramin 등)와 같은 회사로 매핑되는 모든 키워드 (소문자). 매핑이 없으면 [key]
+        """
+        company = self.keyword_to_company.get(key, key)
+        names = [k for k, c in self.keyword_to_company.items() if c == company]
+        return [n.lower() for n in (names or [key])]
+
     def infer(self, text: str) -> Optional[str]:
         t = (text or "").lower()
         for k, company in self.keyword_to_company.items():
             if k.lower() in t:
                 return company
         return None
+
+    def group_key(self, payload: Dict[str, Any]) -> str:
+        """
+        Fact payload의 그룹 키 결정:
+        1) fact.company가 있으면 사용
+        2) 없으면 title+url 키워드 매칭
+        3) 복수 경쟁사 키워드면 '비교기사'
+        4) 아니면 '미분류'
+        """
+        fact = payload.get("fact", {}) or {}
+        meta = payload.get("meta", {}) or {}
+        return self.resolve_group(
+            company=fact.get("company"),
+            title=str(meta.get("title", "") or ""),
+            url=str(meta.get("url", "") or ""),
+        )
+
+    def resolve_group(self, *, company: Optional[str], title: str, url: str) -> str:
+        if company:
+            return str(company).strip()
+
+        combined = f"{title} {url}"
+
+        hits = []
+        for kw, comp in self.keyword_to_company.items():
+            if kw.lower() in combined.lower():
+                hits.append(comp)
+        hits_unique = list(dict.fromkeys(hits))
+
+        if len(hits_unique) >= 2:
+            return "비교기사"
+
+        inferred = self.infer(combined)
+        return inferred if inferred else "미분류"
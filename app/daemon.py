@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from . import pipeline_weekly as pw
+from .cassette import default_cassette
+from .config import Settings
+from .http_cache import default_http_cache
+from .runtime import enable_warm_state, env_bool, env_int, warm_state_sizes
+from .slack_sender import default_slack_delivery
+
+
+_FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> FrozenSet[int]:
+    out = set()
+    for part in expr.split(","):
+        rng, _, step_raw = part.partition("/")
+        step = int(step_raw) if step_raw else 1
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a, b = (int(x) for x in rng.split("-", 1))
+        else:
+            a = int(rng)
+            b = hi if step_raw else a
+        if a < lo or b > hi or a > b or step < 1:
+            raise ValueError(f"cron field out of range: {part} ({lo}-{hi})")
+        out.update(range(a, b + 1, step))
+    return frozenset(out)
+
+
+@dataclass(frozen=True)
+class CronSpec:
+    """
+    5필드 cron 식 (분 시 일 월 요일, UTC). *, 숫자, a-b, 목록(,), /step 지원. 요일 0=일요일(7도 허용).
+    일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행 (표준 cron과 같음).
+    """
+    expr: str
+    minute: FrozenSet[int]
+    hour: FrozenSet[int]
+    day: FrozenSet[int]
+    month: FrozenSet[int]
+    weekday: FrozenSet[int]
+    day_any: bool
+    weekday_any: bool
+
+    @staticmethod
+    def parse(expr: str) -> "CronSpec":
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron needs 5 fields: {expr!r}")
+        parts[4] = ",".join("0" if p == "7" else p for p in parts[4].split(","))
+        vals = [_parse_field(p, lo, hi) for p, (_, lo, hi) in zip(parts, _FIELDS)]
+        return CronSpec(expr, *vals, day_any=parts[2] == "*", weekday_any=parts[4] == "*")
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.day
+        dow = (dt.weekday() + 1) % 7 in self.weekday
+        if self.day_any or self.weekday_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        dt 이후(초과) 첫 실행 시각 (분 단위)
+        """
+        t = dt.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 4)
+        while t < limit:
+            if t.month not in self.month or not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if t.hour not in self.hour:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+                continue
+            if t.minute not in self.minute:
+                t += timedelta(minutes=1)
+                continue
+            return t
+        raise ValueError(f"cron never fires: {self.expr!r}")
+
+
+@dataclass
+class JobState:
+    name: str
+    cron: CronSpec
+    fn: Callable[[], None]
+    next_at: datetime
+    runs: int = 0
+    failures: int = 0
+    running: bool = False
+    last_started: Optional[datetime] = None
+    last_duration_sec: float = 0.0
+    last_success: Optional[datetime] = None
+    last_error: str = ""
+
+
+@dataclass
+class Daemon:
+    """
+    같은 프로세스에서 수집/추출/리포트를 반복 실행한다.
+
+    - SDK import, vertexai.init, HTTP 세션, 타임라인/URL 인덱스, Fact 레코드 뷰를 실행 간에 유지
+      → 정기 실행은 새로 들어온 기사/파일만 처리
+    - 작업은 한 스레드에서 순서대로 (같은 data/를 쓰므로 겹치지 않게), 밀린 실행은 한 번으로 합침
+    - /healthz, /metrics (Prometheus text) 를 로컬 포트로 노출
+    """
+    settings: Settings
+    jobs: Dict[str, JobState] = field(default_factory=dict)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    http_totals: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, cron_expr: str, fn: Callable[[], None]) -> None:
+        cron = CronSpec.parse(cron_expr)
+        self.jobs[name] = JobState(name, cron, fn, next_at=cron.next_after(datetime.now(timezone.utc)))
+
+    def run_job(self, job: JobState) -> None:
+        with self._lock:
+            job.running = True
+            job.last_started = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            job.fn()
+            ok = True
+        except Exception as e:
+            job.last_error = f"{type(e).__name__}: {e}"
+            print(f"[WARN] daemon job failed: {job.name} / {job.last_error}")
+            traceback.print_exc()
+        finally:
+            self._fold_http_stats()
+            with self._lock:
+                job.running = False
+                job.runs += 1
+                job.last_duration_sec = time.perf_counter() - t0
+                if ok:
+                    job.last_success = datetime.now(timezone.utc)
+                else:
+                    job.failures += 1
+                job.next_at = job.cron.next_after(datetime.now(timezone.utc))
+        print(f"[DAEMON] {job.name} {'ok' if ok else 'failed'} in {job.last_duration_sec:.1f}s, next {job.next_at.isoformat(timespec='minutes')}")
+
+    def _fold_http_stats(self) -> None:
+        # 실행별 요약이 누적되지 않도록 HTTP 캐시 통계는 작업마다 비우고 여기에 합산
+        cache = default_http_cache()
+        with self._lock:
+            for source, s in cache.stats.items():
+                tot = self.http_totals.setdefault(source, {})
+                for k, v in s.items():
+                    tot[k] = tot.get(k, 0) + v
+            cache.stats.clear()
+
+    def loop(self) -> None:
+        while not self._stop.is_set():
+            now = datetime.now(timezone.utc)
+            due = sorted((j for j in self.jobs.values() if j.next_at <= now), key=lambda j: j.next_at)
+            for job in due:
+                if self._stop.is_set():
+                    break
+                self.run_job(job)
+            if not due:
+                wait = min((j.next_at for j in self.jobs.values()), default=now + timedelta(minutes=1)) - now
+                self._stop.wait(max(1.0, min(wait.total_seconds(), 60.0)))
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = {
+                j.name: {
+                    "cron": j.cron.expr,
+                    "running": j.running,
+                    "runs": j.runs,
+                    "failures": j.failures,
+                    "next_at": j.next_at.isoformat(timespec="minutes"),
+                    "last_success": j.last_success.isoformat(timespec="seconds") if j.last_success else None,
+                    "last_error": j.last_error,
+                }
+                for j in self.jobs.values()
+            }
+        return {
+            "status": "ok" if self.alive else "stopped",
+            "uptime_sec": int((datetime.now(timezone.utc) - self.started_at).total_seconds()),
+            "warm": warm_state_sizes(),
+            "jobs": jobs,
+        }
+
+    def metrics(self) -> str:
+        lines: List[str] = [
+            f"daemon_up {1 if self.alive else 0}",
+            f"daemon_uptime_seconds {int((datetime.now(timezone.utc) - self.started_at).total_seconds())}",
+        ]
+        for k, v in warm_state_sizes().items():
+            lines.append(f"daemon_warm_{k} {v}")
+        with self._lock:
+            for j in self.jobs.values():
+                lbl = f'{{job="{j.name}"}}'
+                lines += [
+                    f"daemon_job_runs_total{lbl} {j.runs}",
+                    f"daemon_job_failures_total{lbl} {j.failures}",
+                    f"daemon_job_running{lbl} {1 if j.running else 0}",
+                    f"daemon_job_last_duration_seconds{lbl} {j.last_duration_sec:.3f}",
+                    f"daemon_job_last_success_timestamp{lbl} {int(j.last_success.timestamp()) if j.last_success else 0}",
+                    f"daemon_job_next_run_timestamp{lbl} {int(j.next_at.timestamp())}",
+                ]
+            for source, s in sorted(self.http_totals.items()):
+                for k, v in sorted(s.items()):
+                    lines.append(f'daemon_http_cache_{k}_total{{source="{source}"}} {v}')
+        delivery = default_slack_delivery()
+        for k, v in sorted(delivery.stats.items()):
+            lines.append(f"daemon_slack_{k}_total {v}")
+        lines.append(f"daemon_slack_spooled {len(delivery.spooled())}")
+        return "\n".join(lines) + "\n"
+
+
+def _handler(daemon: Daemon) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: str, ctype: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path == "/healthz":
+                h = daemon.health()
+                self._send(200 if h["status"] == "ok" else 503, json.dumps(h, ensure_ascii=False), "application/json")
+            elif self.path == "/metrics":
+                self._send(200, daemon.metrics(), "text/plain; version=0.0.4")
+            else:
+                self._send(404, "not found\n", "text/plain")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+    return Handler
+
+
+def _incremental_job(settings: Settings) -> Callable[[], None]:
+    def run() -> None:
+        collected = pw._collect_all(settings)
+        pw.run_daily_incremental(settings, collected)
+
+    return run
+
+
+def _report_job(settings: Settings) -> Callable[[], None]:
+    def run() -> None:
+        pw.run_weekly_strategy_report(settings)
+        if env_bool("TREND_REPORT_MODE", False):
+            pw.run_trend_report(settings)
+
+    return run
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.daemon", description="상주 실행 (내부 스케줄러 + 헬스/메트릭)")
+    ap.add_argument("--host", default=os.environ.get("DAEMON_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=env_int("DAEMON_PORT", 8787))
+    ap.add_argument("--incremental-cron", default=os.environ.get("DAEMON_INCREMENTAL_CRON", "0 * * * *"))
+    ap.add_argument("--report-cron", default=os.environ.get("DAEMON_REPORT_CRON", "30 0 * * 1"))
+    ap.add_argument("--run-now", action="store_true", help="시작 직후 증분 작업 1회 실행")
+    args = ap.parse_args(argv)
+
+    settings = Settings.from_env()
+    enable_warm_state()
+
+    daemon = Daemon(settings)
+    daemon.add_job("incremental", args.incremental_cron, _incremental_job(settings))
+    daemon.add_job("report", args.report_cron, _report_job(settings))
+    if args.run_now:
+        daemon.jobs["incremental"].next_at = datetime.now(timezone.utc)
+
+    server = ThreadingHTTPServer((args.host, args.port), _handler(daemon))
+    threading.Thread(target=server.serve_forever, name="http", daemon=True).start()
+
+    def shutdown(signum: int, frame: Any) -> None:
+        print(f"[DAEMON] signal {signum}: stopping after current job")
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for j in daemon.jobs.values():
+        print(f"[DAEMON] {j.name}: '{j.cron.expr}' next {j.next_at.isoformat(timespec='minutes')}")
+    print(f"[DAEMON] http://{args.host}:{args.port}/healthz /metrics")
+    daemon.start()
+    try:
+        while daemon.alive:
+            time.sleep(0.5)
+    finally:
+        daemon.stop()
+        daemon.join()
+        server.shutdown()
+        cassette = default_cassette()
+        saved = cassette.save()
+        if saved:
+            print(f"[IO RECORD] saved: {saved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .text_tokens import char_ngrams, estimate_tokens
+
+
+def fact_text(fact_json: Dict[str, Any]) -> str:
+    parts: List[str] = []
+    for f in fact_json.get("facts") or []:
+        if isinstance(f, dict):
+            parts.append(str(f.get("what_happened", "") or ""))
+            parts.append(str(f.get("related_area", "") or ""))
+    return " ".join(parts)
+
+
+def support_count(fact_json: Dict[str, Any]) -> int:
+    """
+    이 payload가 대표하는 기사 수 (fact_dedup으로 병합된 Fact의 support_count 최댓값, 기본 1)
+    """
+    counts = [
+        int(f.get("support_count") or 1) for f in fact_json.get("facts") or [] if isinstance(f, dict)
+    ]
+    return max(counts, default=1)
+
+
+def tfidf_matrix(texts: List[str]) -> np.ndarray:
+    """
+    문자 bigram TF-IDF (행 단위 L2 정규화), shape = (문서 수, 어휘 수)
+    """
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, t in enumerate(texts):
+        for g in char_ngrams(t):
+            rows.append(i)
+            cols.append(vocab.setdefault(g, len(vocab)))
+
+    X = np.zeros((len(texts), max(len(vocab), 1)), dtype=np.float32)
+    if rows:
+        np.add.at(X, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    df = np.count_nonzero(X, axis=0)
+    idf = np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0
+    X = np.log1p(X) * idf.astype(np.float32)
+
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans_cosine(X: np.ndarray, k: int, iters: int = 20, min_sim: float = 1.0) -> np.ndarray:
+    """
+    구면 k-means. 초기값은 결정적 farthest-first (같은 입력 → 같은 결과).
+    모든 행이 이미 어떤 중심과 cos >= min_sim이면 k개를 다 채우기 전에 멈춘다.
+    반환: 각 행의 클러스터 번호
+    """
+    n = X.shape[0]
+    k = max(1, min(k, n))
+
+    first = int(np.argmax(X @ X.mean(axis=0)))
+    chosen = [first]
+    best = X @ X[first]
+    for _ in range(1, k):
+        if float(best.min()) >= min_sim:
+            break
+        nxt = int(np.argmin(best))
+        chosen.append(nxt)
+        best = np.maximum(best, X @ X[nxt])
+
+    k = len(chosen)
+    C = X[chosen].copy()
+    labels = np.full(n, -1)
+    for _ in range(iters):
+        new_labels = np.argmax(X @ C.T, axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for j in range(k):
+            members = X[labels == j]
+            if len(members):
+                c = members.sum(axis=0)
+                norm = np.linalg.norm(c)
+                C[j] = c / norm if norm else C[j]
+    return labels
+
+
+def select_evidence(
+    facts: List[Dict[str, Any]],
+    *,
+    max_items: int = 8,
+    token_budget: int = 3000,
+    dup_threshold: float = 0.8,
+    theme_sim: float = 0.7,
+) -> List[Dict[str, Any]]:
+    """
+    경쟁사 A/B Fact를 주제별로 묶고(주제 내 유사도 theme_sim 이상이면 더 쪼개지 않음),
+    주제마다 대표 Fact 1개를 고른다.
+    - 큰 주제(기사 수가 많은 주제, 병합된 Fact는 support_count만큼)부터, A 신호 우선
+    - 이미 고른 대표와 거의 같은(cos >= dup_threshold) Fact는 제외
+    - token_budget 안에서만 채움
+    선택된 Fact에는 "_theme_size"(같은 주제의 기사 수)를 붙인다.
+    """
+    if not facts:
+        return []
+
+    X = tfidf_matrix([fact_text(f) for f in facts])
+    support = np.asarray([support_count(f) for f in facts])
+    labels = kmeans_cosine(X, min(max_items, len(facts)), min_sim=theme_sim)
+
+    candidates = []
+    for j in np.unique(labels):
+        idx = np.flatnonzero(labels == j)
+        centroid = X[idx].mean(axis=0)
+        rep = int(idx[np.argmax(X[idx] @ centroid)])
+        level = ((facts[rep].get("_signal") or {}).get("signal_level") or "").strip()
+        size = int(support[idx].sum())
+        candidates.append((-size, level != "A", rep, size))
+    candidates.sort()
+
+    selected: List[Dict[str, Any]] = []
+    chosen: List[int] = []
+    used = 0
+    for _, _, rep, size in candidates:
+        if len(selected) >= max_items:
+            break
+        if chosen and float(np.max(X[chosen] @ X[rep])) >= dup_threshold:
+            continue
+        f2 = dict(facts[rep])
+        f2["_theme_size"] = size
+        cost = estimate_tokens(json.dumps(f2, ensure_ascii=False))
+        if selected and used + cost > token_budget:
+            continue
+        selected.append(f2)
+        chosen.append(rep)
+        used += cost
+    return selected
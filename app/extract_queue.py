@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .collector_rss import Item
+from .fact_extractor_vertex import FactExtractor
+from .profiling import get_profiler
+from .runtime import fact_store, vertex_llm_from_env
+from .storage_fact import FactStore, url_key
+from .work_queue import WorkItem, WorkQueue
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def item_to_task(it: Item, competitor: Optional[str] = None) -> Dict[str, Optional[str]]:
+    return {
+        "competitor": competitor,
+        "url": it.url,
+        "source": it.source,
+        "title": it.title,
+        "raw_summary": it.raw_summary,
+        "published_at": it.published_at.isoformat() if it.published_at else None,
+        "publisher_url": it.publisher_url,
+    }
+
+
+def task_to_item(task: Dict[str, Optional[str]]) -> Item:
+    pub = task.get("published_at")
+    return Item(
+        title=task.get("title") or "",
+        url=task.get("url") or "",
+        published_at=datetime.fromisoformat(pub) if pub else None,
+        source=task.get("source") or "",
+        raw_summary=task.get("raw_summary") or "",
+        publisher_url=task.get("publisher_url") or "",
+    )
+
+
+def pending_items(queue: WorkQueue) -> List[Tuple[Item, Optional[str]]]:
+    """
+    이전 실행에서 남은 대기 항목 (항목, 경쟁사). 이번 실행의 공정 스케줄에 다시 넣는 용도.
+    """
+    return [(task_to_item(t.payload), t.payload.get("competitor")) for t in queue.pending()]
+
+
+def enqueue_items(queue: WorkQueue, items: Iterable[Item], competitor_of: Optional[Dict[str, str]] = None) -> int:
+    """
+    추출 대기 항목 등록 (URL 해시 key로 멱등). 새로 등록된 건수 반환.
+    items 순서가 곧 임대 순서(priority)다. 이미 대기 중인 항목도 이번 순서로 순위를 다시 매기므로
+    남은 항목까지 포함한 공정 스케줄 전체를 넘긴다.
+    """
+    competitor_of = competitor_of or {}
+    priorities: Dict[str, float] = {}
+    added = 0
+    for rank, it in enumerate(items):
+        key = url_key(it.url)
+        priorities[key] = float(rank)
+        if queue.enqueue(key, item_to_task(it, competitor_of.get(it.url)), priority=float(rank)):
+            added += 1
+    queue.reprioritize(priorities)
+    return added
+
+
+def drain(
+    queue: WorkQueue,
+    extractor: FactExtractor,
+    store: FactStore,
+    *,
+    max_items: int,
+    worker: Optional[str] = None,
+    shard: int = 0,
+    shards: int = 1,
+    cutoff_utc: Optional[datetime] = None,
+    usage: Optional[Dict[str, Dict[str, int]]] = None,
+    raw_text_for: Optional[Callable[[Item], str]] = None,
+    prefetch: Optional[Callable[[List[Item]], None]] = None,
+) -> Dict[str, int]:
+    """
+    큐에서 남은 예산만큼 임대해 Fact 추출/저장. max_items번 추출을 시도하거나 큐가 비면 종료.
+    중간에 프로세스가 죽어도 임대 만료 후 다음 실행/다른 워커가 이어서 처리한다.
+    cutoff_utc보다 오래된 대기 항목은 추출 없이 완료 처리한다.
+    usage가 주어지면 경쟁사별 saved/failed를 누적한다.
+    raw_text_for가 주어지면 추출 입력 텍스트로 쓴다 (기사 본문 발췌 등, 기본은 RSS 요약).
+    prefetch가 주어지면 임대한 묶음 중 추출할 항목으로 먼저 한 번 호출한다 (기사 본문 병렬 수집 등).
+    """
+    worker = worker or default_worker_id()
+    prof = get_profiler()
+    stats = {"saved": 0, "skipped_dup": 0, "skipped_old": 0, "failed": 0, "dead": 0}
+    attempted = 0
+
+    while attempted < max_items:
+        leased = queue.lease(worker, max_items - attempted, shard=shard, shards=shards)
+        if not leased:
+            break
+
+        todo = []
+        for task in leased:
+            it = task_to_item(task.payload)
+            with prof.stage("store_io"):
+                is_dup = store.exists_any(url=it.url)
+            if is_dup:
+                stats["skipped_dup"] += 1
+                queue.complete(task.id)
+                continue
+            if cutoff_utc and it.published_at and it.published_at < cutoff_utc:
+                stats["skipped_old"] += 1
+                queue.complete(task.id)
+                continue
+            todo.append((task, it))
+        if prefetch is not None and todo:
+            prefetch([it for _, it in todo])
+
+        for task, it in todo:
+            _extract_task(queue, extractor, store, task, it, stats, usage, raw_text_for)
+            attempted += 1
+
+    return stats
+
+
+def _extract_task(
+    queue: WorkQueue,
+    extractor: FactExtractor,
+    store: FactStore,
+    task: WorkItem,
+    it: Item,
+    stats: Dict[str, int],
+    usage: Optional[Dict[str, Dict[str, int]]],
+    raw_text_for: Optional[Callable[[Item], str]],
+) -> None:
+    prof = get_profiler()
+    comp_usage = (usage if usage is not None else {}).setdefault(task.payload.get("competitor") or "-", {})
+    published_date = it.published_at.strftime("%Y-%m-%d") if it.published_at else None
+    try:
+        raw_text = (raw_text_for(it) if raw_text_for else "") or it.raw_summary or it.title
+        with prof.stage("extraction"):
+            fact_json = extractor.extract(
+                source=it.source,
+                url=it.url,
+                title=it.title,
+                raw_text=raw_text,
+            )
+        with prof.stage("store_io"):
+            store.save(
+                url=it.url,
+                source=it.source,
+                title=it.title,
+                published_date=published_date,
+                fact_json=fact_json,
+            )
+        queue.complete(task.id)
+        stats["saved"] += 1
+        comp_usage["saved"] = comp_usage.get("saved", 0) + 1
+    except Exception as e:
+        stats["failed"] += 1
+        comp_usage["failed"] = comp_usage.get("failed", 0) + 1
+        if queue.fail(task.id, f"{type(e).__name__}: {e}") == "dead":
+            stats["dead"] += 1
+        print(f"[WARN] Fact extract failed: {it.url} / {type(e).__name__}: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.extract_queue", description="Fact 추출 작업 큐")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    d = sub.add_parser("drain", help="큐의 대기 항목을 추출")
+    d.add_argument("--max-items", type=int, default=15)
+    d.add_argument("--shard", type=int, default=0)
+    d.add_argument("--shards", type=int, default=1)
+
+    sub.add_parser("status", help="상태별 건수 + 최근 데드레터")
+    sub.add_parser("requeue-dead", help="데드레터를 다시 대기열로")
+
+    args = ap.parse_args(argv)
+    queue = WorkQueue()
+
+    if args.cmd == "status":
+        print(queue.counts())
+        for row in queue.dead_items():
+            print(f"dead\t{row['key']}\t{row['attempts']}\t{row['last_error']}")
+        return
+    if args.cmd == "requeue-dead":
+        print(f"requeued {queue.requeue_dead()}")
+        return
+
+    stats = drain(
+        queue,
+        FactExtractor(llm=vertex_llm_from_env("extract")),
+        fact_store(),
+        max_items=args.max_items,
+        shard=args.shard,
+        shards=args.shards,
+    )
+    print(f"{stats} / queue={queue.counts()}")
+
+
+if __name__ == "__main__":
+    main()
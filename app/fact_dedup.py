@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import re
+from typing import Dict, List, Tuple
+
+from .fact_payload import FactEntry, FactPayload
+from .text_tokens import normalize
+
+
+def _compact(text: str) -> str:
+    # 띄어쓰기/조사 붙임 차이("300억 원"/"300억원", "리멤버,"/"리멤버가")에 덜 민감하게 공백 제거
+    return normalize(text).replace(" ", "")
+
+
+def _bigrams(text: str) -> set:
+    t = _compact(text)
+    return {t[i : i + 2] for i in range(len(t) - 1)} or ({t} if t else set())
+
+
+# 수치 값에서 비교할 부분: 숫자 + 자릿수 단위/비율 ("300억 원"/"300억원"/"300 억" → "300억")
+_NUM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(조|억|만|천|%|퍼센트|배)?")
+
+
+def _number_norm(value: str) -> str:
+    parts = []
+    for num, unit in _NUM_RE.findall(value.replace(",", "")):
+        parts.append(num + ("%" if unit == "퍼센트" else unit))
+    return "".join(parts) or _compact(value)
+
+
+def _numbers_key(f: FactEntry) -> Tuple[str, ...]:
+    # 수치는 값만 비교 ("투자 규모: 300억" / "투자금: 300억 원"은 같은 수치)
+    return tuple(sorted({_number_norm(n.value) for n in f.numbers if n.value}))
+
+
+def fact_signature(f: FactEntry) -> str:
+    """
+    정규화한 what_happened + 수치 값 해시 (완전 중복 판정용)
+    """
+    raw = _compact(f.what_happened) + "|" + ",".join(_numbers_key(f))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _dice(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def dedup_facts(
+    payloads: List[FactPayload],
+    *,
+    near_threshold: float = 0.75,
+) -> Tuple[List[FactPayload], Dict[str, int]]:
+    """
+    한 회사의 payload들에서 같은 사건을 다룬 Fact를 하나로 병합한다.
+
+    - 완전 중복: fact_signature가 같으면 같은 Fact
+    - 근사 중복: 수치 값(단위 정규화)이 하나 이상 겹치거나 둘 다 수치가 없고,
+      what_happened 문자 bigram Dice >= near_threshold
+    - 그룹의 대표는 가장 이른(날짜, URL 순) 기사의 Fact. support_count/sources에 기사 수와 URL을 합친다
+    - 모든 Fact가 다른 기사에 병합된 payload는 결과에서 빠진다 (분류/가설 입력 감소)
+    반환: (병합된 payload 목록, 통계)
+    """
+    ordered = sorted(payloads, key=lambda p: (p.published_date or p.collected_at_utc or "", p.url))
+
+    refs: List[Tuple[int, int]] = []
+    sigs: List[str] = []
+    grams: List[set] = []
+    nums: List[Tuple[str, ...]] = []
+    for pi, p in enumerate(ordered):
+        for fi, f in enumerate(p.facts):
+            refs.append((pi, fi))
+            sigs.append(fact_signature(f))
+            grams.append(_bigrams(f.what_happened))
+            nums.append(_numbers_key(f))
+
+    parent = list(range(len(refs)))
+
+    def union(i: int, j: int) -> None:
+        ri, rj = _find(parent, i), _find(parent, j)
+        if ri != rj:
+            # 먼저 나온(더 이른) Fact가 대표가 되도록
+            parent[max(ri, rj)] = min(ri, rj)
+
+    by_sig: Dict[str, int] = {}
+    by_num: Dict[str, List[int]] = {}
+    for i in range(len(refs)):
+        if sigs[i] in by_sig:
+            union(by_sig[sigs[i]], i)
+            continue
+        by_sig[sigs[i]] = i
+        # 수치가 겹치는 Fact끼리만 비교 (겹치는 금액/인원이 없으면 다른 사건). 수치 없는 Fact는 서로만
+        keys = nums[i] or ("",)
+        for j in dict.fromkeys(j for k in keys for j in by_num.get(k, [])):
+            if _dice(grams[i], grams[j]) >= near_threshold:
+                union(j, i)
+                break
+        for k in keys:
+            by_num.setdefault(k, []).append(i)
+
+    members: Dict[int, List[int]] = {}
+    for i in range(len(refs)):
+        members.setdefault(_find(parent, i), []).append(i)
+
+    keep: Dict[Tuple[int, int], FactEntry] = {}
+    for root, idx in members.items():
+        pi, fi = refs[root]
+        urls: List[str] = []
+        for i in idx:
+            u = ordered[refs[i][0]].url
+            if u not in urls:
+                urls.append(u)
+        f = ordered[pi].facts[fi]
+        keep[(pi, fi)] = dataclasses.replace(f, support_count=len(urls), sources=tuple(urls))
+
+    out: List[FactPayload] = []
+    for pi, p in enumerate(ordered):
+        if not p.facts:
+            out.append(p)
+            continue
+        facts = tuple(keep[(pi, fi)] for fi in range(len(p.facts)) if (pi, fi) in keep)
+        if facts:
+            out.append(dataclasses.replace(p, facts=facts))
+
+    stats = {
+        "payloads_in": len(payloads),
+        "payloads_out": len(out),
+        "facts_in": len(refs),
+        "facts_out": len(keep),
+    }
+    return out, stats
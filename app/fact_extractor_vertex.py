@@ -47,21 +47,57 @@ TEXT:
 {raw_text}
 """
 
+# USER_TEMPLATE의 출력 스키마 (VertexLLM 로컬 검증용)
+SCHEMA = {
+    "type": "object",
+    "required": ["facts"],
+    "properties": {
+        "source": {"type": ["string", "null"]},
+        "url": {"type": ["string", "null"]},
+        "date_in_text": {"type": ["string", "null"]},
+        "company": {"type": ["string", "null"]},
+        "facts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["what_happened"],
+                "properties": {
+                    "what_happened": {"type": "string"},
+                    "is_new_or_change": {"enum": ["new", "change", "unknown"]},
+                    "related_area": {"type": ["string", "null"]},
+                    "numbers": {
+                        "type": "array",
+                        "items": {"type": "object", "required": ["name", "value"]},
+                    },
+                },
+            },
+        },
+        "uncertain": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
 
 @dataclass(frozen=True)
 class FactExtractor:
     llm: VertexLLM
 
+    @staticmethod
+    def request(*, source: str, url: str, title: str, raw_text: str) -> Dict[str, Any]:
+        """
+        generate_json 인자 (온라인 호출과 배치 요청 파일이 같은 프롬프트를 쓰도록)
+        """
+        return {
+            "system_instruction": SYSTEM_INSTRUCTION.strip(),
+            "user_input": USER_TEMPLATE.format(
+                source=source,
+                url=url,
+                title=title,
+                raw_text=raw_text,
+            ),
+            "temperature": 0.0,
+            "max_output_tokens": 2048,
+            "schema": SCHEMA,
+        }
+
     def extract(self, *, source: str, url: str, title: str, raw_text: str) -> Dict[str, Any]:
-        prompt = USER_TEMPLATE.format(
-            source=source,
-            url=url,
-            title=title,
-            raw_text=raw_text,
-        )
-        return self.llm.generate_json(
-            system_instruction=SYSTEM_INSTRUCTION.strip(),
-            user_input=prompt,
-            temperature=0.0,
-            max_output_tokens=2048,
-        )
+        return self.llm.generate_json(**self.request(source=source, url=url, title=title, raw_text=raw_text))
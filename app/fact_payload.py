@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _intern(v: Any) -> Optional[str]:
+    # 회사명/출처처럼 반복되는 짧은 문자열은 한 객체를 공유
+    if v is None:
+        return None
+    return sys.intern(str(v))
+
+
+def _str(v: Any) -> str:
+    return "" if v is None else str(v)
+
+
+def _list(v: Any) -> List[Any]:
+    # 구버전/손상 payload: 리스트 자리에 문자열/숫자 등이 와도 빈 목록으로
+    return list(v) if isinstance(v, (list, tuple)) else []
+
+
+def _dict(v: Any) -> Dict[str, Any]:
+    return v if isinstance(v, dict) else {}
+
+
+@dataclass(frozen=True, slots=True)
+class NumberEntry:
+    name: str
+    value: str
+
+
+@dataclass(frozen=True, slots=True)
+class FactEntry:
+    what_happened: str
+    is_new_or_change: str
+    related_area: Optional[str]
+    numbers: Tuple[NumberEntry, ...]
+    # Fact 단위 중복 병합(fact_dedup) 결과: 같은 사건을 다룬 기사 수와 그 URL들
+    support_count: int = 1
+    sources: Tuple[str, ...] = ()
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "FactEntry":
+        return FactEntry(
+            what_happened=_str(d.get("what_happened")),
+            is_new_or_change=_intern(d.get("is_new_or_change") or "unknown") or "unknown",
+            related_area=_intern(d.get("related_area")),
+            numbers=tuple(
+                NumberEntry(name=_intern(n.get("name")) or "", value=_str(n.get("value")))
+                for n in _list(d.get("numbers"))
+                if isinstance(n, dict)
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "what_happened": self.what_happened,
+            "is_new_or_change": self.is_new_or_change,
+            "related_area": self.related_area,
+            "numbers": [{"name": n.name, "value": n.value} for n in self.numbers],
+        }
+        # 병합된 Fact만 근거 강도 표시 (URL 목록은 프롬프트에 넣지 않음)
+        if self.support_count > 1:
+            d["support_count"] = self.support_count
+        return d
+
+
+@dataclass(frozen=True, slots=True)
+class FactPayload:
+    """
+    저장된 Fact payload(meta + fact)의 파싱된 표현.
+
+    저장소 경계(facts_read.read_fact_records)에서 한 번만 디코딩하고,
+    전략/리포트 단계는 dict 대신 이 레코드를 쓴다.
+    LLM 프롬프트나 인덱스처럼 dict가 필요한 곳에서는 fact_dict()/to_dict()로 되돌린다.
+    """
+    url: str
+    source: str
+    title: str
+    published_date: Optional[str]
+    collected_at_utc: Optional[str]
+    company: Optional[str]
+    fact_source: Optional[str]
+    date_in_text: Optional[str]
+    facts: Tuple[FactEntry, ...]
+    uncertain: Tuple[str, ...]
+    # 추출기가 fact에 적은 url (meta.url과 다를 수 있어 그대로 보존)
+    fact_url: Optional[str] = None
+    # fact가 dict가 아니던 payload (분류/가설 대상에서 제외)
+    has_fact: bool = True
+
+    @staticmethod
+    def from_dict(payload: Dict[str, Any]) -> "FactPayload":
+        meta = _dict(payload.get("meta"))
+        fact = payload.get("fact", {}) or {}
+        has_fact = isinstance(fact, dict)
+        if not has_fact:
+            fact = {}
+        return FactPayload(
+            url=_str(meta.get("url")),
+            source=_intern(meta.get("source")) or "",
+            title=_str(meta.get("title")),
+            published_date=meta.get("published_date"),
+            collected_at_utc=meta.get("collected_at_utc"),
+            company=_intern(_str(fact.get("company")).strip() or None),
+            fact_source=_intern(fact.get("source")),
+            date_in_text=fact.get("date_in_text"),
+            facts=tuple(FactEntry.from_dict(f) for f in _list(fact.get("facts")) if isinstance(f, dict)),
+            uncertain=tuple(_str(u) for u in _list(fact.get("uncertain"))),
+            fact_url=fact.get("url"),
+            has_fact=has_fact,
+        )
+
+    def fact_dict(self) -> Dict[str, Any]:
+        """
+        FactExtractor 출력 스키마 형태 (분류/가설 프롬프트 입력용)
+        """
+        return {
+            "source": self.fact_source,
+            "url": self.fact_url,
+            "date_in_text": self.date_in_text,
+            "company": self.company,
+            "facts": [f.to_dict() for f in self.facts],
+            "uncertain": list(self.uncertain),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "meta": {
+                "url": self.url,
+                "source": self.source,
+                "title": self.title,
+                "published_date": self.published_date,
+                "collected_at_utc": self.collected_at_utc,
+            },
+            "fact": self.fact_dict(),
+        }
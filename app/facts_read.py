@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import json
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fact_payload import FactPayload
 
 
 def read_fact_payloads(base_dir: str = "data/facts") -> List[Dict[str, Any]]:
@@ -16,3 +20,64 @@ def read_fact_payloads(base_dir: str = "data/facts") -> List[Dict[str, Any]]:
         except Exception:
             continue
     return out
+
+
+def read_fact_records(base_dir: str = "data/facts") -> List[FactPayload]:
+    """
+    저장소 경계에서 payload를 한 번만 디코딩해 슬롯 레코드로 반환한다.
+    읽을 수 없는 레코드는 경고 후 건너뛴다 (구버전/손상 파일 하나로 실행 전체가 멈추지 않게).
+    """
+    base = Path(base_dir)
+    if not base.exists():
+        return []
+    out: List[FactPayload] = []
+    for p in base.rglob("*.json"):
+        rec = _load_record(p)
+        if rec is not None:
+            out.append(rec)
+    return out
+
+
+def _load_record(p: Path) -> Optional[FactPayload]:
+    try:
+        payload = json.loads(p.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError(f"payload is {type(payload).__name__}, not an object")
+        return FactPayload.from_dict(payload)
+    except Exception as e:
+        print(f"[WARN] fact record skipped: {p} / {type(e).__name__}: {e}")
+        return None
+
+
+@dataclass(frozen=True)
+class FactRecordCache:
+    """
+    read_fact_records의 메모리 뷰 (데몬 모드용).
+    파일 mtime이 바뀐 payload만 다시 디코딩하고, 사라진 파일은 뷰에서 뺀다.
+    """
+    base_dir: Path = Path("data/facts")
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    _records: Dict[Path, Tuple[float, FactPayload]] = field(default_factory=dict, compare=False, repr=False)
+
+    def read(self) -> List[FactPayload]:
+        with self._lock:
+            seen = set()
+            for p in self.base_dir.rglob("*.json") if self.base_dir.exists() else ():
+                seen.add(p)
+                try:
+                    mtime = p.stat().st_mtime
+                except OSError:
+                    continue
+                cached = self._records.get(p)
+                if cached is None or cached[0] != mtime:
+                    rec = _load_record(p)
+                    if rec is None:
+                        self._records.pop(p, None)
+                        continue
+                    self._records[p] = (mtime, rec)
+            for p in [p for p in self._records if p not in seen]:
+                del self._records[p]
+            return [rec for _, rec in self._records.values()]
+
+    def __len__(self) -> int:
+        return len(self._records)
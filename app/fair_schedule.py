@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def parse_weights(raw: str) -> Dict[str, float]:
+    """
+    "saramin:2,jobkorea:1" -> {"saramin": 2.0, "jobkorea": 1.0} (잘못된 항목은 무시)
+    """
+    out: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        name, _, w = part.partition(":")
+        try:
+            v = float(w)
+        except ValueError:
+            continue
+        if name.strip() and v > 0:
+            out[name.strip()] = v
+    return out
+
+
+def fair_order(
+    queues: Dict[str, List[T]],
+    weights: Dict[str, float],
+) -> List[Tuple[str, T]]:
+    """
+    경쟁사별 대기열(각각 우선순위 순으로 정렬된 상태)을 가중 공정 큐(WFQ) 순서로 합친다.
+
+    k번째 항목의 가상 완료 시각 = (k + 1) / weight 순으로 내보내므로
+    - 앞에서부터 N개를 자르면 경쟁사별로 대략 N x weight / 합계 만큼씩 배분되고
+    - 항목이 적은 경쟁사의 남는 몫은 자연히 다른 경쟁사로 넘어간다 (재분배)
+    같은 시각이면 queues에 먼저 들어온 경쟁사가 앞.
+    """
+    tagged: List[Tuple[float, int, int, str, T]] = []
+    for order, (name, items) in enumerate(queues.items()):
+        w = weights.get(name, 1.0)
+        for k, it in enumerate(items):
+            tagged.append(((k + 1) / w, order, k, name, it))
+    tagged.sort(key=lambda x: (x[0], x[1], x[2]))
+    return [(name, it) for _, _, _, name, it in tagged]
+
+
+def usage_line(planned: Dict[str, int], used: Dict[str, Dict[str, int]]) -> str:
+    """
+    "saramin 저장 4/실패 1 (할당 5), ..." 형태 요약
+    """
+    names = list(dict.fromkeys(list(planned) + list(used)))
+    parts = []
+    for name in names:
+        u = used.get(name, {})
+        parts.append(
+            f"{name} 저장 {u.get('saved', 0)}/실패 {u.get('failed', 0)} (할당 {planned.get(name, 0)})"
+        )
+    return ", ".join(parts)
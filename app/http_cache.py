@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from .cassette import default_cassette
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; wanted-competitor-monitor/0.1)",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class HttpCache:
+    """
+    RSS/공고 리스트 공용 디스크 HTTP 캐시.
+
+    data/cache/http/<url hash>.json
+    - ETag / Last-Modified 검증자로 조건부 요청 (304면 본문 재다운로드 없음)
+    - 본문 content hash가 같으면 직전 파싱 결과를 그대로 반환 (feedparser/BeautifulSoup 생략)
+    - source별 hit/miss/절약 바이트 통계
+    """
+    base_dir: Path = Path("data/cache/http")
+    session: requests.Session = field(default_factory=requests.Session, compare=False, repr=False)
+    stats: Dict[str, Dict[str, int]] = field(default_factory=dict, compare=False, repr=False)
+
+    def _path(self, url: str) -> Path:
+        return self.base_dir / f"{_sha(url)[:24]}.json"
+
+    def _load(self, url: str) -> Dict[str, Any]:
+        p = self._path(url)
+        if not p.exists():
+            return {}
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def _store(self, url: str, entry: Dict[str, Any]) -> None:
+        p = self._path(url)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+
+    def _count(self, source: str, key: str, n: int = 1) -> None:
+        s = self.stats.setdefault(source, {})
+        s[key] = s.get(key, 0) + n
+
+    def _get(self, url: str, *, source: str, timeout: int) -> tuple[Dict[str, Any], bool]:
+        """
+        Returns (entry, unchanged). entry에는 갱신된 검증자/본문이 들어 있다.
+        """
+        entry = self._load(url)
+        cassette = default_cassette()
+        headers = dict(DEFAULT_HEADERS)
+        # 녹화/재생 중에는 로컬 캐시 상태와 무관하게 같은 응답(전체 본문)이 오가도록 조건부 요청 생략
+        if not cassette.active:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        def get() -> Dict[str, Any]:
+            r = self.session.get(url, headers=headers, timeout=timeout)
+            return {
+                "status": r.status_code,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "text": r.text if r.status_code != 304 else "",
+                "bytes": len(r.content),
+            }
+
+        self._count(source, "requests")
+        r = cassette.call("http", {"url": url}, get, label=url)
+
+        if r["status"] == 304 and "body" in entry:
+            self._count(source, "not_modified")
+            self._count(source, "bytes_saved", len(entry["body"].encode("utf-8")))
+            return entry, True
+
+        if r["status"] >= 400:
+            raise requests.HTTPError(f"{r['status']} Error for url: {url}")
+        body = r["text"]
+        content_hash = _sha(body)
+        unchanged = content_hash == entry.get("content_hash")
+        self._count(source, "bytes_downloaded", r["bytes"])
+        if unchanged:
+            self._count(source, "same_content")
+
+        entry = dict(
+            entry,
+            url=url,
+            etag=r["etag"],
+            last_modified=r["last_modified"],
+            content_hash=content_hash,
+            body=body,
+        )
+        if not unchanged:
+            entry.pop("parsed", None)
+        return entry, unchanged
+
+    def fetch(self, url: str, *, source: str, timeout: int = 20) -> str:
+        entry, unchanged = self._get(url, source=source, timeout=timeout)
+        if not unchanged:
+            self._store(url, entry)
+        return entry["body"]
+
+    def fetch_parsed(
+        self,
+        url: str,
+        *,
+        source: str,
+        parse: Callable[[str], Any],
+        parser_key: str,
+        timeout: int = 20,
+    ) -> Any:
+        """
+        본문이 바뀌지 않았고 같은 parser_key로 파싱해 둔 결과가 있으면 그대로 반환한다.
+        parse 결과는 JSON 직렬화 가능해야 한다.
+        """
+        entry, unchanged = self._get(url, source=source, timeout=timeout)
+        parsed = entry.get("parsed") or {}
+        if unchanged and parsed.get("key") == parser_key:
+            self._count(source, "parse_skipped")
+            return parsed["value"]
+
+        value = parse(entry["body"])
+        entry["parsed"] = {"key": parser_key, "value": value}
+        self._store(url, entry)
+        return value
+
+    def peek_parsed(self, url: str, *, source: str, parser_key: str) -> Optional[Any]:
+        """
+        네트워크 없이 직전 파싱 결과만 반환 (폴링 간격이 안 된 소스용). 없으면 None.
+        """
+        parsed = self._load(url).get("parsed") or {}
+        if parsed.get("key") != parser_key:
+            return None
+        self._count(source, "poll_skipped")
+        return parsed["value"]
+
+    def summary_lines(self) -> List[str]:
+        lines: List[str] = []
+        for source in sorted(self.stats):
+            s = self.stats[source]
+            req = s.get("requests", 0)
+            hits = s.get("not_modified", 0) + s.get("same_content", 0)
+            ratio = round(hits * 100 / req) if req else 0
+            lines.append(
+                f"{source}: hit {hits}/{req} ({ratio}%), 파싱 생략 {s.get('parse_skipped', 0)}, "
+                f"절약 {s.get('bytes_saved', 0) // 1024}KB / 다운로드 {s.get('bytes_downloaded', 0) // 1024}KB"
+            )
+        return lines
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def default_http_cache() -> HttpCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpCache(base_dir=Path(os.environ.get("HTTP_CACHE_DIR", "data/cache/http")))
+    return _default_cache
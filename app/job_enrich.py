@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from .cassette import default_cassette
+from .http_cache import DEFAULT_HEADERS, default_http_cache
+from .job_scraper_proto import JobPosting
+from .rate_limit import RateLimiter
+from .runtime import env_int
+
+
+_REGIONS = (
+    "서울", "경기", "인천", "부산", "대구", "광주", "대전", "울산", "세종",
+    "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주",
+)
+_REGION_RE = re.compile("(" + "|".join(_REGIONS) + ")")
+_YEARS_RE = re.compile(r"경력\s*(\d+)\s*년")
+_SALARY_RE = re.compile(r"(연봉|급여|월급)\s*[:：]?\s*([^\n|,·]{2,30})")
+
+
+@dataclass(frozen=True)
+class JobDetail:
+    """
+    공고 상세 페이지에서 뽑은 구조화 필드 (없으면 빈 문자열).
+    - experience: "신입" | "경력 N년+" | "경력" | "경력무관" | ""
+    - via: "jsonld" (schema.org JobPosting) | "html" (본문/메타 휴리스틱)
+    """
+    url: str
+    company: str = ""
+    category: str = ""
+    experience: str = ""
+    location: str = ""
+    salary: str = ""
+    via: str = ""
+    fetched_at: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "JobDetail":
+        return JobDetail(**{k: str(d.get(k) or "") for k in JobDetail.__dataclass_fields__})
+
+
+def normalize_experience(text: str) -> str:
+    t = (text or "").replace(" ", "")
+    if not t:
+        return ""
+    if "무관" in t:
+        return "경력무관"
+    m = _YEARS_RE.search(text)
+    if m:
+        return f"경력 {int(m.group(1))}년+"
+    if "신입" in t and "경력" not in t:
+        return "신입"
+    if "경력" in t:
+        return "경력"
+    return ""
+
+
+def _months_to_experience(months: Any) -> str:
+    try:
+        m = int(float(months))
+    except (TypeError, ValueError):
+        return ""
+    return "신입" if m <= 0 else f"경력 {max(1, m // 12)}년+"
+
+
+def _text(v: Any) -> str:
+    if isinstance(v, dict):
+        return str(v.get("name") or v.get("value") or "")
+    if isinstance(v, list):
+        return ", ".join(x for x in (_text(i) for i in v) if x)
+    return str(v or "").strip()
+
+
+def _location(v: Any) -> str:
+    locs = v if isinstance(v, list) else [v]
+    for loc in locs:
+        addr = (loc or {}).get("address") if isinstance(loc, dict) else None
+        if isinstance(addr, dict):
+            parts = [addr.get("addressRegion"), addr.get("addressLocality")]
+            s = " ".join(str(p) for p in parts if p)
+            if s:
+                return s
+        elif addr:
+            return str(addr)
+    return ""
+
+
+def _salary(v: Any) -> str:
+    if not isinstance(v, dict):
+        return _text(v)
+    val = v.get("value")
+    unit = ""
+    if isinstance(val, dict):
+        unit = str(val.get("unitText") or "")
+        lo, hi, one = val.get("minValue"), val.get("maxValue"), val.get("value")
+        amount = f"{lo}~{hi}" if lo and hi else str(one or lo or hi or "")
+    else:
+        amount = str(val or "")
+    if not amount:
+        return ""
+    return " ".join(x for x in (amount, str(v.get("currency") or ""), unit) if x)
+
+
+def _jsonld_postings(soup: BeautifulSoup) -> Iterable[Dict[str, Any]]:
+    for tag in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(tag.string or tag.get_text() or "")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        stack = [data]
+        while stack:
+            d = stack.pop()
+            if isinstance(d, list):
+                stack.extend(d)
+            elif isinstance(d, dict):
+                if "@graph" in d:
+                    stack.append(d["@graph"])
+                t = d.get("@type")
+                if t == "JobPosting" or (isinstance(t, list) and "JobPosting" in t):
+                    yield d
+
+
+def parse_job_detail(html: str, *, url: str) -> JobDetail:
+    """
+    schema.org JobPosting(JSON-LD)이 있으면 우선 사용하고, 빈 필드만 메타/본문 휴리스틱으로 채운다.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    fields: Dict[str, str] = {}
+    via = "html"
+    for jp in _jsonld_postings(soup):
+        via = "jsonld"
+        exp = jp.get("experienceRequirements")
+        fields = {
+            "company": _text(jp.get("hiringOrganization")),
+            "category": _text(jp.get("occupationalCategory")) or _text(jp.get("industry")),
+            "experience": (
+                _months_to_experience(exp.get("monthsOfExperience"))
+                if isinstance(exp, dict)
+                else normalize_experience(_text(exp))
+            ),
+            "location": _location(jp.get("jobLocation")),
+            "salary": _salary(jp.get("baseSalary") or jp.get("estimatedSalary")),
+        }
+        break
+
+    def meta(prop: str) -> str:
+        tag = soup.find("meta", attrs={"property": prop}) or soup.find("meta", attrs={"name": prop})
+        return str(tag.get("content") or "").strip() if tag else ""
+
+    if not all(fields.get(k) for k in ("company", "experience", "location", "salary")):
+        body = " ".join(soup.get_text(" ").split())[:20000]
+        desc = meta("og:description") or meta("description")
+        text = f"{desc} {body}"
+        if not fields.get("experience"):
+            fields["experience"] = normalize_experience(" ".join(re.findall(r"(신입|경력\s*\d+\s*년|경력\s*무관|경력)", text)[:3]))
+        if not fields.get("location"):
+            m = _REGION_RE.search(text)
+            fields["location"] = m.group(1) if m else ""
+        if not fields.get("salary"):
+            m = _SALARY_RE.search(text)
+            fields["salary"] = m.group(2).strip() if m else ""
+    return JobDetail(
+        url=url,
+        via=via,
+        fetched_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **{k: fields.get(k, "") for k in ("company", "category", "experience", "location", "salary")},
+    )
+
+
+@dataclass(frozen=True)
+class JobEnricher:
+    """
+    공고 상세 페이지 병렬 수집 + 구조화.
+
+    - data/cache/jobs/<url hash>.json: 공고 URL당 한 번만 가져온다 (ttl_days 동안 재사용, 0 = 만료 없음)
+      HTTP 오류와 필드를 하나도 못 뽑은 페이지(캡차/차단 화면 등)는 캐시하지 않아 다음 실행에서 다시 시도
+    - 전체 동시성 workers, 호스트별로는 분당 host_qpm회 이하 (같은 사이트에 몰리지 않게)
+    - 공용 HTTP 세션(default_http_cache().session) 재사용, record/replay 대상
+    """
+    cache_dir: Path = Path("data/cache/jobs")
+    workers: int = 4
+    host_qpm: int = 30
+    timeout: int = 20
+    ttl_days: int = 14
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+    _limiters: Dict[str, RateLimiter] = field(default_factory=dict, compare=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    @staticmethod
+    def from_env() -> "JobEnricher":
+        return JobEnricher(
+            cache_dir=Path(os.environ.get("JOB_DETAIL_CACHE_DIR", "data/cache/jobs")),
+            workers=env_int("JOB_ENRICH_WORKERS", 4),
+            host_qpm=env_int("JOB_ENRICH_HOST_QPM", 30),
+            ttl_days=env_int("JOB_DETAIL_TTL_DAYS", 14),
+        )
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.json"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _limiter(self, url: str) -> RateLimiter:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            lim = self._limiters.get(host)
+            if lim is None:
+                lim = self._limiters[host] = RateLimiter(self.host_qpm)
+            return lim
+
+    def cached(self, url: str) -> Optional[JobDetail]:
+        p = self._path(url)
+        if not p.exists():
+            return None
+        try:
+            d = JobDetail.from_dict(json.loads(p.read_text(encoding="utf-8")))
+        except (json.JSONDecodeError, OSError, TypeError):
+            return None
+        if self.ttl_days > 0:
+            try:
+                fetched = datetime.fromisoformat(d.fetched_at)
+            except ValueError:
+                return None
+            if datetime.now(timezone.utc) - fetched > timedelta(days=self.ttl_days):
+                return None
+        return d
+
+    def _fetch(self, url: str) -> Optional[JobDetail]:
+        session = default_http_cache().session
+
+        def get() -> Dict[str, Any]:
+            self._limiter(url).acquire()
+            r = session.get(url, headers=DEFAULT_HEADERS, timeout=self.timeout)
+            # charset 헤더가 없으면 requests가 ISO-8859-1로 읽으므로 본문 기준 추정 (EUC-KR 페이지 등)
+            if "charset" not in (r.headers.get("Content-Type") or "").lower():
+                r.encoding = r.apparent_encoding
+            return {
+                "status": r.status_code,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "text": r.text,
+                "bytes": len(r.content),
+            }
+
+        try:
+            r = default_cassette().call("http", {"url": url}, get, label=url)
+            if r["status"] >= 400:
+                raise RuntimeError(f"HTTP {r['status']}")
+            detail = parse_job_detail(r["text"], url=url)
+        except Exception as e:
+            self._count("failed")
+            print(f"[WARN] job detail failed: {url} / {type(e).__name__}: {e}")
+            return None
+
+        self._count("fetched")
+        self._count(f"via_{detail.via}")
+        if not any((detail.company, detail.category, detail.experience, detail.location, detail.salary)):
+            self._count("empty")
+            return detail
+        p = self._path(url)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(detail.to_dict(), ensure_ascii=False), encoding="utf-8")
+        return detail
+
+    def enrich(self, posts: List[JobPosting]) -> Dict[str, JobDetail]:
+        """
+        Returns {공고 URL: JobDetail}. 실패한 공고는 빠진다.
+        """
+        out: Dict[str, JobDetail] = {}
+        todo: List[str] = []
+        for p in posts:
+            if p.url in out or p.url in todo:
+                continue
+            d = self.cached(p.url)
+            if d is not None:
+                self._count("cached")
+                out[p.url] = d
+            else:
+                todo.append(p.url)
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+                for url, d in zip(todo, pool.map(self._fetch, todo)):
+                    if d is not None:
+                        out[url] = d
+        return out
+
+    def summary_line(self) -> str:
+        s = self.stats
+        return (
+            f"공고 상세: 캐시 {s.get('cached', 0)} / 신규 {s.get('fetched', 0)} "
+            f"(JSON-LD {s.get('via_jsonld', 0)}, 빈 페이지 {s.get('empty', 0)}) / 실패 {s.get('failed', 0)}"
+        )
@@ -1,56 +1,37 @@
 from __future__ import annotations
 
+import sys
 import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
-import requests
 from bs4 import BeautifulSoup
 
+from .cassette import default_cassette
+from .http_cache import HttpCache, default_http_cache
+from .poll_schedule import default_poll_scheduler
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class JobPosting:
     source: str
     url: str
     title: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "source", sys.intern(self.source))
 
-def fetch_html(url: str, timeout: int = 20) -> str:
-    r = requests.get(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; wanted-competitor-monitor/0.1)",
-            "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-        },
-        timeout=timeout,
-    )
-    r.raise_for_status()
-    return r.text
 
+def fetch_html(url: str, timeout: int = 20, *, cache: Optional[HttpCache] = None, source: str = "html") -> str:
+    cache = cache or default_http_cache()
+    return cache.fetch(url, source=source, timeout=timeout)
 
-def scrape_list_page_by_href(
-    *,
-    source: str,
-    list_url: str,
-    href_contains: str,
-    limit: int = 30,
-    sleep_sec: float = 1.0,
-) -> List[JobPosting]:
-    """
-    list_url 페이지에서 <a>들을 훑어,
-    href에 href_contains 문자열이 포함된 링크만 공고로 간주해 수집한다.
-    (CSS selector보다 페이지 변경에 강함)
 
-    예:
-      href_contains="/job/posting/"
-      href_contains="Recruit/GI_Read"
-      href_contains="job-search/view?cn=theme"
-    """
-    html = fetch_html(list_url)
+def _parse_postings(html: str, *, list_url: str, href_contains: str, limit: int) -> List[Dict[str, str]]:
     soup = BeautifulSoup(html, "html.parser")
 
-    out: List[JobPosting] = []
+    out: List[Dict[str, str]] = []
 
     for a in soup.find_all("a"):
         href = a.get("href")
@@ -68,14 +49,76 @@ def scrape_list_page_by_href(
         if len(title) < 2:
             continue
 
-        out.append(JobPosting(source=source, url=url, title=title))
+        out.append({"url": url, "title": title})
         if len(out) >= limit:
             break
 
-    time.sleep(sleep_sec)
     return out
 
 
+def scrape_list_page_by_href(
+    *,
+    source: str,
+    list_url: str,
+    href_contains: str,
+    limit: int = 30,
+    sleep_sec: float = 1.0,
+    cache: Optional[HttpCache] = None,
+) -> List[JobPosting]:
+    """
+    list_url 페이지에서 <a>들을 훑어,
+    href에 href_contains 문자열이 포함된 링크만 공고로 간주해 수집한다.
+    (CSS selector보다 페이지 변경에 강함)
+
+    예:
+      href_contains="/job/posting/"
+      href_contains="Recruit/GI_Read"
+      href_contains="job-search/view?cn=theme"
+    """
+    cache = cache or default_http_cache()
+    key = f"jobs:{source}"
+    parser_key = f"postings-v1|{href_contains}|{limit}"
+    poller = default_poll_scheduler()
+    # 폴링 간격이 안 됐으면 요청 없이 직전 목록 (ADAPTIVE_POLL_MODE)
+    rows = None if poller.is_due(key) else cache.peek_parsed(list_url, source=key, parser_key=parser_key)
+    if rows is not None:
+        poller.skip(key)
+        return [JobPosting(source=source, url=r["url"], title=r["title"]) for r in rows]
+
+    # 리스트 페이지가 바뀌지 않았으면 BeautifulSoup 파싱 생략 (http_cache)
+    rows = cache.fetch_parsed(
+        list_url,
+        source=key,
+        parse=lambda html: _parse_postings(html, list_url=list_url, href_contains=href_contains, limit=limit),
+        parser_key=parser_key,
+    )
+    # 목록 diff: 직전 폴링에 없던 공고 URL이 있으면 간격 단축
+    poller.observe(key, [r["url"] for r in rows])
+
+    # replay는 네트워크가 없으니 예의상 대기도 생략
+    if not default_cassette().replaying:
+        time.sleep(sleep_sec)
+    return [JobPosting(source=source, url=r["url"], title=r["title"]) for r in rows]
+
+
+def job_bucket(text: str) -> str:
+    """
+    매우 단순한 키워드 기반 직무군 분류 (공고 제목 또는 상세 페이지의 직무 카테고리)
+    """
+    t = (text or "").lower()
+    if any(k in t for k in ["backend", "front", "fullstack", "engineer", "developer", "개발", "서버", "프론트", "백엔드"]):
+        return "개발"
+    if any(k in t for k in ["data", "ml", "ai", "분석", "데이터", "머신러닝", "모델"]):
+        return "데이터/AI"
+    if any(k in t for k in ["sales", "영업", "bd", "bizdev", "ae", "am"]):
+        return "영업"
+    if any(k in t for k in ["marketing", "마케팅", "growth", "그로스", "브랜딩", "퍼포먼스"]):
+        return "마케팅"
+    if any(k in t for k in ["design", "designer", "디자인", "ui", "ux", "product designer"]):
+        return "디자인"
+    return "기타"
+
+
 def analyze_titles_basic(posts: List[JobPosting]) -> Dict[str, int]:
     """
     매우 단순한 키워드 기반 직무군 분류(샘플 N개 기준).
@@ -83,19 +126,5 @@ def analyze_titles_basic(posts: List[JobPosting]) -> Dict[str, int]:
     """
     buckets = {"개발": 0, "데이터/AI": 0, "영업": 0, "마케팅": 0, "디자인": 0, "기타": 0}
     for p in posts:
-        t = p.title.lower()
-
-        if any(k in t for k in ["backend", "front", "fullstack", "engineer", "developer", "개발", "서버", "프론트", "백엔드"]):
-            buckets["개발"] += 1
-        elif any(k in t for k in ["data", "ml", "ai", "분석", "데이터", "머신러닝", "모델"]):
-            buckets["데이터/AI"] += 1
-        elif any(k in t for k in ["sales", "영업", "bd", "bizdev", "ae", "am"]):
-            buckets["영업"] += 1
-        elif any(k in t for k in ["marketing", "마케팅", "growth", "그로스", "브랜딩", "퍼포먼스"]):
-            buckets["마케팅"] += 1
-        elif any(k in t for k in ["design", "designer", "디자인", "ui", "ux", "product designer"]):
-            buckets["디자인"] += 1
-        else:
-            buckets["기타"] += 1
-
+        buckets[job_bucket(p.title)] += 1
     return buckets
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from .job_scraper_proto import JobPosting, analyze_titles_basic, scrape_list_page_by_href
+from .job_enrich import JobDetail, JobEnricher
+from .job_scraper_proto import JobPosting, job_bucket, scrape_list_page_by_href
+from .runtime import env_bool
 
 
 @dataclass(frozen=True)
@@ -14,7 +18,60 @@ class CompetitorJobSource:
     limit: int = 30
 
 
-def build_jobs_section(sources: List[CompetitorJobSource]) -> str:
+def _bucket_counts(posts: List[JobPosting], details: Dict[str, JobDetail]) -> Dict[str, int]:
+    # 상세 페이지의 직무 카테고리가 있으면 그것으로, 분류가 안 되면 제목으로
+    buckets = {"개발": 0, "데이터/AI": 0, "영업": 0, "마케팅": 0, "디자인": 0, "기타": 0}
+    for p in posts:
+        d = details.get(p.url)
+        b = job_bucket(d.category) if d and d.category else "기타"
+        if b == "기타":
+            b = job_bucket(p.title)
+        buckets[b] += 1
+    return buckets
+
+
+def _top(counter: Counter, n: int = 3) -> str:
+    return " / ".join(f"{k} {v}" for k, v in counter.most_common(n)) or "-"
+
+
+def _experience_group(e: str) -> str:
+    if not e:
+        return "미상"
+    if e == "경력무관":
+        return "무관"
+    return "신입" if e == "신입" else "경력"
+
+
+# 금액으로 볼 수 있는 숫자: "3,000" / "4000~5000" / "30000000 KRW" / "3천만원"
+_SALARY_AMOUNT_RE = re.compile(r"\d[\d,]{2,}|\d+\s*[천만억]")
+
+
+def _salary_disclosed(salary: str) -> bool:
+    # "회사내규에 따름", "면접 후 협의"처럼 금액이 없는 문구는 명시로 치지 않는다
+    return bool(_SALARY_AMOUNT_RE.search(salary or ""))
+
+
+def _detail_lines(details: List[JobDetail]) -> List[str]:
+    n = len(details)
+    exp = Counter(_experience_group(d.experience) for d in details)
+    regions = Counter(d.location.split()[0] for d in details if d.location)
+    companies = Counter(d.company for d in details if d.company)
+    salary = sum(1 for d in details if _salary_disclosed(d.salary))
+    return [
+        "- 경력: " + " / ".join(f"{k} {exp.get(k, 0)}" for k in ("신입", "경력", "무관", "미상")),
+        f"- 지역: {_top(regions)}",
+        f"- 연봉 명시: {salary}/{n} ({round(salary * 100 / n)}%)",
+        f"- 채용 기업 상위: {_top(companies)}",
+    ]
+
+
+def build_jobs_section(sources: List[CompetitorJobSource], enricher: Optional[JobEnricher] = None) -> str:
+    """
+    enricher가 있으면 공고 상세 페이지(URL당 1회 캐시)의 직무/경력/지역/연봉/기업 필드로 집계한다.
+    enricher를 넘기지 않아도 JOB_ENRICH_MODE=true 면 환경변수 설정(JobEnricher.from_env)으로 만든다.
+    """
+    if enricher is None and env_bool("JOB_ENRICH_MODE", False):
+        enricher = JobEnricher.from_env()
     lines: List[str] = []
     lines.append("*[공고 샘플 기반 직무군 분포(경쟁사별)]*")
     lines.append("_※ 각 플랫폼 '리스트 페이지'에서 공고 제목 링크를 샘플 수집해 집계합니다. (페이지 구조/차단 시 누락 가능)_")
@@ -36,7 +93,8 @@ def build_jobs_section(sources: List[CompetitorJobSource]) -> str:
                 lines.append("")
                 continue
 
-            buckets: Dict[str, int] = analyze_titles_basic(posts)
+            details: Dict[str, JobDetail] = enricher.enrich(posts) if enricher is not None else {}
+            buckets: Dict[str, int] = _bucket_counts(posts, details)
             total = sum(buckets.values()) or 1
 
             order: List[Tuple[str, int]] = [
@@ -48,16 +106,22 @@ def build_jobs_section(sources: List[CompetitorJobSource]) -> str:
                 ("기타", buckets.get("기타", 0)),
             ]
 
-            lines.append(f"*■ {src.name}* (샘플 {len(posts)}개)")
+            head = f"*■ {src.name}* (샘플 {len(posts)}개"
+            lines.append(head + (f", 상세 {len(details)}개)" if details else ")"))
             parts = []
             for k, v in order:
                 pct = round(v * 100 / total)
                 parts.append(f"{k} {v}({pct}%)")
             lines.append("- " + " / ".join(parts))
+            if details:
+                lines.extend(_detail_lines(list(details.values())))
             lines.append("")
         except Exception as e:
             lines.append(f"*■ {src.name}*")
             lines.append(f"- 수집/분석 오류: {type(e).__name__}")
             lines.append("")
 
+    if enricher is not None:
+        lines.append(f"_{enricher.summary_line()}_")
+
     return "\n".join(lines).strip() + "\n"
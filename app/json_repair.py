@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```\s*$")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass(frozen=True)
+class RepairResult:
+    value: Any
+    repaired: bool     # 원문 그대로 파싱되지 않아 로컬 복구를 거쳤는지
+    truncated: bool    # 출력이 중간에 끊겨(닫히지 않은 괄호) 일부만 복구했는지
+
+
+def _strip_wrappers(text: str) -> str:
+    """
+    코드펜스(```json ... ```)와 JSON 앞쪽 잡음을 제거한다.
+    """
+    t = (text or "").strip()
+    t = _FENCE_RE.sub("", t).strip()
+    starts = [i for i in (t.find("{"), t.find("[")) if i >= 0]
+    return t[min(starts):] if starts else t
+
+
+def _scan(text: str) -> Tuple[Optional[int], List[Tuple[int, str]], str, bool]:
+    """
+    최상위 JSON 값을 한 번 훑는다.
+
+    반환:
+    - end: 최상위 값이 닫힌 위치(뒤따르는 잡음 제거용), 닫히지 않았으면 None
+    - cuts: (자를 위치, 그 시점에 필요한 닫는 괄호) 목록 — 마지막 완결 원소 직후 지점들
+    - closers: 끝까지 읽었을 때 남은 닫는 괄호
+    - in_string: 문자열 안에서 끝났는지
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escape = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "}]":
+            if not stack:
+                return i, cuts, "", False
+            stack.pop()
+            if not stack:
+                return i + 1, cuts, "", False
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch == "," and stack:
+            cuts.append((i, "".join(reversed(stack))))
+
+    return None, cuts, "".join(reversed(stack)), in_string
+
+
+def _drop_trailing_commas(text: str) -> str:
+    # 문자열 밖의 ",}" / ",]" 만 제거
+    out: List[str] = []
+    in_string = False
+    escape = False
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "}]":
+            while out and out[-1] in " \t\r\n":
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+        out.append(ch)
+    return "".join(out)
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(_drop_trailing_commas(text))
+    except (json.JSONDecodeError, ValueError):
+        return None
+
+
+def repair_json(text: str) -> Optional[RepairResult]:
+    """
+    모델 출력에서 JSON을 로컬로 복구한다. 복구할 수 없으면 None.
+
+    처리 순서:
+    1) 그대로 파싱
+    2) 코드펜스/앞뒤 잡음 제거 후 최상위 값만 파싱
+    3) 잘린 출력(max_output_tokens)은 마지막 완결 원소까지 자르고 괄호를 닫는다.
+       (미완성 문자열을 억지로 닫아 반쪽짜리 Fact를 만들지 않기 위해 완결 지점을 우선)
+    """
+    raw = (text or "").strip()
+    if not raw:
+        return None
+
+    try:
+        return RepairResult(value=json.loads(raw), repaired=False, truncated=False)
+    except json.JSONDecodeError:
+        pass
+
+    body = _strip_wrappers(raw)
+    end, cuts, closers, in_string = _scan(body)
+
+    if end is not None:
+        v = _loads(body[:end])
+        return RepairResult(value=v, repaired=True, truncated=False) if v is not None else None
+
+    for pos, close in reversed(cuts):
+        v = _loads(body[:pos] + close)
+        if v is not None:
+            return RepairResult(value=v, repaired=True, truncated=True)
+
+    v = _loads(body + ('"' if in_string else "") + closers)
+    if v is not None:
+        return RepairResult(value=v, repaired=True, truncated=True)
+    return None
+
+
+class JsonStream:
+    """
+    스트리밍 응답용 증분 JSON 스캐너.
+
+    feed(chunk)는 이번 조각으로 완결된 최상위 객체 필드 [(key, value)]를 돌려준다.
+    - 최상위 값 앞의 잡음(코드펜스 등)은 건너뛴다
+    - 최상위 값이 닫히면 done=True, text는 그 값까지, tail은 뒤따른 출력
+    - 최상위가 배열이면 필드는 내보내지 않고 done만 판정
+    """
+
+    def __init__(self) -> None:
+        self._buf: List[str] = []
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._field_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        raw = "".join(self._buf)
+        if self._start is None:
+            return raw
+        return raw[self._start:self._end]
+
+    @property
+    def tail(self) -> str:
+        return "".join(self._buf)[self._end:] if self._end is not None else ""
+
+    def _field(self, raw: str, end: int) -> Optional[Tuple[str, Any]]:
+        seg = raw[self._field_start:end].strip()
+        if not seg:
+            return None
+        v = _loads("{" + seg + "}")
+        if not isinstance(v, dict) or len(v) != 1:
+            return None
+        return next(iter(v.items()))
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._buf.append(chunk or "")
+        if self._end is not None:
+            return []
+        raw = "".join(self._buf)
+        fields: List[Tuple[str, Any]] = []
+
+        for i in range(self._pos, len(raw)):
+            ch = raw[i]
+            if self._start is None:
+                if ch in _CLOSERS:
+                    self._start = i
+                    self._stack.append(_CLOSERS[ch])
+                    self._field_start = i + 1 if ch == "{" else None
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(_CLOSERS[ch])
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    if self._field_start is not None:
+                        f = self._field(raw, i)
+                        if f:
+                            fields.append(f)
+                    self._end = i + 1
+                    break
+            elif ch == "," and len(self._stack) == 1 and self._field_start is not None:
+                f = self._field(raw, i)
+                if f:
+                    fields.append(f)
+                self._field_start = i + 1
+
+        self._pos = len(raw) if self._end is None else self._end
+        return fields
+
+
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "boolean": (bool,),
+    "number": (int, float),
+    "null": (type(None),),
+}
+
+
+def _type_ok(value: Any, expected: Any) -> bool:
+    names = expected if isinstance(expected, (list, tuple)) else [expected]
+    for name in names:
+        if name == "number" and isinstance(value, bool):
+            continue
+        if isinstance(value, _TYPES[name]):
+            return True
+    return False
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    JSON Schema의 작은 부분집합(type/required/properties/items/enum)으로 검증한다.
+    오류 경로 목록을 반환(빈 목록이면 통과).
+    """
+    errors: List[str] = []
+
+    expected = schema.get("type")
+    if expected and not _type_ok(value, expected):
+        errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+        return errors
+
+    enum = schema.get("enum")
+    if enum is not None and value not in enum:
+        errors.append(f"{path}: {value!r} not in {enum}")
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: missing")
+        for key, sub in (schema.get("properties") or {}).items():
+            if key in value:
+                errors.extend(validate(value[key], sub, f"{path}.{key}"))
+
+    if isinstance(value, list) and "items" in schema:
+        for i, v in enumerate(value):
+            errors.extend(validate(v, schema["items"], f"{path}[{i}]"))
+
+    return errors
@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .evidence_select import select_evidence
+from .facts_read import read_fact_records
+from .fact_extractor_vertex import FactExtractor
+from .runtime import stage_model, vertex_llm_from_env
+from .signal_classifier_vertex import SignalClassifier
+from .strategy_hypothesis_vertex import StrategyHypothesis
+from .text_tokens import char_ngrams, estimate_tokens
+from .wanted_response_vertex import TenantResponse
+
+
+STAGES = ("extract", "classify", "hypothesis", "response")
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    골든셋 항목. label이 None이면 기준 모델(--reference)의 출력과 비교한다.
+    """
+    key: str
+    input: Dict[str, Any]
+    label: Optional[str] = None
+
+
+@dataclass
+class CellResult:
+    """
+    (단계, 모델) 하나의 평가 결과
+    """
+    stage: str
+    model: str
+    ms: List[float] = field(default_factory=list)
+    ok: int = 0
+    invalid: int = 0
+    agreement: List[float] = field(default_factory=list)
+    in_tokens: int = 0
+    out_tokens: int = 0
+    retried: int = 0
+    outputs: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def n(self) -> int:
+        return self.ok + self.invalid
+
+    def pct(self, q: float) -> float:
+        if not self.ms:
+            return 0.0
+        xs = sorted(self.ms)
+        return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+    @property
+    def valid_rate(self) -> float:
+        return self.ok / self.n if self.n else 0.0
+
+    @property
+    def agree_rate(self) -> Optional[float]:
+        # 비교 대상이 없으면 None (생성형 단계의 기준 모델 자신)
+        return sum(self.agreement) / len(self.agreement) if self.agreement else None
+
+    def cost(self, prices: Dict[str, tuple]) -> Optional[float]:
+        """
+        USD (prices: 모델 -> (입력, 출력) 1M 토큰당 가격)
+        """
+        p = prices.get(self.model)
+        if p is None:
+            return None
+        return (self.in_tokens * p[0] + self.out_tokens * p[1]) / 1_000_000
+
+    def to_dict(self, prices: Dict[str, tuple]) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "model": self.model,
+            "n": self.n,
+            "p50_ms": round(self.pct(0.5)),
+            "p95_ms": round(self.pct(0.95)),
+            "valid": round(self.valid_rate, 3),
+            "agreement": round(self.agree_rate, 3) if self.agree_rate is not None else None,
+            "in_tokens": self.in_tokens,
+            "out_tokens": self.out_tokens,
+            "retried": self.retried,
+            "cost_usd": self.cost(prices),
+        }
+
+
+def similarity(a: Any, b: Any) -> float:
+    """
+    두 JSON 값의 문자열 내용을 문자 bigram Jaccard로 비교 (생성형 단계의 기준 모델 대비 일치도)
+    """
+    def words(v: Any) -> List[str]:
+        if isinstance(v, dict):
+            return [w for x in v.values() for w in words(x)]
+        if isinstance(v, list):
+            return [w for x in v for w in words(x)]
+        return [str(v)] if isinstance(v, str) and v else []
+
+    sa, sb = set(char_ngrams(" ".join(words(a)))), set(char_ngrams(" ".join(words(b))))
+    if not sa and not sb:
+        return 1.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def golden_set(
+    facts_dir: str = "data/facts",
+    timeline_dir: str = "data/index/timeline",
+    *,
+    limit: int = 30,
+) -> Dict[str, List[Case]]:
+    """
+    저장된 payload / 타임라인 인덱스로 단계별 골든셋을 만든다.
+    - extract: 저장된 기사 제목(+ 기사 본문 캐시가 있으면 발췌) → 기준 모델 출력과 비교 (RSS 요약은 저장되지 않음)
+    - classify: LLM이 분류한 타임라인 항목의 signal_level이 정답 (규칙 분류 항목 제외)
+    - hypothesis: 경쟁사별 A/B Fact 근거 → 기준 모델 출력과 비교
+    - response: 기준 모델의 가설 → 기준 모델 출력과 비교 (run()에서 채움)
+    """
+    from .article_body import ArticleFetcher, build_excerpt
+    from .timeline_index import TimelineIndex
+
+    records = read_fact_records(facts_dir)
+    records.sort(key=lambda r: (r.published_date or "", r.url), reverse=True)
+    by_url = {r.url: r for r in records}
+    articles = ArticleFetcher()
+
+    extract: List[Case] = []
+    for r in records[:limit]:
+        body = articles.cached(r.url)
+        raw = build_excerpt(body["text"], budget_tokens=600) if body else ""
+        extract.append(
+            Case(key=r.url, input={"source": r.source, "url": r.url, "title": r.title, "raw_text": raw or r.title})
+        )
+
+    index = TimelineIndex(base_dir=Path(timeline_dir))
+    entries = [
+        e
+        for c in index.companies()
+        for e in index.read(c)
+        if e.get("signal_level") and not str(e.get("reason", "")).startswith("[rule]")
+    ]
+    entries.sort(key=lambda e: e.get("date", ""), reverse=True)
+
+    def fact_of(e: Dict[str, Any]) -> Dict[str, Any]:
+        rec = by_url.get(e.get("url", ""))
+        return rec.fact_dict() if rec else {"company": e.get("company"), "facts": e.get("facts") or []}
+
+    classify = [Case(key=e["key"], input={"fact_json": fact_of(e)}, label=e["signal_level"]) for e in entries[:limit]]
+
+    by_company: Dict[str, List[Dict[str, Any]]] = {}
+    for e in entries:
+        if e["signal_level"] in ("A", "B"):
+            f = fact_of(e)
+            f["_signal"] = {"signal_level": e["signal_level"], "reason": e.get("reason", "")}
+            by_company.setdefault(e["company"], []).append(f)
+    hypothesis = [
+        Case(key=company, input={"facts": select_evidence(facts, max_items=8, token_budget=3000)})
+        for company, facts in sorted(by_company.items())[:limit]
+    ]
+    return {"extract": extract, "classify": classify, "hypothesis": hypothesis, "response": []}
+
+
+def _stage_call(stage: str, llm: Any) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    if stage == "extract":
+        ex = FactExtractor(llm=llm)
+        return lambda x: ex.extract(**x)
+    if stage == "classify":
+        cl = SignalClassifier(llm=llm)
+        return lambda x: cl.classify(x["fact_json"])
+    if stage == "hypothesis":
+        hy = StrategyHypothesis(llm=llm)
+        return lambda x: hy.infer(x["facts"])
+    rs = TenantResponse(llm=llm)
+    return lambda x: rs.propose(x["hypothesis"])
+
+
+@dataclass(frozen=True)
+class FakeLLM:
+    """
+    GCP 없이 배선 점검용: 스키마를 만족하는 결정적 응답 (모델/입력 해시 기반), 호출당 latency_ms 대기.
+    일치도 수치는 의미 없다. 실제 응답으로 오프라인 평가하려면 IO_MODE=replay (+ IO_REPLAY_LATENCY=1).
+    """
+    model_name: str
+    latency_ms: float = 5.0
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    def _fake(self, schema: Dict[str, Any], seed: int, depth: int = 0) -> Any:
+        if "enum" in schema:
+            return schema["enum"][seed % len(schema["enum"])]
+        t = schema.get("type")
+        t = t[0] if isinstance(t, list) else t
+        if t == "object":
+            props = schema.get("properties") or {}
+            return {k: self._fake(props.get(k, {"type": "string"}), seed + i, depth + 1) for i, k in enumerate(props)}
+        if t == "array":
+            return [self._fake(schema.get("items") or {"type": "string"}, seed, depth + 1)] if depth < 3 else []
+        if t == "boolean":
+            return bool(seed % 2)
+        if t == "number":
+            return seed % 100
+        if t == "null":
+            return None
+        return f"{self.model_name} {seed % 7}"
+
+    def generate_json(self, system_instruction: str, user_input: str, *, schema: Optional[Dict[str, Any]] = None, **_: Any) -> Any:
+        time.sleep(self.latency_ms / 1000)
+        seed = int(hashlib.sha256(f"{self.model_name}|{user_input}".encode("utf-8")).hexdigest()[:8], 16)
+        self.stats["calls"] = self.stats.get("calls", 0) + 1
+        self.stats["in_tokens"] = self.stats.get("in_tokens", 0) + estimate_tokens(system_instruction + user_input)
+        out = self._fake(schema or {"type": "object"}, seed)
+        self.stats["out_tokens"] = self.stats.get("out_tokens", 0) + estimate_tokens(json.dumps(out, ensure_ascii=False))
+        return out
+
+
+def evaluate_cell(
+    stage: str,
+    model: str,
+    llm: Any,
+    cases: Sequence[Case],
+    *,
+    reference: Optional[Dict[str, Any]] = None,
+    workers: int = 4,
+) -> CellResult:
+    """
+    cases를 workers개 스레드로 돌려 지연/유효성/일치도를 모은다.
+    label이 있으면 signal_level 일치, 없으면 reference[key]와 similarity()
+    """
+    res = CellResult(stage=stage, model=model)
+    call = _stage_call(stage, llm)
+
+    def one(case: Case) -> tuple:
+        t0 = time.perf_counter()
+        try:
+            out = call(case.input)
+        except Exception as e:
+            print(f"[WARN] eval {stage}/{model} failed: {case.key[:60]} / {type(e).__name__}: {e}")
+            out = None
+        return case, (time.perf_counter() - t0) * 1000, out
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for case, ms, out in pool.map(one, cases):
+            res.ms.append(ms)
+            if out is None:
+                res.invalid += 1
+                continue
+            res.ok += 1
+            res.outputs[case.key] = out
+            if case.label is not None:
+                res.agreement.append(1.0 if (out.get("signal_level") or "").strip() == case.label else 0.0)
+            elif reference is not None and case.key in reference:
+                res.agreement.append(similarity(out, reference[case.key]))
+
+    res.in_tokens = llm.stats.get("in_tokens", 0)
+    res.out_tokens = llm.stats.get("out_tokens", 0)
+    res.retried = llm.stats.get("retried", 0)
+    return res
+
+
+def recommend(
+    results: List[CellResult],
+    reference_model: str,
+    prices: Dict[str, tuple],
+    *,
+    min_valid: float = 0.95,
+    min_agreement: Dict[str, float],
+) -> Dict[str, str]:
+    """
+    단계별로 유효율/일치도 기준을 넘는 모델 중 비용(가격이 있으면) → p95 지연이 가장 낮은 모델.
+    정답 라벨이 있는 단계(classify)는 기준 모델도 일치도 기준을 적용하고,
+    비교 대상이 없는 생성형 단계의 기준 모델(agree_rate None)만 일치도를 면제한다.
+    기준을 넘는 모델이 없으면 기준 모델 (경고 출력).
+    """
+    out: Dict[str, str] = {}
+    for stage in STAGES:
+        cells = [r for r in results if r.stage == stage and r.n]
+        if not cells:
+            continue
+        threshold = min_agreement.get(stage, 0.0)
+
+        def agrees(r: CellResult) -> bool:
+            if r.agree_rate is None:
+                return r.model == reference_model or threshold <= 0
+            return r.agree_rate >= threshold
+
+        ok = [r for r in cells if r.valid_rate >= min_valid and agrees(r)]
+        if not ok:
+            print(f"[WARN] model_eval {stage}: no model meets valid>={min_valid} / agreement>={threshold}, keeping {reference_model}")
+            out[stage] = reference_model
+            continue
+        best = min(ok, key=lambda r: (r.cost(prices) if r.cost(prices) is not None else float("inf"), r.pct(0.95)))
+        out[stage] = best.model
+    return out
+
+
+def run(
+    cases: Dict[str, List[Case]],
+    models: Sequence[str],
+    reference_model: str,
+    make_llm: Callable[[str], Any],
+    *,
+    stages: Sequence[str] = STAGES,
+    workers: int = 4,
+) -> List[CellResult]:
+    """
+    단계 순서대로, 기준 모델을 먼저 돌린 뒤 나머지 모델을 같은 입력으로 평가한다.
+    response 골든셋은 기준 모델의 가설 출력으로 만든다.
+    """
+    ordered = [reference_model] + [m for m in models if m != reference_model]
+    # response만 평가해도 입력(기준 모델 가설)은 필요
+    needed = set(stages) | ({"hypothesis"} if "response" in stages else set())
+    results: List[CellResult] = []
+    ref_hypotheses: Dict[str, Any] = {}
+    for stage in STAGES:
+        stage_cases = cases.get(stage, [])
+        if stage == "response":
+            stage_cases = [Case(key=k, input={"hypothesis": h}) for k, h in ref_hypotheses.items()]
+        if not stage_cases or stage not in needed:
+            continue
+        reference: Dict[str, Any] = {}
+        for model in ordered if stage in stages else [reference_model]:
+            cell = evaluate_cell(stage, model, make_llm(model), stage_cases, reference=reference or None, workers=workers)
+            if model == reference_model:
+                reference = cell.outputs
+                if stage == "hypothesis":
+                    ref_hypotheses = dict(cell.outputs)
+            if stage in stages:
+                results.append(cell)
+            print(f"[EVAL] {stage} / {model}: {cell.n}건 p50 {cell.pct(0.5):.0f}ms / 유효 {cell.valid_rate:.0%}")
+    return results
+
+
+def parse_prices(spec: str) -> Dict[str, tuple]:
+    """
+    "gemini-2.0-flash-lite=0.075/0.3,gemini-2.0-flash=0.1/0.4" -> {모델: (입력, 출력)} (USD / 1M 토큰)
+    """
+    out: Dict[str, tuple] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, _, p = part.partition("=")
+        try:
+            i, _, o = p.partition("/")
+            out[name.strip()] = (float(i), float(o or i))
+        except ValueError:
+            print(f"[WARN] bad price spec ignored: {part!r}")
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .vertex_llm import VertexLLM
+
+    ap = argparse.ArgumentParser(
+        prog="python -m app.model_eval",
+        description="저장된 payload 골든셋으로 LLM 단계별 모델의 지연/토큰/JSON 유효성/일치도를 비교하고 단계별 모델을 추천",
+    )
+    ap.add_argument("--models", required=True, help="쉼표 구분 모델 목록")
+    ap.add_argument("--reference", help="기준 모델 (기본: GEMINI_MODEL)")
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--limit", type=int, default=30, help="단계별 최대 항목 수")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--prices", default=os.environ.get("MODEL_PRICES", ""), help="모델=입력/출력 USD per 1M 토큰, 쉼표 구분")
+    ap.add_argument("--min-valid", type=float, default=0.95)
+    ap.add_argument("--min-label-agreement", type=float, default=0.9, help="classify: 정답 라벨 일치율 기준")
+    ap.add_argument("--min-similarity", type=float, default=0.5, help="생성형 단계: 기준 모델 대비 유사도 기준")
+    ap.add_argument("--fake", action="store_true", help="Vertex 대신 FakeLLM (배선 점검용)")
+    ap.add_argument("--facts-dir", default="data/facts")
+    ap.add_argument("--timeline-dir", default="data/index/timeline")
+    ap.add_argument("--out", default="reports/model_eval.json")
+    args = ap.parse_args(argv)
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    reference_model = args.reference or stage_model()
+    stages = [s.strip() for s in args.stages.split(",") if s.strip() in STAGES]
+    prices = parse_prices(args.prices)
+
+    cases = golden_set(args.facts_dir, args.timeline_dir, limit=args.limit)
+    print("golden: " + " / ".join(f"{s} {len(cases[s])}" for s in STAGES if s != "response"))
+
+    def make_llm(model: str) -> Any:
+        if args.fake:
+            return FakeLLM(model_name=model)
+        # (단계, 모델)마다 새 인스턴스 → stats가 셀 단위 (LLM_QPM 한도/스트리밍 설정은 공유)
+        base = vertex_llm_from_env()
+        return VertexLLM(
+            project_id=base.project_id,
+            region=base.region,
+            model_name=model,
+            rate_limiter=base.rate_limiter,
+            stream=base.stream,
+        )
+
+    results = run(cases, models, reference_model, make_llm, stages=stages, workers=args.workers)
+    if not results:
+        print("nothing to evaluate (data/facts / timeline index empty?)")
+        return
+
+    print(
+        f"{'stage':<11}{'model':<28}{'n':>4}{'p50ms':>8}{'p95ms':>8}{'valid':>7}{'agree':>7}"
+        f"{'in_tok':>9}{'out_tok':>9}{'retry':>6}{'cost$':>9}"
+    )
+    for r in results:
+        c = r.cost(prices)
+        print(
+            f"{r.stage:<11}{r.model[:27]:<28}{r.n:>4}{r.pct(0.5):>8.0f}{r.pct(0.95):>8.0f}{r.valid_rate:>7.0%}"
+            f"{(f'{r.agree_rate:.0%}' if r.agree_rate is not None else '-'):>7}{r.in_tokens:>9}{r.out_tokens:>9}{r.retried:>6}"
+            f"{(f'{c:.4f}' if c is not None else '-'):>9}"
+        )
+
+    mapping = recommend(
+        results,
+        reference_model,
+        prices,
+        min_valid=args.min_valid,
+        min_agreement={
+            "classify": args.min_label_agreement,
+            "extract": args.min_similarity,
+            "hypothesis": args.min_similarity,
+            "response": args.min_similarity,
+        },
+    )
+    print("recommended (env):")
+    for stage, model in mapping.items():
+        print(f"  GEMINI_MODEL_{stage.upper()}={model}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(
+        json.dumps(
+            {
+                "reference": reference_model,
+                "results": [r.to_dict(prices) for r in results],
+                "recommended": mapping,
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,61 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from .article_body import ArticleFetcher
+from .cassette import default_cassette
 from .company_map import CompanyMapper
 from .config import Settings
-from .collector_rss import Item, collect_news_for_competitor
+from .collector_rss import Item, poll_news_for_competitor
 from .dedup import dedup_by_url
+from .evidence_select import select_evidence
+from .extract_queue import drain, enqueue_items, pending_items
+from .fact_dedup import dedup_facts
 from .fact_extractor_vertex import FactExtractor
-from .facts_read import read_fact_payloads
+from .fact_payload import FactPayload
+from .fair_schedule import fair_order, parse_weights, usage_line
+from .http_cache import default_http_cache
+from .poll_schedule import default_poll_scheduler
+from .profiling import StageProfiler, get_profiler
 from .report_generator import build_draft_report, to_markdown
-from .report_strategy_renderer import render_strategy_report
+from .relevance import RelevanceScorer, distribution_line, rank_items
+from .runtime import (
+    env_bool,
+    env_float,
+    env_int,
+    fact_store,
+    now_utc,
+    read_facts,
+    timeline_index,
+    to_utc,
+    vertex_llm_from_env,
+)
+from .report_strategy_renderer import render_strategy_report, render_trend_report
 from .signal_classifier_vertex import SignalClassifier
-from .slack_sender import send_to_slack
+from .signal_rules import TieredClassifier
+from .slack_sender import default_slack_delivery, send_to_slack
 from .storage_fact import FactStore
 from .strategy_hypothesis_vertex import StrategyHypothesis
+from .timeline_index import TimelineIndex
+from .trend_consistency_vertex import TrendConsistency
 from .vertex_llm import VertexLLM
-from .wanted_response_vertex import WantedResponse
-
-
-def _now_utc() -> datetime:
-    return datetime.now(timezone.utc)
-
-
-def _to_utc(dt: Optional[datetime]) -> Optional[datetime]:
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
-def _env_int(name: str, default: int) -> int:
-    v = os.environ.get(name)
-    if not v:
-        return default
-    try:
-        return int(v)
-    except ValueError:
-        return default
-
-
-def _env_bool(name: str, default: bool = False) -> bool:
-    v = (os.environ.get(name) or "").strip().lower()
-    if not v:
-        return default
-    return v in ("1", "true", "yes", "y", "on")
+from .tenants import TenantProfile, load_tenants
+from .wanted_response_vertex import TenantResponse
+from .watermark import Watermark
+from .work_queue import WorkQueue
 
 
 def _collect_all(settings: Settings) -> Dict[str, List[Item]]:
+    # ADAPTIVE_POLL_MODE=true면 간격이 안 된 피드는 직전 결과 재사용 (poll_schedule)
+    store = fact_store()
     collected: Dict[str, List[Item]] = {}
     for c in settings.competitors:
         try:
-            collected[c] = collect_news_for_competitor(c)
+            collected[c] = poll_news_for_competitor(c, is_known=lambda url: store.exists_any(url=url))
         except Exception as e:
             collected[c] = []
             print(f"[WARN] collector failed for {c}: {type(e).__name__}: {e}")
@@ -68,56 +69,133 @@ def _flatten(collected: Dict[str, List[Item]]) -> List[Item]:
     return out
 
 
-def _vertex_llm_from_env() -> VertexLLM:
-    model_name = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-lite").strip()
-    return VertexLLM(
-        project_id=os.environ["GCP_PROJECT_ID"],
-        region=os.environ["GCP_REGION"],
-        model_name=model_name,
-    )
+def _signal_classifier(llm: VertexLLM) -> SignalClassifier | TieredClassifier:
+    """
+    SIGNAL_RULES_MODE=true면 키워드 규칙으로 확실한 Fact(확신도 >= SIGNAL_RULE_MIN_CONF_PCT)는
+    로컬에서 끝내고 애매한 것만 Gemini로 보낸다.
+    """
+    classifier = SignalClassifier(llm=llm)
+    if not env_bool("SIGNAL_RULES_MODE", False):
+        return classifier
+    return TieredClassifier(classifier, min_confidence=env_int("SIGNAL_RULE_MIN_CONF_PCT", 80) / 100)
+
 
+def _classify_line(classifier: SignalClassifier | TieredClassifier, stats: Dict[str, int]) -> str:
+    line = f"신규 {stats.get('classified', 0)} / 캐시 {stats.get('cached', 0)}"
+    if stats.get("merged"):
+        line += f" / 병합 기사 {stats['merged']}"
+    if isinstance(classifier, TieredClassifier):
+        line += f" (규칙 {classifier.stats.get('rule', 0)} / LLM {classifier.stats.get('llm', 0)})"
+    return line
 
-def _infer_group_key(payload: dict, mapper: CompanyMapper) -> str:
+
+def _article_texts(
+    fetcher: ArticleFetcher, competitor_of: Dict[str, str]
+) -> Tuple[Callable[[List[Item]], None], Callable[[Item], str]]:
     """
-    그룹 키 결정:
-    1) fact.company가 있으면 사용
-    2) 없으면 title+url 키워드 매칭
-    3) 복수 경쟁사 키워드면 '비교기사'
-    4) 아니면 '미분류'
+    (prefetch, text_for). prefetch(items)는 기사 원문을 병렬로 미리 받아 두고,
+    text_for(it)는 항목별 추출 입력(ARTICLE_EXCERPT_TOKENS 예산 발췌)을 돌려준다.
+    미리 받지 않은 항목은 그때 가져온다. 본문이 없으면 "" → 호출자가 RSS 요약 사용.
     """
-    fact = payload.get("fact", {}) or {}
-    meta = payload.get("meta", {}) or {}
-
-    company = fact.get("company")
-    if company:
-        return str(company).strip()
+    budget = env_int("ARTICLE_EXCERPT_TOKENS", 600)
+    mapper = CompanyMapper.default()
+    tried: Set[str] = set()
+    bodies: Dict[str, Dict[str, Any]] = {}
+
+    def prefetch(items: List[Item]) -> None:
+        urls = [it.url for it in items if it.url not in tried]
+        tried.update(urls)
+        with get_profiler().stage("article_fetch"):
+            bodies.update(fetcher.fetch_many(urls))
+
+    def text_for(it: Item) -> str:
+        body = bodies.get(it.url)
+        if body is None and it.url not in tried:
+            with get_profiler().stage("article_fetch"):
+                body = fetcher.fetch(it.url)
+        if body is None:
+            return ""
+        return fetcher.excerpt(body, aliases=mapper.aliases(competitor_of.get(it.url, "")), budget_tokens=budget)
+
+    return prefetch, text_for
+
+
+def _dedup_by_company(
+    payloads_by_key: Dict[str, List[FactPayload]],
+) -> Tuple[Dict[str, List[FactPayload]], Dict[str, FactPayload]]:
+    """
+    FACT_DEDUP_MODE=true 일 때 회사별로 같은 사건 Fact를 병합 (분류/가설 입력 감소).
+    반환: (병합 결과, 전부 병합돼 빠진 payload {URL: 원본}) — 빠진 payload는 대표 Fact의 분류 결과를
+    그대로 기록해 타임라인/주간 집계의 A/B 건수가 줄지 않게 한다 (_classify_cached).
+    """
+    if not env_bool("FACT_DEDUP_MODE", False):
+        return payloads_by_key, {}
+    threshold = env_int("FACT_DEDUP_THRESHOLD_PCT", 75) / 100
+    out: Dict[str, List[FactPayload]] = {}
+    merged: Dict[str, FactPayload] = {}
+    for key, plist in payloads_by_key.items():
+        if key in ("미분류", "비교기사"):
+            out[key] = plist
+            continue
+        out[key], st = dedup_facts(plist, near_threshold=threshold)
+        kept = {p.url for p in out[key]}
+        merged.update((p.url, p) for p in plist if p.url not in kept)
+        if st["facts_out"] < st["facts_in"]:
+            print(
+                f"[FACT DEDUP] {key}: payload {st['payloads_in']}→{st['payloads_out']}, "
+                f"fact {st['facts_in']}→{st['facts_out']}"
+            )
+    return out, merged
 
-    title = str(meta.get("title", "") or "")
-    url = str(meta.get("url", "") or "")
-    combined = f"{title} {url}"
 
-    hits = []
-    for kw, comp in mapper.keyword_to_company.items():
-        if kw.lower() in combined.lower():
-            hits.append(comp)
-    hits_unique = list(dict.fromkeys(hits))
+def _classify_cached(
+    p: FactPayload,
+    classifier: SignalClassifier | TieredClassifier,
+    store: FactStore,
+    timeline: TimelineIndex,
+    stats: Dict[str, int],
+    merged: Optional[Dict[str, FactPayload]] = None,
+) -> dict:
+    """
+    타임라인 인덱스에 이미 분류 결과가 있으면 재사용, 없으면 분류 후 인덱스에 기록.
+    merged(_dedup_by_company)가 주어지면 이 payload의 Fact로 병합돼 빠진 기사에도 같은 분류를 기록한다.
+    """
+    prof = get_profiler()
+    d = p.to_dict()
+    with prof.stage("store_io"):
+        sig = timeline.lookup(d)
+    if sig is not None:
+        stats["cached"] = stats.get("cached", 0) + 1
+    else:
+        with prof.stage("classification"):
+            sig = classifier.classify(p.fact_dict())
+        with prof.stage("store_io"):
+            store.record_signal(d, sig)
+        stats["classified"] = stats.get("classified", 0) + 1
+
+    for u in dict.fromkeys(u for f in p.facts for u in f.sources if u != p.url):
+        orig = (merged or {}).pop(u, None)
+        if orig is None:
+            continue
+        od = orig.to_dict()
+        with prof.stage("store_io"):
+            if timeline.lookup(od) is None:
+                store.record_signal(od, sig)
+                stats["merged"] = stats.get("merged", 0) + 1
+    return sig
 
-    if len(hits_unique) >= 2:
-        return "비교기사"
 
-    inferred = mapper.infer(combined)
-    return inferred if inferred else "미분류"
+def _infer_group_key(payload: FactPayload, mapper: CompanyMapper) -> str:
+    return mapper.resolve_group(company=payload.company, title=payload.title, url=payload.url)
 
 
-def _payload_is_recent_enough(payload: dict, cutoff_utc: datetime) -> bool:
+def _payload_is_recent_enough(payload: FactPayload, cutoff_utc: datetime) -> bool:
     """
     전략 리포트 단계에서 facts payload를 필터링:
     - meta.published_date(YYYY-MM-DD)가 있으면 그 날짜 기준
     - 없으면 meta.collected_at_utc 기준
     """
-    meta = payload.get("meta", {}) or {}
-
-    pub = meta.get("published_date")
+    pub = payload.published_date
     if isinstance(pub, str) and len(pub) >= 10:
         try:
             dt = datetime.strptime(pub[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
@@ -125,11 +203,11 @@ def _payload_is_recent_enough(payload: dict, cutoff_utc: datetime) -> bool:
         except Exception:
             pass
 
-    collected_at = meta.get("collected_at_utc")
+    collected_at = payload.collected_at_utc
     if isinstance(collected_at, str) and collected_at:
         try:
             dt = datetime.fromisoformat(collected_at.replace("Z", "+00:00"))
-            dt = _to_utc(dt)
+            dt = to_utc(dt)
             if dt is None:
                 return False
             return dt >= cutoff_utc
@@ -139,91 +217,297 @@ def _payload_is_recent_enough(payload: dict, cutoff_utc: datetime) -> bool:
     return False
 
 
-def run_fact_cache_mode(settings: Settings, collected: Dict[str, List[Item]]) -> None:
+def run_fact_cache_mode(
+    settings: Settings,
+    collected: Dict[str, List[Item]],
+    *,
+    cutoff_utc: Optional[datetime] = None,
+    notify: bool = True,
+    handled: Optional[List[Item]] = None,
+    left: Optional[List[Item]] = None,
+) -> str:
     """
     FACT_CACHE_MODE=true 일 때:
-    - LOOKBACK_DAYS 이내 기사만 처리
+    - LOOKBACK_DAYS 이내 기사만 처리 (cutoff_utc가 주어지면 그 이후만)
     - (ALLOW_UNDATED_ITEMS=false면) published_at 없는 건 제외
     - URL 중복 제거 후 최대 MAX_FACT_ITEMS 개 Fact 추출
+      경쟁사 간에는 COMPETITOR_WEIGHTS 가중 공정 분배, 경쟁사 안에서는 관련도 → 최신순
+    요약 메시지를 반환한다. (notify=True면 Slack 전송)
+    handled가 주어지면 저장했거나(이미 저장돼 있던 것 포함) 큐에 등록한 항목을, left가 주어지면 후보였지만 예산 초과/추출 실패로
+    남은 항목을 담는다 (워터마크 전진 기준).
     """
-    model_name = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-lite").strip()
-    max_items = _env_int("MAX_FACT_ITEMS", 15)
+    max_items = env_int("MAX_FACT_ITEMS", 15)
 
-    lookback_days = _env_int("LOOKBACK_DAYS", 14)
-    allow_undated = _env_bool("ALLOW_UNDATED_ITEMS", False)
+    lookback_days = env_int("LOOKBACK_DAYS", 14)
+    allow_undated = env_bool("ALLOW_UNDATED_ITEMS", False)
 
-    cutoff_utc = _now_utc() - timedelta(days=lookback_days)
+    lookback_cutoff = now_utc() - timedelta(days=lookback_days)
+    cutoff_utc = max(cutoff_utc, lookback_cutoff) if cutoff_utc else lookback_cutoff
 
-    llm = _vertex_llm_from_env()
+    llm = vertex_llm_from_env("extract")
     extractor = FactExtractor(llm=llm)
-    store = FactStore()
-
-    all_items = dedup_by_url(_flatten(collected), lambda x: x.url)
-
-    # 오래된 기사 제거
-    filtered: List[Item] = []
-    skipped_old = 0
-    skipped_undated = 0
-
-    for it in all_items:
-        pub = _to_utc(getattr(it, "published_at", None))
-        if pub is None:
-            if allow_undated:
-                filtered.append(it)
-            else:
-                skipped_undated += 1
-            continue
-
-        if pub < cutoff_utc:
-            skipped_old += 1
-            continue
-
-        filtered.append(it)
+    store = fact_store()
+    prof = get_profiler()
+
+    competitor_of = {}
+    for comp, items in collected.items():
+        for it in items:
+            competitor_of.setdefault(it.url, comp)
+
+    with prof.stage("dedup_filter"):
+        all_items = dedup_by_url(_flatten(collected), lambda x: x.url)
+
+        # 오래된 기사 제거
+        filtered: List[Item] = []
+        skipped_old = 0
+        skipped_undated = 0
+
+        for it in all_items:
+            pub = to_utc(getattr(it, "published_at", None))
+            if pub is None:
+                if allow_undated:
+                    filtered.append(it)
+                else:
+                    skipped_undated += 1
+                continue
+
+            if pub < cutoff_utc:
+                skipped_old += 1
+                continue
+
+            filtered.append(it)
+
+        # 관련도 점수순으로 정렬 + 낮은 항목 제외 (추출 슬롯을 의미 있는 기사에 먼저)
+        skipped_irrelevant = 0
+        relevance_line = ""
+        scores: Dict[str, float] = {}
+        if env_bool("RELEVANCE_MODE", False):
+            min_score = env_float("RELEVANCE_MIN_SCORE", 1.0)
+            filtered, dropped, scores = rank_items(
+                RelevanceScorer.from_env(), filtered, competitor_of, min_score=min_score
+            )
+            skipped_irrelevant = len(dropped)
+            by_comp: Dict[str, List[float]] = {}
+            for it_url, sc in scores.items():
+                by_comp.setdefault(competitor_of.get(it_url, "-"), []).append(sc)
+            for comp, comp_scores in sorted(by_comp.items()):
+                print(f"[RELEVANCE] {comp}: {distribution_line(comp_scores, min_score)}")
+            for sc, it in dropped[:5]:
+                print(f"[RELEVANCE] drop {sc:+.1f} {it.title[:60]}")
+            relevance_line = f"- 스킵(관련도<{min_score:g}): {skipped_irrelevant}\n"
+
+    # 이미 추출한 URL은 예산을 쓰지 않도록 스케줄 전에 제외
+    with prof.stage("store_io"):
+        fresh = [it for it in filtered if not store.exists_any(url=it.url)]
+    skipped_dup = len(filtered) - len(fresh)
+    if handled is not None:
+        # 이미 저장된 기사도 처리 끝난 것으로 (워터마크가 그 뒤로 넘어갈 수 있게)
+        fresh_urls = {it.url for it in fresh}
+        handled.extend(it for it in filtered if it.url not in fresh_urls)
+
+    queue = WorkQueue() if env_bool("EXTRACT_QUEUE_MODE", False) else None
+    candidates = list(fresh)
+    if queue is not None:
+        # 이전 실행에서 남은 대기 항목도 이번 공정 스케줄에 넣어 임대 순위를 다시 매긴다
+        fresh_urls = {it.url for it in fresh}
+        for it, comp in pending_items(queue):
+            if it.url not in fresh_urls:
+                competitor_of.setdefault(it.url, comp or "-")
+                candidates.append(it)
+
+    # 경쟁사별 대기열(관련도 → 최신순)을 가중 공정 순서로 합침
+    queues: Dict[str, List[Item]] = {}
+    for it in candidates:
+        queues.setdefault(competitor_of.get(it.url, "-"), []).append(it)
+    for q in queues.values():
+        q.sort(
+            key=lambda x: (scores.get(x.url, 0.0), x.published_at.timestamp() if x.published_at else 0.0),
+            reverse=True,
+        )
+    schedule = fair_order(queues, parse_weights(os.environ.get("COMPETITOR_WEIGHTS", "")))
+    planned: Dict[str, int] = {c: 0 for c in collected}
+    for comp, _ in schedule[:max_items]:
+        planned[comp] = planned.get(comp, 0) + 1
+    usage: Dict[str, Dict[str, int]] = {}
+
+    # 기사 원문 발췌를 추출 입력으로 (RSS 요약은 한두 문장이라 수치/근거가 빠지기 쉬움)
+    fetcher: Optional[ArticleFetcher] = None
+    prefetch: Optional[Callable[[List[Item]], None]] = None
+    text_for: Optional[Callable[[Item], str]] = None
+    if env_bool("ARTICLE_BODY_MODE", False):
+        fetcher = ArticleFetcher.from_env()
+        prefetch, text_for = _article_texts(fetcher, competitor_of)
 
     saved = 0
-    skipped_dup = 0
     failed = 0
+    queue_line = ""
+
+    if queue is not None:
+        # 내구성 큐: 중단된 실행의 남은 항목을 다음 실행/다른 shard가 이어서 처리
+        enqueued = enqueue_items(queue, [it for _, it in schedule], competitor_of)
+        if handled is not None:
+            handled.extend(it for _, it in schedule)
+        stats = drain(
+            queue,
+            extractor,
+            store,
+            max_items=max_items,
+            shard=env_int("EXTRACT_SHARD_INDEX", 0),
+            shards=env_int("EXTRACT_SHARD_COUNT", 1),
+            # 이미 큐에 들어간 항목은 증분 cutoff가 아니라 LOOKBACK 기준으로만 버린다
+            cutoff_utc=lookback_cutoff,
+            usage=usage,
+            raw_text_for=text_for,
+            # 큐 모드는 실제로 임대한 항목의 본문만 미리 받는다
+            prefetch=prefetch,
+        )
+        saved, failed = stats["saved"], stats["failed"]
+        # 할당 = 실제로 임대해 추출을 시도한 건수 (shard/중복/오래됨으로 스케줄과 다를 수 있음)
+        planned = {c: 0 for c in collected}
+        for comp, u in usage.items():
+            planned[comp] = u.get("saved", 0) + u.get("failed", 0)
+        skipped_dup += stats["skipped_dup"]
+        skipped_old += stats["skipped_old"]
+        counts = queue.counts()
+        queue_line = (
+            f"- 큐: 신규 {enqueued} / 대기 {counts.get('pending', 0)} / "
+            f"임대중 {counts.get('leased', 0)} / 데드레터 {counts.get('dead', 0)}\n"
+        )
+        schedule = []
 
-    for it in filtered[:max_items]:
+    if prefetch is not None and schedule:
+        prefetch([it for _, it in schedule[:max_items]])
+    for comp, it in schedule[:max_items]:
         published_date = it.published_at.strftime("%Y-%m-%d") if it.published_at else None
-
-        if store.exists(url=it.url):
-            skipped_dup += 1
-            continue
-
-        raw_text = it.raw_summary or it.title
+        comp_usage = usage.setdefault(comp, {})
+        raw_text = (text_for(it) if text_for else "") or it.raw_summary or it.title
 
         try:
-            fact_json = extractor.extract(
-                source=it.source,
-                url=it.url,
-                title=it.title,
-                raw_text=raw_text,
-            )
-            store.save(
-                url=it.url,
-                source=it.source,
-                title=it.title,
-                published_date=published_date,
-                fact_json=fact_json,
-            )
+            with prof.stage("extraction"):
+                fact_json = extractor.extract(
+                    source=it.source,
+                    url=it.url,
+                    title=it.title,
+                    raw_text=raw_text,
+                )
+            with prof.stage("store_io"):
+                store.save(
+                    url=it.url,
+                    source=it.source,
+                    title=it.title,
+                    published_date=published_date,
+                    fact_json=fact_json,
+                )
             saved += 1
+            comp_usage["saved"] = comp_usage.get("saved", 0) + 1
+            if handled is not None:
+                handled.append(it)
         except Exception as e:
             failed += 1
+            comp_usage["failed"] = comp_usage.get("failed", 0) + 1
+            if left is not None:
+                left.append(it)
             print(f"[WARN] Fact extract failed: {it.url} / {type(e).__name__}: {e}")
+    if left is not None:
+        left.extend(it for _, it in schedule[max_items:])
 
     msg = (
         "*Fact Cache Mode 완료*\n"
-        f"- Model: `{model_name}`\n"
-        f"- LOOKBACK_DAYS: {lookback_days} (cutoff_utc={cutoff_utc.date()})\n"
+        f"- Model: `{llm.model_name}`\n"
+        f"- LOOKBACK_DAYS: {lookback_days} (cutoff_utc={cutoff_utc.isoformat(timespec='minutes')})\n"
         f"- 최대 처리: {max_items}\n"
         f"- 저장: {saved}\n"
         f"- 스킵(중복): {skipped_dup}\n"
         f"- 스킵(오래됨): {skipped_old}\n"
         f"- 스킵(날짜없음): {skipped_undated}\n"
+        f"{relevance_line}"
         f"- 실패: {failed}\n"
+        f"{queue_line}"
+        f"- 경쟁사별: {usage_line(planned, usage)}\n"
+        f"- LLM 호출: {llm.stats.get('calls', 0)} "
+        f"(로컬 복구 {llm.stats.get('repaired', 0)} / 재요청 {llm.stats.get('retried', 0)})\n"
     )
-    send_to_slack(settings.slack_webhook_url, msg)
+    if llm.stream_line():
+        msg += f"- {llm.stream_line()}\n"
+    if fetcher is not None:
+        msg += f"- 본문: {fetcher.summary_line()}\n"
+    cache_lines = default_http_cache().summary_lines()
+    if cache_lines:
+        msg += "- HTTP 캐시:\n" + "".join(f"  - {line}\n" for line in cache_lines)
+    poll_lines = default_poll_scheduler().summary_lines()
+    if poll_lines:
+        msg += "- 폴링 간격:\n" + "".join(f"  - {line}\n" for line in poll_lines)
+    if notify:
+        send_to_slack(settings.slack_webhook_url, msg)
+    return msg
+
+
+def run_daily_incremental(settings: Settings, collected: Dict[str, List[Item]]) -> None:
+    """
+    DAILY_INCREMENTAL_MODE=true 일 때 (매일/매시간 실행):
+    - 워터마크(data/state/daily_watermark.json) - WATERMARK_OVERLAP_HOURS 이후 기사만 추출
+      (Google News의 늦은 게시일 보정용 겹침 구간, 중복은 URL 기준으로 걸러짐)
+    - LOOKBACK_DAYS 이내 미분류 payload를 분류해 타임라인 인덱스(분류 캐시)에 기록
+    - 워터마크를 이번에 저장/큐 등록한 기사의 최신 published_at으로 전진하되,
+      예산 초과/추출 실패로 남은 기사 중 가장 오래된 것 직전에서 멈춤 (다음 실행에서 다시 후보가 되도록)
+    주간 전략 리포트는 이 분류 결과를 재사용해 집계만 한다.
+    """
+    now = now_utc()
+    wm = Watermark()
+    prev = wm.get()
+    overlap = timedelta(hours=env_int("WATERMARK_OVERLAP_HOURS", 24))
+    since = prev - overlap if prev else None
+
+    handled: List[Item] = []
+    left: List[Item] = []
+    msg = run_fact_cache_mode(settings, collected, cutoff_utc=since, notify=False, handled=handled, left=left)
+    msg = msg.replace("*Fact Cache Mode 완료*", "*Daily Incremental 완료*", 1)
+
+    # 분류: 이번에 저장된 것 + 이전 실행에서 분류가 실패/누락된 것
+    lookback_cutoff = now - timedelta(days=env_int("LOOKBACK_DAYS", 14))
+    timeline = timeline_index()
+    store = fact_store(timeline)
+    classifier = _signal_classifier(vertex_llm_from_env("classify"))
+    mapper = CompanyMapper.default()
+    stats: Dict[str, int] = {}
+
+    with get_profiler().stage("store_io"):
+        payloads = read_facts()
+    recent_by_key: Dict[str, List[FactPayload]] = {}
+    for p in payloads:
+        if _payload_is_recent_enough(p, lookback_cutoff):
+            recent_by_key.setdefault(_infer_group_key(p, mapper), []).append(p)
+
+    deduped, merged = _dedup_by_company(recent_by_key)
+    for key, plist in deduped.items():
+        if key in ("미분류", "비교기사"):
+            continue
+        for p in plist:
+            try:
+                _classify_cached(p, classifier, store, timeline, stats, merged)
+            except Exception as e:
+                stats["failed"] = stats.get("failed", 0) + 1
+                print(f"[WARN] signal classify failed: {p.url} / {type(e).__name__}: {e}")
+
+    pubs = [pub for it in handled if (pub := to_utc(it.published_at)) is not None and pub <= now]
+    # 남은 후보 중 가장 오래된 것 직전까지만 전진 (다음 실행의 cutoff = 워터마크 - 겹침 이후에 들어가도록)
+    left_pubs = [pub for it in left if (pub := to_utc(it.published_at)) is not None]
+    if pubs:
+        target = max(pubs)
+        if left_pubs:
+            target = min(target, min(left_pubs) - timedelta(seconds=1))
+        new_wm = wm.advance(target, run_at=now)
+    else:
+        new_wm = prev
+
+    msg += (
+        f"- 분류: {_classify_line(classifier, stats)} / 실패 {stats.get('failed', 0)}\n"
+        f"- 워터마크: {prev.isoformat(timespec='minutes') if prev else '없음'} → "
+        f"{new_wm.isoformat(timespec='minutes') if new_wm else '없음'}\n"
+    )
+    print(msg)
+    if env_bool("DAILY_SLACK_NOTIFY", False):
+        send_to_slack(settings.slack_webhook_url, msg)
 
 
 def run_weekly_strategy_report(settings: Settings) -> None:
@@ -233,15 +517,19 @@ def run_weekly_strategy_report(settings: Settings) -> None:
     - company 보정 + 비교기사 분리
     - Signal(A/B/C) 분류 → A/B만 사용
     - '미분류'/'비교기사'는 가설 생성 제외
-    - 경쟁사별 가설 → 원티드 대응 도출
-    - Slack 1페이지 리포트 전송
+    - 경쟁사별 가설 → 테넌트(TENANTS_FILE, 기본 원티드)별 대응 도출
+    - 테넌트별 Slack 1페이지 리포트 전송
     """
-    llm = _vertex_llm_from_env()
+    llm = vertex_llm_from_env("hypothesis")
+    response_llm = vertex_llm_from_env("response")
 
-    lookback_days = _env_int("LOOKBACK_DAYS", 14)
-    cutoff_utc = _now_utc() - timedelta(days=lookback_days)
+    lookback_days = env_int("LOOKBACK_DAYS", 14)
+    cutoff_utc = now_utc() - timedelta(days=lookback_days)
+    evidence_budget = env_int("HYPOTHESIS_TOKEN_BUDGET", 3000)
 
-    payloads = read_fact_payloads("data/facts")
+    prof = get_profiler()
+    with prof.stage("store_io"):
+        payloads = read_facts()
     if not payloads:
         send_to_slack(settings.slack_webhook_url, "*전략 리포트 생성 실패*: data/facts에 Fact가 없습니다.")
         return
@@ -256,66 +544,171 @@ def run_weekly_strategy_report(settings: Settings) -> None:
 
     mapper = CompanyMapper.default()
 
-    payloads_by_key: Dict[str, List[dict]] = {}
+    payloads_by_key: Dict[str, List[FactPayload]] = {}
     for p in payloads:
         key = _infer_group_key(p, mapper)
         payloads_by_key.setdefault(key, []).append(p)
+    # 같은 사건을 다룬 기사들은 support_count가 붙은 Fact 하나로
+    payloads_by_key, merged = _dedup_by_company(payloads_by_key)
 
-    classifier = SignalClassifier(llm=llm)
+    timeline = timeline_index()
+    store = fact_store(timeline)
+    classifier = _signal_classifier(vertex_llm_from_env("classify"))
     hypothesizer = StrategyHypothesis(llm=llm)
-    responder = WantedResponse(llm=llm)
+    tenants = load_tenants()
 
     hypothesis_by_company: Dict[str, dict] = {}
-    response_by_company: Dict[str, dict] = {}
+    classify_stats: Dict[str, int] = {}
 
     for key, plist in payloads_by_key.items():
         if key in ("미분류", "비교기사"):
             continue
 
-        facts = [p.get("fact", {}) for p in plist if isinstance(p.get("fact", {}), dict)]
-
         # Signal classification per fact, keep A/B only
         ab_facts = []
-        for f in facts:
+        for p in plist:
+            if not p.has_fact:
+                continue
             try:
-                sig = classifier.classify(f)
+                # 일일 증분 실행에서 이미 분류된 Fact는 타임라인 인덱스 결과 재사용
+                sig = _classify_cached(p, classifier, store, timeline, classify_stats, merged)
+                f = p.fact_dict()
                 level = (sig.get("signal_level") or "").strip()
                 if level in ("A", "B"):
-                    f2 = dict(f)
-                    f2["_signal"] = sig
-                    ab_facts.append(f2)
+                    f["_signal"] = sig
+                    ab_facts.append(f)
             except Exception as e:
                 print(f"[WARN] signal classify failed for {key}: {type(e).__name__}: {e}")
 
         if not ab_facts:
             continue
 
-        hyp = hypothesizer.infer(ab_facts[:8])  # cap to reduce tokens
-        resp = responder.propose(hyp)
+        # 주제별 대표 Fact만 토큰 예산 안에서 선택 (중복 Fact로 프롬프트 낭비 방지)
+        with prof.stage("hypothesis"):
+            evidence = select_evidence(ab_facts, max_items=8, token_budget=evidence_budget)
+            # 스트리밍이면 가설 문장은 근거 목록보다 먼저 도착 → 진행 상황을 바로 남긴다
+            hypothesis_by_company[key] = hypothesizer.infer(
+                evidence,
+                on_field=lambda k, v, key=key: print(f"[HYPOTHESIS] {key}: {str(v)[:80]}") if k == "hypothesis" else None,
+            )
 
-        hypothesis_by_company[key] = hyp
-        response_by_company[key] = resp
+    print(f"[CLASSIFY] {_classify_line(classifier, classify_stats)}")
 
     if not hypothesis_by_company:
-        send_to_slack(settings.slack_webhook_url, "*전략 리포트 생성 실패*: A/B 신호 Fact가 없습니다.")
+        for tenant in tenants:
+            send_to_slack(tenant.webhook(settings.slack_webhook_url), "*전략 리포트 생성 실패*: A/B 신호 Fact가 없습니다.")
         return
 
-    report_text = render_strategy_report(
-        hypothesis_by_company=hypothesis_by_company,
-        response_by_company=response_by_company,
-        payloads_by_company=payloads_by_key,
+    # 수집~가설은 한 번만, 대응 옵션부터 테넌트별로 병렬
+    # (cProfile은 켠 스레드만 보므로 PROFILE_MODE에서는 메인 스레드에서 순차 실행)
+    workers = 1 if prof.enabled else max(1, min(len(tenants), env_int("TENANT_WORKERS", 4)))
+    responses: Dict[str, Dict[str, dict]] = {}
+    with prof.stage("response"):
+        if workers == 1:
+            for tenant in tenants:
+                try:
+                    responses[tenant.tenant_id] = _respond_for_tenant(response_llm, tenant, hypothesis_by_company)
+                except Exception as e:
+                    print(f"[WARN] tenant report failed for {tenant.tenant_id}: {type(e).__name__}: {e}")
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_respond_for_tenant, response_llm, t, hypothesis_by_company) for t in tenants]
+                for tenant, fut in zip(tenants, futures):
+                    try:
+                        responses[tenant.tenant_id] = fut.result()
+                    except Exception as e:
+                        print(f"[WARN] tenant report failed for {tenant.tenant_id}: {type(e).__name__}: {e}")
+
+    reports_dir = Path("reports")
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    for i, tenant in enumerate(tenants):
+        if tenant.tenant_id not in responses:
+            continue
+        with prof.stage("rendering"):
+            report_text = render_strategy_report(
+                hypothesis_by_company=hypothesis_by_company,
+                response_by_company=responses[tenant.tenant_id],
+                payloads_by_company=payloads_by_key,
+                responder=tenant.name,
+            )
+        report_name = "weekly_strategy_report.md" if i == 0 else f"weekly_strategy_report_{tenant.tenant_id}.md"
+        (reports_dir / report_name).write_text(report_text, encoding="utf-8")
+        send_to_slack(tenant.webhook(settings.slack_webhook_url), report_text)
+
+    for stage, stage_llm in (("hypothesis", llm), ("response", response_llm)):
+        if stage_llm.stream_line():
+            print(f"[LLM] {stage}: {stage_llm.stream_line()}")
+
+
+def _respond_for_tenant(
+    llm: VertexLLM,
+    tenant: TenantProfile,
+    hypothesis_by_company: Dict[str, dict],
+) -> Dict[str, dict]:
+    responder = TenantResponse(llm=llm, tenant=tenant)
+    response_by_company: Dict[str, dict] = {}
+    for key, hyp in hypothesis_by_company.items():
+        try:
+            response_by_company[key] = responder.propose(hyp)
+        except Exception as e:
+            print(f"[WARN] response failed for {tenant.tenant_id}/{key}: {type(e).__name__}: {e}")
+    return response_by_company
+
+
+def run_trend_report(settings: Settings) -> None:
+    """
+    TREND_REPORT_MODE=true 일 때:
+    - TimelineIndex(data/index/timeline)만 읽어 최근 TREND_MONTHS 개월 타임라인 구성
+    - 2주 이상 관찰된 경쟁사만 전략 일관성 평가
+    - Slack 전송 + reports/trend_consistency_report.md 저장
+    """
+    months = env_int("TREND_MONTHS", 3)
+    since = (now_utc() - timedelta(days=months * 30)).date()
+
+    index = timeline_index()
+    assessor = None
+
+    assessment_by_company: Dict[str, dict] = {}
+    weeks_by_company: Dict[str, List[str]] = {}
+
+    for company in index.companies():
+        entries = index.read(company, since=since)
+        weeks = sorted({e.get("week", "") for e in entries})
+        if len(weeks) < 2:
+            continue
+
+        if assessor is None:
+            assessor = TrendConsistency(llm=vertex_llm_from_env("trend"))
+        try:
+            assessment_by_company[company] = assessor.assess(company, entries, months)
+            weeks_by_company[company] = weeks
+        except Exception as e:
+            print(f"[WARN] trend assess failed for {company}: {type(e).__name__}: {e}")
+
+    if not assessment_by_company:
+        send_to_slack(
+            settings.slack_webhook_url,
+            f"*트렌드 리포트 생성 실패*: 최근 {months}개월 타임라인이 2주 이상인 경쟁사가 없습니다.",
+        )
+        return
+
+    report_text = render_trend_report(
+        assessment_by_company=assessment_by_company,
+        weeks_by_company=weeks_by_company,
+        months=months,
     )
 
     reports_dir = Path("reports")
     reports_dir.mkdir(parents=True, exist_ok=True)
-    (reports_dir / "weekly_strategy_report.md").write_text(report_text, encoding="utf-8")
+    (reports_dir / "trend_consistency_report.md").write_text(report_text, encoding="utf-8")
 
     send_to_slack(settings.slack_webhook_url, report_text)
 
 
 def run_default_weekly_report(settings: Settings, collected: Dict[str, List[Item]]) -> None:
-    report = build_draft_report(collected, days=settings.report_days)
-    md = to_markdown(report)
+    with get_profiler().stage("rendering"):
+        report = build_draft_report(collected, days=settings.report_days, now=now_utc())
+        md = to_markdown(report)
 
     reports_dir = Path("reports")
     reports_dir.mkdir(parents=True, exist_ok=True)
@@ -325,22 +718,73 @@ def run_default_weekly_report(settings: Settings, collected: Dict[str, List[Item
 
 
 def main() -> None:
+    # record: data/ 스냅샷 저장 / replay: 스냅샷을 임시 작업 디렉터리에 풀고 그 위에서 실행
+    workdir = default_cassette().isolate_data()
+    if workdir:
+        print(f"[IO REPLAY] workdir: {workdir}")
+    prof = get_profiler()
+    try:
+        _run(prof)
+    finally:
+        summary = prof.write_summary()
+        if summary:
+            print(summary.read_text(encoding="utf-8"))
+        cassette = default_cassette()
+        for line in cassette.summary_lines():
+            print(f"[IO {cassette.mode.upper()}] {line}")
+        saved = cassette.save()
+        if saved:
+            print(f"[IO RECORD] saved: {saved}")
+        delivery = default_slack_delivery()
+        if delivery.stats:
+            print(f"[SLACK] {delivery.summary_line()}")
+
+    # 실행이 끝난 시점에 스풀에 남은(재전송으로도 못 보낸/거부된) 메시지가 있으면 실패로 끝내 CI에서 보이게
+    pending = rejected = 0
+    for _, e in delivery.spooled():
+        n = len(e.get("chunks") or [])
+        if e.get("rejected"):
+            rejected += n
+        else:
+            pending += n
+    if pending or rejected:
+        raise SystemExit(f"[SLACK] 미전송 {pending}건 / 거부 {rejected}건 ({delivery.spool_dir} 에 보관)")
+
+
+def _run(prof: StageProfiler) -> None:
     settings = Settings.from_env()
-    collected = _collect_all(settings)
+    with prof.stage("collection"):
+        collected = _collect_all(settings)
+    for line in default_http_cache().summary_lines():
+        print(f"[HTTP CACHE] {line}")
+    for line in default_poll_scheduler().summary_lines():
+        print(f"[POLL] {line}")
+
+    # 일일 증분: 추출 + 분류만 하고 리포트 없이 종료
+    if env_bool("DAILY_INCREMENTAL_MODE", False):
+        run_daily_incremental(settings, collected)
+        return
 
-    fact_cache_mode = _env_bool("FACT_CACHE_MODE", False)
-    weekly_strategy_mode = _env_bool("WEEKLY_STRATEGY_REPORT_MODE", False)
+    fact_cache_mode = env_bool("FACT_CACHE_MODE", False)
+    weekly_strategy_mode = env_bool("WEEKLY_STRATEGY_REPORT_MODE", False)
+    trend_mode = env_bool("TREND_REPORT_MODE", False)
 
     # 1) cache facts (optional)
     if fact_cache_mode:
         run_fact_cache_mode(settings, collected)
 
-    # 2) strategy report (optional)
+    # 2) strategy report (optional) — 분류 결과가 타임라인 인덱스에 쌓임
     if weekly_strategy_mode:
         run_weekly_strategy_report(settings)
+
+    # 3) multi-week trend consistency (optional)
+    if trend_mode:
+        run_trend_report(settings)
+
+    if weekly_strategy_mode or trend_mode:
         return
 
-    # 3) default weekly draft report
+    # 4) default weekly draft report
     if not fact_cache_mode:
         run_default_weekly_report(settings, collected)
 
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .cassette import default_cassette
+from .runtime import env_bool, env_float
+
+
+def _h(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+
+
+def _fmt(sec: float) -> str:
+    m = int(sec // 60)
+    return f"{m // 60}h{m % 60:02d}m" if m >= 60 else f"{m}m"
+
+
+@dataclass(frozen=True)
+class PollScheduler:
+    """
+    소스(RSS 피드/공고 리스트)별 적응형 폴링 간격. data/state/poll_intervals.json
+
+    - observe(): 이번 수집에서 처음 본 URL이 있으면 간격 x speedup, 없으면 x backoff
+      ([min_sec, max_sec]로 제한, 처음 보는 소스는 min_sec)
+    - is_due(): 마지막 폴링 + 간격이 지났는지 (간격의 10%·최대 5분 여유 — 정시 실행이 몇 초 일러도 스킵 안 되게)
+    - 기간 내 '처음 본 URL'은 소스별 최근 seen_limit개 URL 해시 + (선택) is_known(URL) 저장소 조회로 판정
+    enabled=False면 항상 due, 상태도 기록하지 않는다.
+    """
+    path: Path = Path("data/state/poll_intervals.json")
+    enabled: bool = False
+    min_sec: float = 3600.0
+    max_sec: float = 86400.0
+    backoff: float = 2.0
+    speedup: float = 0.5
+    seen_limit: int = 300
+    _state: Dict[str, Dict[str, Any]] = field(default_factory=dict, compare=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    _loaded: list = field(default_factory=list, compare=False, repr=False)
+    # 이번 실행에서 소스별로 한 일: "polled" / "skipped"
+    _run: Dict[str, str] = field(default_factory=dict, compare=False, repr=False)
+
+    def _ensure(self) -> None:
+        # 호출자가 _lock을 잡고 있어야 한다
+        if self._loaded:
+            return
+        self._loaded.append(True)
+        if self.path.exists():
+            try:
+                self._state.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except (json.JSONDecodeError, OSError):
+                pass
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self._state, ensure_ascii=False, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def _now(self, now: Optional[datetime]) -> datetime:
+        return now or default_cassette().now()
+
+    def next_due(self, key: str) -> Optional[datetime]:
+        with self._lock:
+            self._ensure()
+            st = self._state.get(key)
+        if not st or not st.get("last_polled_at"):
+            return None
+        return datetime.fromisoformat(st["last_polled_at"]) + timedelta(seconds=st.get("interval_sec", self.min_sec))
+
+    def is_due(self, key: str, now: Optional[datetime] = None) -> bool:
+        if not self.enabled:
+            return True
+        due = self.next_due(key)
+        if due is None:
+            return True
+        with self._lock:
+            interval = self._state[key].get("interval_sec", self.min_sec)
+        slack = timedelta(seconds=min(interval * 0.1, 300))
+        return self._now(now) >= due - slack
+
+    def skip(self, key: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._ensure()
+            st = self._state.setdefault(key, {})
+            st["skipped"] = st.get("skipped", 0) + 1
+            self._run[key] = "skipped"
+            self._save()
+
+    def observe(
+        self,
+        key: str,
+        urls: Iterable[str],
+        *,
+        now: Optional[datetime] = None,
+        is_known: Optional[Callable[[str], bool]] = None,
+    ) -> int:
+        """
+        폴링 결과 반영. 새 URL 수를 반환한다.
+        """
+        if not self.enabled:
+            return 0
+        now = self._now(now)
+        urls = list(dict.fromkeys(urls))
+        with self._lock:
+            self._ensure()
+            st = self._state.setdefault(key, {})
+            seen: List[str] = st.get("seen", [])
+            seen_set = set(seen)
+            new = [u for u in urls if _h(u) not in seen_set]
+        # 저장소 조회는 잠금 밖에서 (디스크 glob)
+        if is_known is not None and st.get("polls", 0) == 0:
+            # 상태가 없던 소스의 첫 폴링: 이미 저장된 기사는 '새 항목'이 아님
+            new = [u for u in new if not is_known(u)]
+
+        with self._lock:
+            interval = float(st.get("interval_sec", self.min_sec))
+            if "interval_sec" in st:
+                interval *= self.speedup if new else self.backoff
+            st["interval_sec"] = round(max(self.min_sec, min(self.max_sec, interval)))
+            st["last_polled_at"] = now.isoformat()
+            st["polls"] = st.get("polls", 0) + 1
+            st["last_new"] = len(new)
+            if new:
+                st["changes"] = st.get("changes", 0) + 1
+                st["last_change_at"] = now.isoformat()
+            st["seen"] = (seen + [_h(u) for u in urls if _h(u) not in seen_set])[-self.seen_limit:]
+            self._run[key] = "polled"
+            self._save()
+        return len(new)
+
+    def summary_lines(self) -> List[str]:
+        if not self.enabled:
+            return []
+        lines: List[str] = []
+        with self._lock:
+            self._ensure()
+            for key in sorted(self._run):
+                st = self._state.get(key, {})
+                interval = st.get("interval_sec", self.min_sec)
+                nxt = datetime.fromisoformat(st["last_polled_at"]) + timedelta(seconds=interval) if st.get("last_polled_at") else None
+                lines.append(
+                    f"{key}: {'폴링' if self._run[key] == 'polled' else '스킵'} / 간격 {_fmt(interval)} / "
+                    f"새 항목 {st.get('last_new', 0)} / 변경 {st.get('changes', 0)}/{st.get('polls', 0)}회 / "
+                    f"다음 {nxt.isoformat(timespec='minutes') if nxt else '-'}"
+                )
+        return lines
+
+
+_default_scheduler: Optional[PollScheduler] = None
+
+
+def default_poll_scheduler() -> PollScheduler:
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = PollScheduler(
+            path=Path(os.environ.get("POLL_STATE_PATH", "data/state/poll_intervals.json")),
+            enabled=env_bool("ADAPTIVE_POLL_MODE", False),
+            min_sec=env_float("POLL_MIN_MINUTES", 60.0) * 60,
+            max_sec=env_float("POLL_MAX_MINUTES", 1440.0) * 60,
+        )
+    return _default_scheduler
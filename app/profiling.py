@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# 프로파일러 자체의 할당은 결과에서 제외
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "*/contextlib.py"),
+)
+
+
+@dataclass
+class _StageStats:
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    calls: int = 0
+    wall_sec: float = 0.0
+    net_bytes: int = 0
+    peak_bytes: int = 0
+    # (파일:줄) -> [누적 증가 바이트, 누적 증가 블록 수]
+    alloc_sites: Dict[str, List[int]] = field(default_factory=dict)
+
+
+@dataclass
+class StageProfiler:
+    """
+    PROFILE_MODE=true 일 때 파이프라인 단계별 cProfile + tracemalloc 수집.
+
+    - 같은 이름의 단계는 여러 번 들어가도 누적 (예: 항목마다 extraction)
+    - 중첩된 단계는 바깥 단계에 포함해 계산 (cProfile은 동시에 하나만 활성화 가능)
+    - cProfile은 켠 스레드만 측정 → 스레드 풀 작업은 PROFILE_MODE에서 메인 스레드로 순차 실행
+    - write_summary(): reports/profile/ 에 <stage>.prof, <stage>.txt, summary.txt
+    """
+    enabled: bool = False
+    out_dir: Path = Path("reports/profile")
+    top_n: int = 15
+    stages: Dict[str, _StageStats] = field(default_factory=dict)
+    _active: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled or self._active is not None:
+            yield
+            return
+
+        st = self.stages.setdefault(name, _StageStats())
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        before = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        mem0 = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        self._active = name
+        t0 = time.perf_counter()
+        st.profile.enable()
+        try:
+            yield
+        finally:
+            st.profile.disable()
+            st.wall_sec += time.perf_counter() - t0
+            self._active = None
+
+            mem1, peak = tracemalloc.get_traced_memory()
+            st.calls += 1
+            st.net_bytes += mem1 - mem0
+            st.peak_bytes = max(st.peak_bytes, peak - mem0)
+            after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            for diff in after.compare_to(before, "lineno")[: self.top_n * 2]:
+                frame = diff.traceback[0]
+                site = st.alloc_sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                site[0] += diff.size_diff
+                site[1] += diff.count_diff
+
+    def _top_allocs(self, st: _StageStats) -> List[Tuple[str, int, int]]:
+        rows = [(k, v[0], v[1]) for k, v in st.alloc_sites.items()]
+        return sorted(rows, key=lambda r: r[1], reverse=True)[: self.top_n]
+
+    def write_summary(self) -> Optional[Path]:
+        if not self.enabled or not self.stages:
+            return None
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        lines = [f"{'stage':<16} {'calls':>6} {'wall(s)':>9} {'net(KB)':>9} {'peak(KB)':>9}"]
+        for i, (name, st) in enumerate(self.stages.items()):
+            stem = f"{i:02d}_{name}"
+            st.profile.dump_stats(str(self.out_dir / f"{stem}.prof"))
+
+            buf = io.StringIO()
+            pstats.Stats(st.profile, stream=buf).sort_stats("cumulative").print_stats(self.top_n)
+            buf.write("\n[tracemalloc top allocation sites]\n")
+            for site, size, count in self._top_allocs(st):
+                buf.write(f"{size / 1024:10.1f} KB {count:8d} blocks  {site}\n")
+            (self.out_dir / f"{stem}.txt").write_text(buf.getvalue(), encoding="utf-8")
+
+            lines.append(
+                f"{name:<16} {st.calls:>6} {st.wall_sec:>9.2f} {st.net_bytes / 1024:>9.1f} {st.peak_bytes / 1024:>9.1f}"
+            )
+
+        p = self.out_dir / "summary.txt"
+        p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return p
+
+
+_profiler: Optional[StageProfiler] = None
+
+
+def get_profiler() -> StageProfiler:
+    global _profiler
+    if _profiler is None:
+        v = (os.environ.get("PROFILE_MODE") or "").strip().lower()
+        _profiler = StageProfiler(
+            enabled=v in ("1", "true", "yes", "y", "on"),
+            out_dir=Path(os.environ.get("PROFILE_DIR", "reports/profile")),
+        )
+    return _profiler
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RateLimiter:
+    """
+    분당 호출 수 제한 (스레드 공유). 호출 간격을 60/per_minute 초 이상으로 벌린다.
+    per_minute <= 0 이면 제한 없음.
+    """
+    per_minute: int
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _next_at: float = 0.0
+
+    def acquire(self) -> None:
+        if self.per_minute <= 0:
+            return
+        interval = 60.0 / self.per_minute
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + interval
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .collector_rss import Item
+from .company_map import CompanyMapper
+from .text_tokens import normalize
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+# 어절 끝 조사 (학습 토큰이 "플랫폼은/플랫폼을"로 흩어지지 않게)
+_PARTICLE_RE = re.compile(r"(으로|에서|에게|까지|부터|은|는|이|가|을|를|의|에|와|과|도|로)$")
+
+# 학습 가중치가 없을 때의 기본값 (학습 결과가 있으면 같은 토큰은 학습값 우선)
+SEED_WEIGHTS: Dict[str, float] = {
+    "채용": 0.5,
+    "플랫폼": 1.0,
+    "서비스": 0.5,
+    "출시": 1.0,
+    "투자": 1.0,
+    "제휴": 1.0,
+    "업데이트": 1.0,
+    "기능": 0.5,
+    "요금제": 1.0,
+    "인수": 1.0,
+    # 증권/시세 기사
+    "주가": -2.0,
+    "특징주": -3.0,
+    "종목": -1.5,
+    "상한가": -2.0,
+    "하한가": -2.0,
+    "목표가": -2.0,
+    "코스닥": -1.5,
+    "코스피": -1.5,
+    # 개별 채용공고/모집 기사
+    "모집": -1.5,
+    "채용공고": -0.5,
+    "신입": -1.0,
+    "경력직": -1.0,
+}
+
+DEFAULT_DENY_DOMAINS: Tuple[str, ...] = (
+    "finance.naver.com",
+    "investing.com",
+    "tradingview.com",
+)
+
+
+def _env_list(name: str) -> Tuple[str, ...]:
+    return tuple(x.strip().lower() for x in (os.environ.get(name) or "").split(",") if x.strip())
+
+
+def _domain(url: str) -> str:
+    host = (urlparse(url).netloc or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _domain_in(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def tokens(text: str) -> List[str]:
+    out: List[str] = []
+    for w in normalize(_TAG_RE.sub(" ", text or "")).split(" "):
+        if len(w) > 2:
+            w = _PARTICLE_RE.sub("", w)
+        if len(w) >= 2:
+            out.append(w)
+    return out
+
+
+@dataclass(frozen=True)
+class RelevanceScorer:
+    """
+    RSS 항목이 '해당 경쟁사의 의미 있는 소식'일 가능성을 로컬에서 점수화 (LLM 추출 슬롯 배분용).
+
+    score = 별칭(제목 +2 / 요약만 +1, 영문 별칭만이면 1/4, 없으면 -2)
+          + 출처 도메인 (허용 +1 / 차단 -3)
+          + 가중치 키워드 포함 합 ([-3, 3]으로 제한, 학습값 우선 + SEED_WEIGHTS)
+    """
+    mapper: CompanyMapper = field(default_factory=CompanyMapper.default)
+    weights: Dict[str, float] = field(default_factory=lambda: dict(SEED_WEIGHTS))
+    allow_domains: Tuple[str, ...] = ()
+    deny_domains: Tuple[str, ...] = DEFAULT_DENY_DOMAINS
+
+    @staticmethod
+    def from_env(weights_path: str = "data/index/relevance_weights.json") -> "RelevanceScorer":
+        weights = dict(SEED_WEIGHTS)
+        p = Path(os.environ.get("RELEVANCE_WEIGHTS", weights_path))
+        if p.exists():
+            weights.update(json.loads(p.read_text(encoding="utf-8")).get("weights", {}))
+        return RelevanceScorer(
+            weights=weights,
+            allow_domains=_env_list("RELEVANCE_ALLOW_DOMAINS"),
+            deny_domains=DEFAULT_DENY_DOMAINS + _env_list("RELEVANCE_DENY_DOMAINS"),
+        )
+
+    def aliases(self, competitor: str) -> List[str]:
+        """
+        경쟁사 키(saramin 등)와 같은 회사로 매핑되는 모든 키워드
+        """
+        return self.mapper.aliases(competitor)
+
+    def score(self, it: Item, competitor: str) -> float:
+        title = (it.title or "").lower()
+        summary = _TAG_RE.sub(" ", it.raw_summary or "").lower()
+
+        # 영문 별칭(remember 등)은 일반 단어와 겹치므로 절반만
+        names = self.aliases(competitor)
+        hit = [n for n in names if n in title] or [n for n in names if n in summary]
+        if not hit:
+            s = -2.0
+        else:
+            s = 2.0 if any(n in title for n in hit) else 1.0
+            if all(n.isascii() for n in hit):
+                s /= 4
+
+        host = _domain(it.publisher_url or it.url)
+        if _domain_in(host, self.deny_domains):
+            s -= 3.0
+        elif _domain_in(host, self.allow_domains):
+            s += 1.0
+
+        text = " ".join(tokens(f"{it.title} {it.raw_summary}"))
+        kw = sum(w for t, w in self.weights.items() if t in text)
+        return s + max(-3.0, min(3.0, kw))
+
+
+def rank_items(
+    scorer: RelevanceScorer,
+    items: List[Item],
+    competitor_of: Dict[str, str],
+    *,
+    min_score: float,
+) -> Tuple[List[Item], List[Tuple[float, Item]], Dict[str, float]]:
+    """
+    Returns (점수 내림차순으로 남긴 항목, 버린 (점수, 항목), URL별 점수)
+    """
+    scored: List[Tuple[float, Item]] = []
+    scores: Dict[str, float] = {}
+    for it in items:
+        sc = scorer.score(it, competitor_of.get(it.url, ""))
+        scored.append((sc, it))
+        scores[it.url] = sc
+
+    # 같은 점수면 최신 기사 먼저
+    scored.sort(key=lambda x: (x[0], x[1].published_at.timestamp() if x[1].published_at else 0.0), reverse=True)
+    kept = [it for sc, it in scored if sc >= min_score]
+    dropped = [(sc, it) for sc, it in scored if sc < min_score]
+    return kept, dropped, scores
+
+
+def distribution_line(scores: List[float], min_score: float) -> str:
+    s = sorted(scores)
+    if not s:
+        return "n=0"
+
+    def q(p: float) -> float:
+        return s[min(len(s) - 1, int(p * len(s)))]
+
+    below = sum(1 for x in s if x < min_score)
+    return (
+        f"n={len(s)} min={s[0]:.1f} p25={q(0.25):.1f} p50={q(0.5):.1f} "
+        f"p90={q(0.9):.1f} max={s[-1]:.1f} 제외={below}"
+    )
+
+
+def learn_weights(labeled: List[Tuple[str, bool]], *, min_count: int = 3, top_k: int = 300) -> Dict[str, float]:
+    """
+    (제목, 유용 여부) 목록으로 토큰별 평활 로그 오즈 가중치를 학습한다.
+    유용 = A/B 신호 Fact, 비유용 = C 신호 또는 회사 미분류/Fact 없음.
+    """
+    pos: Dict[str, int] = {}
+    neg: Dict[str, int] = {}
+    n_pos = n_neg = 0
+    for text, useful in labeled:
+        for t in set(tokens(text)):
+            if useful:
+                pos[t] = pos.get(t, 0) + 1
+            else:
+                neg[t] = neg.get(t, 0) + 1
+        if useful:
+            n_pos += 1
+        else:
+            n_neg += 1
+    if not n_pos or not n_neg:
+        return {}
+
+    weights: Dict[str, float] = {}
+    for t in set(pos) | set(neg):
+        p, n = pos.get(t, 0), neg.get(t, 0)
+        if p + n < min_count:
+            continue
+        w = math.log((p + 0.5) / (n_pos + 1)) - math.log((n + 0.5) / (n_neg + 1))
+        weights[t] = round(max(-2.0, min(2.0, w)), 3)
+    top = sorted(weights.items(), key=lambda kv: abs(kv[1]), reverse=True)[:top_k]
+    return dict(sorted(top))
+
+
+def _labeled_from_store(facts_dir: str, timeline_dir: str) -> List[Tuple[str, bool]]:
+    from .facts_read import read_fact_records
+    from .timeline_index import TimelineIndex
+
+    index = TimelineIndex(base_dir=Path(timeline_dir))
+    labeled: Dict[str, Tuple[str, bool]] = {}
+    for c in index.companies():
+        for e in index.read(c):
+            labeled[e.get("url", "")] = (e.get("title", ""), e.get("signal_level") in ("A", "B"))
+
+    mapper = CompanyMapper.default()
+    for p in read_fact_records(facts_dir):
+        if p.url in labeled:
+            continue
+        group = mapper.resolve_group(company=p.company, title=p.title, url=p.url)
+        if not p.facts or group == "미분류":
+            labeled[p.url] = (p.title, False)
+    return list(labeled.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.relevance", description="RSS 관련도 가중치 학습")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    lp = sub.add_parser("learn", help="타임라인 분류 결과 + 저장된 Fact로 토큰 가중치 학습")
+    lp.add_argument("--facts-dir", default="data/facts")
+    lp.add_argument("--timeline-dir", default="data/index/timeline")
+    lp.add_argument("--out", default="data/index/relevance_weights.json")
+    lp.add_argument("--min-count", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    labeled = _labeled_from_store(args.facts_dir, args.timeline_dir)
+    weights = learn_weights(labeled, min_count=args.min_count)
+    n_pos = sum(1 for _, u in labeled if u)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(
+        json.dumps({"examples": len(labeled), "useful": n_pos, "weights": weights}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(f"examples {len(labeled)} (useful {n_pos}) -> {len(weights)} weights -> {out}")
+    for t, w in sorted(weights.items(), key=lambda kv: kv[1])[:5] + sorted(weights.items(), key=lambda kv: -kv[1])[:5]:
+        print(f"{w:+.2f}\t{t}")
+
+
+if __name__ == "__main__":
+    main()
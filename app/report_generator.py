@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .collector_rss import Item
 
@@ -14,8 +14,8 @@ class WeeklyReport:
     sections: Dict[str, str]  # section_name -> markdown
 
 
-def filter_recent(items: List[Item], days: int) -> List[Item]:
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+def filter_recent(items: List[Item], days: int, now: Optional[datetime] = None) -> List[Item]:
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
     out = []
     for it in items:
         # if no published time, keep it but it will be marked
@@ -24,8 +24,10 @@ def filter_recent(items: List[Item], days: int) -> List[Item]:
     return out
 
 
-def build_draft_report(collected: Dict[str, List[Item]], days: int) -> WeeklyReport:
-    now = datetime.now(timezone.utc)
+def build_draft_report(
+    collected: Dict[str, List[Item]], days: int, now: Optional[datetime] = None
+) -> WeeklyReport:
+    now = now or datetime.now(timezone.utc)
     title = f"[주간 경쟁사 동향 초안] 최근 {days}일 수집 요약"
 
     md = []
@@ -34,7 +36,7 @@ def build_draft_report(collected: Dict[str, List[Item]], days: int) -> WeeklyRep
     md.append("")
 
     for company, items in collected.items():
-        recent = filter_recent(items, days)
+        recent = filter_recent(items, days, now)
         md.append(f"## {company}")
         if not recent:
             md.append("- 수집된 항목 없음")
@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
+from .fact_payload import FactPayload
+
 
 def _shorten(text: str, max_len: int = 42) -> str:
     t = (text or "").strip()
@@ -25,14 +27,24 @@ def _slack_link(url: str, label: str) -> str:
     return f"<{url}|{safe_label}>"
 
 
-def extract_evidence_links(payloads: List[Dict[str, Any]], limit: int = 3) -> List[Tuple[str, str]]:
-    links: List[Tuple[str, str]] = []
-    for p in payloads:
-        meta = p.get("meta", {}) or {}
-        title = meta.get("title", "제목 확인 불가")
-        url = meta.get("url", "")
-        if url:
-            links.append((title, url))
+def extract_evidence_links(payloads: List[FactPayload], limit: int = 3) -> List[Tuple[str, str, List[str]]]:
+    """
+    (제목, URL, 같은 사건을 다룬 다른 기사 URL들).
+    FACT_DEDUP_MODE로 병합된 Fact(support_count > 1)가 있는 payload, 즉 여러 기사가 보도한 사건부터.
+    """
+    def support(p: FactPayload) -> int:
+        return max((f.support_count for f in p.facts), default=1)
+
+    links: List[Tuple[str, str, List[str]]] = []
+    for p in sorted(payloads, key=support, reverse=True):
+        title = p.title or "제목 확인 불가"
+        if p.url:
+            others: List[str] = []
+            for f in p.facts:
+                for u in f.sources:
+                    if u and u != p.url and u not in others:
+                        others.append(u)
+            links.append((title, p.url, others))
         if len(links) >= limit:
             break
     return links
@@ -42,7 +54,8 @@ def render_strategy_report(
     *,
     hypothesis_by_company: Dict[str, Dict[str, Any]],
     response_by_company: Dict[str, Dict[str, Any]],
-    payloads_by_company: Dict[str, List[Dict[str, Any]]],
+    payloads_by_company: Dict[str, List[FactPayload]],
+    responder: str = "원티드",
 ) -> str:
     lines: List[str] = []
     lines.append("*[주간 경쟁사 전략 리포트]*")
@@ -67,12 +80,16 @@ def render_strategy_report(
         links = extract_evidence_links(payloads, limit=3)
         if links:
             lines.append("  - 출처 링크:")
-            for t, u in links:
+            for t, u, others in links:
                 label = f"{_domain(u)}: {_shorten(t, 36)}"
-                lines.append(f"    - {_slack_link(u, label)}")
+                line = f"    - {_slack_link(u, label)}"
+                if others:
+                    more = ", ".join(_slack_link(o, _domain(o)) for o in others[:3])
+                    line += f" (같은 사건 기사 {len(others) + 1}건: {more})"
+                lines.append(line)
 
         # response
-        lines.append("- → 원티드 대응 옵션:")
+        lines.append(f"- → {responder} 대응 옵션:")
         dn = resp.get("do_nothing", {}) or {}
         df = resp.get("defensive", {}) or {}
         of = resp.get("offensive", {}) or {}
@@ -89,3 +106,38 @@ def render_strategy_report(
         lines.append("")
 
     return "\n".join(lines).strip() + "\n"
+
+
+def render_trend_report(
+    *,
+    assessment_by_company: Dict[str, Dict[str, Any]],
+    weeks_by_company: Dict[str, List[str]],
+    months: int,
+) -> str:
+    lines: List[str] = []
+    lines.append(f"*[경쟁사 전략 일관성 리포트 — 최근 {months}개월]*")
+    lines.append("")
+
+    for company in sorted(assessment_by_company.keys()):
+        a = assessment_by_company[company]
+        weeks = weeks_by_company.get(company, [])
+
+        span = f"{weeks[0]} ~ {weeks[-1]}, {len(weeks)}주" if weeks else "기간 확인 불가"
+        lines.append(f"*■ {company}* ({span})")
+        lines.append(f"- 일관성: {a.get('consistency', '확인 불가')}")
+
+        sup = a.get("supporting_points", []) or []
+        if sup:
+            lines.append("  - 일관 근거:")
+            for s in sup[:4]:
+                lines.append(f"    - {s}")
+
+        con = a.get("conflicting_points", []) or []
+        if con:
+            lines.append("  - 상충 근거:")
+            for c in con[:4]:
+                lines.append(f"    - {c}")
+
+        lines.append("")
+
+    return "\n".join(lines).strip() + "\n"
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .company_map import CompanyMapper
+from .facts_read import read_fact_payloads
+from .storage_fact import fact_key, iso_week, payload_date
+from .timeline_index import TimelineIndex
+
+
+METRICS = ("payloads", "facts", "signal", "related_area", "is_new_or_change")
+
+
+def _bump(counter: Dict[str, int], key: str, delta: int) -> None:
+    v = counter.get(key, 0) + delta
+    if v:
+        counter[key] = v
+    else:
+        counter.pop(key, None)
+
+
+@dataclass(frozen=True)
+class WeeklyRollups:
+    """
+    주(ISO week) x 경쟁사 단위로 미리 집계해 두는 카운트.
+
+    data/index/rollups/<YYYY-Www>.json
+    {
+      "companies": {company: {"payloads": n, "facts": n,
+                              "signal": {"A": n}, "related_area": {...}, "is_new_or_change": {...}}},
+      "contrib": {fact_key: payload 1건의 기여분}
+    }
+    - FactStore.save / record_signal 때마다 해당 주 파일 1개만 갱신
+    - contrib로 같은 payload의 재저장/재분류를 이중 집계하지 않음
+    """
+    base_dir: Path = Path("data/index/rollups")
+    mapper: CompanyMapper = field(default_factory=CompanyMapper.default)
+    # 같은 주 파일의 read-modify-write를 스레드 간 직렬화 (백필 병렬 워커)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    def _path(self, week: str) -> Path:
+        return self.base_dir / f"{week}.json"
+
+    def _load(self, week: str) -> Dict[str, Any]:
+        p = self._path(week)
+        if not p.exists():
+            return {"week": week, "companies": {}, "contrib": {}}
+        return json.loads(p.read_text(encoding="utf-8"))
+
+    def _store(self, week: str, data: Dict[str, Any]) -> None:
+        p = self._path(week)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    @staticmethod
+    def _apply(data: Dict[str, Any], contrib: Dict[str, Any], sign: int) -> None:
+        comp = data["companies"].setdefault(contrib["company"], {})
+        comp["payloads"] = comp.get("payloads", 0) + sign
+        comp["facts"] = comp.get("facts", 0) + sign * contrib.get("facts", 0)
+        for metric in ("related_area", "is_new_or_change"):
+            counter = comp.setdefault(metric, {})
+            for k, v in (contrib.get(metric) or {}).items():
+                _bump(counter, k, sign * v)
+        if contrib.get("signal"):
+            _bump(comp.setdefault("signal", {}), contrib["signal"], sign)
+        if comp["payloads"] <= 0:
+            data["companies"].pop(contrib["company"], None)
+
+    def _replace(self, week: str, key: str, contrib: Dict[str, Any]) -> None:
+        data = self._load(week)
+        old = data["contrib"].get(key)
+        if old == contrib:
+            return
+        if old:
+            self._apply(data, old, -1)
+        self._apply(data, contrib, +1)
+        data["contrib"][key] = contrib
+        self._store(week, data)
+
+    def on_save(self, payload: Dict[str, Any]) -> None:
+        d = payload_date(payload)
+        if not d:
+            return
+        week = iso_week(d)
+        key = fact_key(payload)
+
+        areas: Dict[str, int] = {}
+        changes: Dict[str, int] = {}
+        facts = [f for f in ((payload.get("fact", {}) or {}).get("facts") or []) if isinstance(f, dict)]
+        for f in facts:
+            _bump(areas, str(f.get("related_area") or "미기재"), 1)
+            _bump(changes, str(f.get("is_new_or_change") or "unknown"), 1)
+
+        with self._lock:
+            old = self._load(week)["contrib"].get(key) or {}
+            self._replace(
+                week,
+                key,
+                {
+                    "company": self.mapper.group_key(payload),
+                    "facts": len(facts),
+                    "related_area": areas,
+                    "is_new_or_change": changes,
+                    "signal": old.get("signal"),
+                },
+            )
+
+    def on_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        d = payload_date(payload)
+        if not d:
+            return
+        self._set_signal(iso_week(d), fact_key(payload), (signal.get("signal_level") or "").strip())
+
+    def _set_signal(self, week: str, key: str, level: str) -> None:
+        with self._lock:
+            old = self._load(week)["contrib"].get(key)
+            if old is None or not level:
+                # 저장 기록이 없는 payload는 집계 대상이 아님
+                return
+            self._replace(week, key, dict(old, signal=level))
+
+    def series(
+        self,
+        *,
+        since: date,
+        until: date,
+        metric: str = "payloads",
+        value: Optional[str] = None,
+        company: Optional[str] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        [since, until] 구간의 주별 카운트. 데이터가 없는 주는 0으로 채운다.
+        """
+        weeks: List[str] = []
+        d = since
+        while d <= until:
+            w = iso_week(d.isoformat())
+            if w not in weeks:
+                weeks.append(w)
+            d += timedelta(days=7)
+        last = iso_week(until.isoformat())
+        if last not in weeks:
+            weeks.append(last)
+
+        out: List[Tuple[str, int]] = []
+        for w in weeks:
+            companies = self._load(w)["companies"] if self._path(w).exists() else {}
+            total = 0
+            for name, counts in companies.items():
+                if company and name != company:
+                    continue
+                v = counts.get(metric, 0)
+                if isinstance(v, dict):
+                    v = v.get(value, 0) if value else sum(v.values())
+                total += v
+            out.append((w, total))
+        return out
+
+    def rebuild(self, facts_dir: str = "data/facts", timeline: Optional[TimelineIndex] = None) -> int:
+        """
+        기존 Fact 트리(+ 타임라인 인덱스의 분류 결과)로 롤업 전체를 다시 만든다.
+        """
+        if self.base_dir.exists():
+            shutil.rmtree(self.base_dir)
+
+        n = 0
+        for p in read_fact_payloads(facts_dir):
+            self.on_save(p)
+            n += 1
+
+        timeline = timeline or TimelineIndex()
+        for company in timeline.companies():
+            for e in timeline.read(company):
+                if e.get("week") and e.get("key"):
+                    self._set_signal(e["week"], e["key"], e.get("signal_level", ""))
+        return n
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.rollups", description="주간 Fact 롤업 조회/재빌드")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    q = sub.add_parser("query", help="주별 카운트 시계열 조회")
+    q.add_argument("--company")
+    q.add_argument("--metric", choices=METRICS, default="payloads")
+    q.add_argument("--value", help="signal/related_area/is_new_or_change 값 (예: A)")
+    q.add_argument("--since", help="YYYY-MM-DD (기본: 12주 전)")
+    q.add_argument("--until", help="YYYY-MM-DD (기본: 오늘)")
+    q.add_argument("--json", action="store_true")
+
+    r = sub.add_parser("rebuild", help="data/facts 전체로 롤업 재생성")
+    r.add_argument("--facts-dir", default="data/facts")
+
+    args = ap.parse_args(argv)
+    rollups = WeeklyRollups()
+
+    if args.cmd == "rebuild":
+        n = rollups.rebuild(args.facts_dir)
+        print(f"rebuilt rollups from {n} payloads -> {rollups.base_dir}")
+        return
+
+    until = date.fromisoformat(args.until) if args.until else date.today()
+    since = date.fromisoformat(args.since) if args.since else until - timedelta(weeks=12)
+    series = rollups.series(since=since, until=until, metric=args.metric, value=args.value, company=args.company)
+
+    if args.json:
+        print(json.dumps([{"week": w, "count": c} for w, c in series], ensure_ascii=False))
+        return
+    for w, c in series:
+        print(f"{w}\t{c}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from .cassette import default_cassette
+from .fact_payload import FactPayload
+from .facts_read import FactRecordCache, read_fact_records
+from .rate_limit import RateLimiter
+from .rollups import WeeklyRollups
+from .search import SearchIndex
+from .storage_fact import FactStore, UrlIndex
+from .timeline_index import TimelineIndex
+from .vertex_llm import VertexLLM
+
+# 실행 진입점(pipeline_weekly, backfill, extract_queue, batch_predict, model_eval, daemon)이
+# 공유하는 환경변수 해석, 시각, Fact 저장소/인덱스, 단계별 Vertex LLM 생성
+
+
+# 데몬 모드에서 실행 간 유지하는 인덱스/뷰 (None이면 실행마다 새로 만든다)
+_warm_indexers: Optional[tuple] = None
+_warm_facts: Optional[FactRecordCache] = None
+
+
+def enable_warm_state() -> None:
+    """
+    같은 프로세스에서 반복 실행할 때(app.daemon) 타임라인 버킷 캐시, URL 인덱스,
+    Fact 레코드 뷰를 실행 간에 재사용한다.
+    """
+    global _warm_indexers, _warm_facts
+    if _warm_indexers is None:
+        _warm_indexers = (TimelineIndex(), WeeklyRollups(), SearchIndex(), UrlIndex())
+        _warm_facts = FactRecordCache()
+
+
+def warm_state_sizes() -> Dict[str, int]:
+    if _warm_indexers is None or _warm_facts is None:
+        return {}
+    return {"fact_records": len(_warm_facts), "known_urls": len(_warm_indexers[3])}
+
+
+def timeline_index() -> TimelineIndex:
+    return _warm_indexers[0] if _warm_indexers is not None else TimelineIndex()
+
+
+def read_facts() -> List[FactPayload]:
+    if _warm_facts is not None:
+        return _warm_facts.read()
+    return read_fact_records("data/facts")
+
+
+def fact_store(timeline: Optional[TimelineIndex] = None) -> FactStore:
+    # 저장/분류 시 파생 인덱스를 함께 갱신
+    if _warm_indexers is not None and (timeline is None or timeline is _warm_indexers[0]):
+        return FactStore(indexers=_warm_indexers)
+    return FactStore(indexers=(timeline or TimelineIndex(), WeeklyRollups(), SearchIndex()))
+
+
+def now_utc() -> datetime:
+    # replay 중에는 녹화 시각 (lookback/cutoff가 녹화 당시와 같게)
+    return default_cassette().now()
+
+
+def to_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def env_int(name: str, default: int) -> int:
+    v = os.environ.get(name)
+    if not v:
+        return default
+    try:
+        return int(v)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    v = os.environ.get(name)
+    if not v:
+        return default
+    try:
+        return float(v)
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    v = (os.environ.get(name) or "").strip().lower()
+    if not v:
+        return default
+    return v in ("1", "true", "yes", "y", "on")
+
+
+# 단계별 인스턴스가 LLM_QPM 한도 하나를 공유
+_llm_limiter: List[RateLimiter] = []
+
+
+def stage_model(stage: str = "") -> str:
+    """
+    단계(extract/classify/hypothesis/response/trend)별 모델: GEMINI_MODEL_<STAGE>, 없으면 GEMINI_MODEL.
+    (python -m app.model_eval 이 권장 매핑을 출력)
+    """
+    default = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-lite").strip()
+    if not stage:
+        return default
+    return (os.environ.get(f"GEMINI_MODEL_{stage.upper()}") or "").strip() or default
+
+
+def vertex_llm_from_env(stage: str = "", *, qpm: Optional[int] = None) -> VertexLLM:
+    # qpm: 호출자가 정한 한도 (None이면 LLM_QPM, 0 = 제한 없음)
+    if qpm is None:
+        qpm = env_int("LLM_QPM", 0)
+    if qpm > 0 and not _llm_limiter:
+        _llm_limiter.append(RateLimiter(qpm))
+    return VertexLLM(
+        project_id=os.environ["GCP_PROJECT_ID"],
+        region=os.environ["GCP_REGION"],
+        model_name=stage_model(stage),
+        rate_limiter=_llm_limiter[0] if qpm > 0 else None,
+        stream=env_bool("LLM_STREAM_MODE", False),
+    )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import shlex
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .company_map import CompanyMapper
+from .facts_read import read_fact_payloads
+from .storage_fact import fact_key, payload_date
+from .text_tokens import char_ngrams, normalize
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    date TEXT,
+    company TEXT,
+    title TEXT,
+    url TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_date ON docs(date);
+CREATE INDEX IF NOT EXISTS docs_company ON docs(company);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (gram, doc)
+) WITHOUT ROWID;
+"""
+
+
+def searchable_text(payload: Dict[str, Any]) -> str:
+    """
+    색인 대상: meta.title, fact.facts[].what_happened / related_area / numbers
+    """
+    meta = payload.get("meta", {}) or {}
+    fact = payload.get("fact", {}) or {}
+    parts: List[str] = [str(meta.get("title", "") or "")]
+    for f in fact.get("facts") or []:
+        if not isinstance(f, dict):
+            continue
+        parts.append(str(f.get("what_happened", "") or ""))
+        parts.append(str(f.get("related_area", "") or ""))
+        for n in f.get("numbers") or []:
+            if isinstance(n, dict):
+                parts.append(f"{n.get('name', '')} {n.get('value', '')}")
+    return normalize(" ".join(parts))
+
+
+@dataclass(frozen=True)
+class Clause:
+    term: str       # 정규화된 검색어/구문
+    negate: bool
+
+
+def parse_query(q: str) -> List[List[Clause]]:
+    """
+    간단한 불리언 질의:
+    - 공백 = AND, OR = 합집합, -단어 / NOT 단어 = 제외
+    - "따옴표 구문" = 구문 일치
+    반환: OR로 묶인 AND 절 목록
+    """
+    groups: List[List[Clause]] = [[]]
+    negate_next = False
+    for tok in shlex.split(q, posix=True):
+        if tok == "OR":
+            groups.append([])
+            continue
+        if tok in ("AND", ""):
+            continue
+        if tok == "NOT":
+            negate_next = True
+            continue
+        negate = negate_next
+        negate_next = False
+        if tok.startswith("-") and len(tok) > 1:
+            negate, tok = True, tok[1:]
+        term = normalize(tok)
+        if term:
+            groups[-1].append(Clause(term=term, negate=negate))
+    return [g for g in groups if any(not c.negate for c in g)]
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    저장된 Fact에 대한 영속 역색인 (stdlib sqlite3).
+
+    - FactStore indexer: save 때마다 해당 payload 1건만 재색인
+    - 토큰: 어절 단위 문자 bigram (text_tokens.char_ngrams)
+    - 질의: bigram 후보 교집합 → 정규화 본문 부분일치로 구문/오탐 검증
+    """
+    path: Path = Path("data/index/search.sqlite3")
+    mapper: CompanyMapper = field(default_factory=CompanyMapper.default)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(SCHEMA_SQL)
+        return conn
+
+    def _upsert(self, conn: sqlite3.Connection, payload: Dict[str, Any]) -> None:
+        meta = payload.get("meta", {}) or {}
+        key = fact_key(payload)
+        body = searchable_text(payload)
+
+        row = conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+        if row:
+            doc_id = row[0]
+            conn.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+            conn.execute(
+                "UPDATE docs SET date=?, company=?, title=?, url=?, body=? WHERE id=?",
+                (payload_date(payload), self.mapper.group_key(payload), meta.get("title", ""),
+                 meta.get("url", ""), body, doc_id),
+            )
+        else:
+            cur = conn.execute(
+                "INSERT INTO docs(key, date, company, title, url, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload_date(payload), self.mapper.group_key(payload), meta.get("title", ""),
+                 meta.get("url", ""), body),
+            )
+            doc_id = cur.lastrowid
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO postings(gram, doc) VALUES (?, ?)",
+            [(g, doc_id) for g in set(char_ngrams(body))],
+        )
+
+    def on_save(self, payload: Dict[str, Any]) -> None:
+        with closing(self._connect()) as conn, conn:
+            self._upsert(conn, payload)
+
+    def on_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        return None
+
+    def rebuild(self, facts_dir: str = "data/facts") -> int:
+        if self.path.exists():
+            self.path.unlink()
+        n = 0
+        with closing(self._connect()) as conn, conn:
+            for p in read_fact_payloads(facts_dir):
+                self._upsert(conn, p)
+                n += 1
+        return n
+
+    def _candidates(self, conn: sqlite3.Connection, term: str) -> Optional[Set[int]]:
+        """
+        term의 bigram을 모두 가진 문서 id. None이면 색인으로 좁힐 수 없음 → 호출자가 본문 부분 문자열로 거른다.
+        한 글자 어절("앱")은 색인에 단독 어절로만 들어가 있어 포함 검색이 안 되므로 좁히는 데 쓰지 않는다.
+        """
+        grams = sorted({g for w in normalize(term).split(" ") if len(w) >= 2 for g in char_ngrams(w)})
+        if not grams:
+            return None
+        marks = ",".join("?" * len(grams))
+        rows = conn.execute(
+            f"SELECT doc FROM postings WHERE gram IN ({marks}) GROUP BY doc HAVING COUNT(*) = ?",
+            (*grams, len(grams)),
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def search(
+        self,
+        query: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        company: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        groups = parse_query(query)
+        if not groups or not self.path.exists():
+            return []
+
+        where = ["1=1"]
+        params: List[Any] = []
+        if since:
+            where.append("date >= ?")
+            params.append(since)
+        if until:
+            where.append("date <= ?")
+            params.append(until)
+        if company:
+            where.append("company = ?")
+            params.append(company)
+
+        hits: Dict[int, Tuple[str, str, str, str]] = {}
+        with closing(self._connect()) as conn:
+            for group in groups:
+                ids: Optional[Set[int]] = None
+                for c in group:
+                    if c.negate:
+                        continue
+                    cand = self._candidates(conn, c.term)
+                    if cand is not None:
+                        ids = cand if ids is None else ids & cand
+                if ids is not None and not ids:
+                    continue
+
+                sql = f"SELECT id, date, company, title, url, body FROM docs WHERE {' AND '.join(where)}"
+                rows = conn.execute(sql, params).fetchall() if ids is None else [
+                    r
+                    for chunk in _chunks(sorted(ids), 500)
+                    for r in conn.execute(
+                        sql + f" AND id IN ({','.join('?' * len(chunk))})", (*params, *chunk)
+                    ).fetchall()
+                ]
+                for doc_id, d, comp, title, url, body in rows:
+                    if all((c.term in body) != c.negate for c in group):
+                        hits[doc_id] = (d or "", comp or "", title or "", url or "")
+
+        ordered = sorted(hits.values(), key=lambda h: h[0], reverse=True)[:limit]
+        return [{"date": d, "company": c, "title": t, "url": u} for d, c, t, u in ordered]
+
+
+def _chunks(xs: List[int], n: int) -> List[List[int]]:
+    return [xs[i : i + n] for i in range(0, len(xs), n)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.search", description="저장된 Fact 전문 검색")
+    ap.add_argument("query", nargs="?", default="", help='예: 투자 OR 제휴 -인터뷰, "신규 서비스"')
+    ap.add_argument("--company")
+    ap.add_argument("--since", help="YYYY-MM-DD")
+    ap.add_argument("--until", help="YYYY-MM-DD")
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--rebuild", action="store_true", help="data/facts 전체로 색인 재생성")
+    ap.add_argument("--facts-dir", default="data/facts")
+    args = ap.parse_args(argv)
+
+    index = SearchIndex()
+    if args.rebuild:
+        n = index.rebuild(args.facts_dir)
+        print(f"indexed {n} payloads -> {index.path}")
+        if not args.query:
+            return
+
+    t0 = time.perf_counter()
+    results = index.search(args.query, since=args.since, until=args.until, company=args.company, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    for r in results:
+        print(f"{r['date']}\t{r['company']}\t{r['title']}\t{r['url']}")
+    print(f"-- {len(results)} hits in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,11 +33,34 @@ USER = """
 {fact_json}
 """
 
+SCHEMA = {
+    "type": "object",
+    "required": ["signal_level", "reason"],
+    "properties": {
+        "signal_level": {"enum": ["A", "B", "C"]},
+        "reason": {"type": "string"},
+        "is_event_like": {"enum": ["high", "medium", "low"]},
+        "needs_followup": {"type": "boolean"},
+    },
+}
+
 
 @dataclass(frozen=True)
 class SignalClassifier:
     llm: VertexLLM
 
+    @staticmethod
+    def request(fact_json: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        generate_json 인자 (온라인 호출과 배치 요청 파일이 같은 프롬프트를 쓰도록)
+        """
+        return {
+            "system_instruction": SYSTEM.strip(),
+            "user_input": USER.format(fact_json=fact_json),
+            "temperature": 0.0,
+            "max_output_tokens": 2048,
+            "schema": SCHEMA,
+        }
+
     def classify(self, fact_json: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = USER.format(fact_json=fact_json)
-        return self.llm.generate_json(system_instruction=SYSTEM.strip(), user_input=prompt, temperature=0.0)
+        return self.llm.generate_json(**self.request(fact_json))
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .signal_classifier_vertex import SignalClassifier
+from .text_tokens import normalize
+
+
+# 키워드 -> (등급, 가중치). 긴 키워드부터 매칭하고 매칭된 구간은 지워서
+# "조직개편"이 B의 "개편"으로, "요금제"가 "요금"으로 이중 집계되지 않게 한다.
+KEYWORDS: Dict[str, Tuple[str, float]] = {
+    # A: 가격/수익모델(BM)/조직개편/투자/핵심상품 변화
+    "투자": ("A", 2.0),
+    "시리즈": ("A", 1.0),
+    "인수": ("A", 2.0),
+    "합병": ("A", 2.0),
+    "m&a": ("A", 2.0),
+    "상장": ("A", 2.0),
+    "ipo": ("A", 2.0),
+    "요금": ("A", 2.0),
+    "요금제": ("A", 2.0),
+    "가격": ("A", 2.0),
+    "수수료": ("A", 2.0),
+    "과금": ("A", 2.0),
+    "유료화": ("A", 2.0),
+    "구독": ("A", 1.5),
+    "수익모델": ("A", 2.0),
+    "bm": ("A", 1.5),
+    "조직개편": ("A", 2.0),
+    "구조조정": ("A", 2.0),
+    "분사": ("A", 2.0),
+    "대표 선임": ("A", 2.0),
+    "신임 대표": ("A", 2.0),
+    "사업 철수": ("A", 2.0),
+    "피봇": ("A", 1.5),
+    # B: 기능 업데이트/제휴/타겟 확장/상품 실험
+    "기능": ("B", 1.5),
+    "업데이트": ("B", 2.0),
+    "개편": ("B", 1.0),
+    "제휴": ("B", 2.0),
+    "협약": ("B", 2.0),
+    "mou": ("B", 2.0),
+    "파트너십": ("B", 2.0),
+    "베타": ("B", 1.5),
+    "시범": ("B", 1.5),
+    "실험": ("B", 1.5),
+    "출시": ("B", 1.0),
+    "론칭": ("B", 1.0),
+    "도입": ("B", 1.0),
+    "확대": ("B", 1.0),
+    "타겟": ("B", 1.0),
+    # C: 캠페인/인터뷰/홍보성 메시지
+    "캠페인": ("C", 2.0),
+    "인터뷰": ("C", 2.0),
+    "이벤트": ("C", 2.0),
+    "프로모션": ("C", 2.0),
+    "광고": ("C", 1.5),
+    "홍보": ("C", 2.0),
+    "수상": ("C", 2.0),
+    "행사": ("C", 1.5),
+    "세미나": ("C", 1.5),
+    "웨비나": ("C", 1.5),
+    "컨퍼런스": ("C", 1.5),
+    "설문": ("C", 1.5),
+    "조사 결과": ("C", 1.5),
+    "리포트 발간": ("C", 1.5),
+    "기부": ("C", 1.5),
+    "봉사": ("C", 1.5),
+}
+
+# 키워드를 포함하지만 다른 뜻인 한국어 복합어 (매칭 전에 지운다)
+EXCLUDED: Tuple[str, ...] = (
+    "인수인계",
+    "인수위",
+    "수상한",
+)
+
+
+def _pattern(kw: str) -> "re.Pattern[str]":
+    # 영문 키워드는 단어 경계로만 ("bm"⊄"ibm", "mou"⊄"amount", "ipo"⊄"tipo").
+    # 한글 조사가 바로 붙는 경우("ipo를")는 매칭되도록 영숫자만 경계로 본다.
+    if kw.isascii():
+        return re.compile(rf"(?<![a-z0-9]){re.escape(kw)}(?![a-z0-9])")
+    return re.compile(re.escape(kw))
+
+
+_ORDERED = sorted(
+    ((normalize(k), _pattern(normalize(k)), v) for k, v in KEYWORDS.items()),
+    key=lambda kv: len(kv[0]),
+    reverse=True,
+)
+_EXCLUDED_RE = re.compile("|".join(re.escape(normalize(w)) for w in sorted(EXCLUDED, key=len, reverse=True)))
+
+
+@dataclass(frozen=True)
+class RuleResult:
+    signal_level: Optional[str]
+    confidence: float
+    matched: Tuple[str, ...]
+
+    def to_signal(self) -> Dict[str, Any]:
+        return {
+            "signal_level": self.signal_level,
+            "reason": f"[rule] {', '.join(self.matched)}",
+            "confidence": round(self.confidence, 2),
+        }
+
+
+def _fact_text(fact_json: Dict[str, Any]) -> str:
+    parts: List[str] = []
+    for f in fact_json.get("facts") or []:
+        if isinstance(f, dict):
+            parts.append(str(f.get("what_happened", "") or ""))
+            parts.append(str(f.get("related_area", "") or ""))
+    return " ".join(parts)
+
+
+def rule_classify(fact_json: Dict[str, Any]) -> RuleResult:
+    """
+    키워드 가중치 합으로 A/B/C 점수를 내고, 확신도를 계산한다.
+    confidence = (1등 점수 비중) x min(1, 1등 점수 / 2)
+      - 다른 등급 키워드가 섞이면 비중이 낮아지고 ("투자자 인터뷰")
+      - 약한 키워드 하나뿐이면 크기 항이 낮아진다 ("출시")
+    """
+    text = _EXCLUDED_RE.sub(" ", f" {normalize(_fact_text(fact_json))} ")
+    scores = {"A": 0.0, "B": 0.0, "C": 0.0}
+    matched: List[str] = []
+    for kw, pat, (level, weight) in _ORDERED:
+        text, n = pat.subn(" ", text)
+        if n:
+            scores[level] += weight * min(n, 2)
+            matched.append(kw)
+
+    total = sum(scores.values())
+    if total == 0:
+        return RuleResult(None, 0.0, ())
+    level = max(scores, key=lambda k: (scores[k], k == "A"))
+    top = scores[level]
+    return RuleResult(level, (top / total) * min(1.0, top / 2.0), tuple(matched))
+
+
+@dataclass(frozen=True)
+class TieredClassifier:
+    """
+    규칙 분류(확신도 >= min_confidence)로 끝나는 Fact는 LLM 호출 없이 반환하고,
+    나머지만 SignalClassifier(Gemini)로 넘긴다. SignalClassifier와 같은 classify() 인터페이스.
+    """
+    llm_classifier: SignalClassifier
+    min_confidence: float = 0.8
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    def _count(self, key: str) -> None:
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    def classify(self, fact_json: Dict[str, Any]) -> Dict[str, Any]:
+        r = rule_classify(fact_json)
+        if r.signal_level and r.confidence >= self.min_confidence:
+            self._count("rule")
+            return r.to_signal()
+        self._count("llm")
+        return self.llm_classifier.classify(fact_json)
+
+
+def _mean_vertex_ms(cassette_path: Optional[str]) -> Optional[float]:
+    if not cassette_path:
+        return None
+    ms: List[int] = []
+    with gzip.open(cassette_path, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            e = json.loads(line)
+            if e.get("kind") == "vertex":
+                ms.append(int(e.get("ms", 0)))
+    return sum(ms) / len(ms) if ms else None
+
+
+def evaluate(entries: List[Dict[str, Any]], min_confidence: float) -> Dict[str, Any]:
+    """
+    entries: 타임라인 인덱스 항목 (LLM 라벨 signal_level + facts)
+    """
+    covered = agree = 0
+    confusion: Dict[str, int] = {}
+    for e in entries:
+        r = rule_classify({"facts": e.get("facts") or []})
+        if not r.signal_level or r.confidence < min_confidence:
+            continue
+        covered += 1
+        gold = e.get("signal_level", "")
+        agree += 1 if r.signal_level == gold else 0
+        k = f"{gold}->{r.signal_level}"
+        confusion[k] = confusion.get(k, 0) + 1
+    return {
+        "n": len(entries),
+        "covered": covered,
+        "agree": agree,
+        "confusion": dict(sorted(confusion.items())),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .timeline_index import TimelineIndex
+
+    ap = argparse.ArgumentParser(
+        prog="python -m app.signal_rules",
+        description="규칙 분류기를 저장된 LLM 분류 결과(타임라인 인덱스)와 비교",
+    )
+    ap.add_argument("--timeline-dir", default="data/index/timeline")
+    ap.add_argument("--min-confidence", type=float, default=0.8)
+    ap.add_argument("--cassette", help="녹화 파일로 LLM 평균 지연 추정 (없으면 --llm-ms)")
+    ap.add_argument("--llm-ms", type=float, default=1500.0)
+    args = ap.parse_args(argv)
+
+    index = TimelineIndex(base_dir=Path(args.timeline_dir))
+    # 규칙으로 분류된 항목은 정답(LLM 라벨)이 아니므로 제외
+    entries = [
+        e
+        for c in index.companies()
+        for e in index.read(c)
+        if e.get("signal_level") and not str(e.get("reason", "")).startswith("[rule]")
+    ]
+    if not entries:
+        print("no LLM-labelled entries in timeline index")
+        return
+
+    t0 = time.perf_counter()
+    for e in entries:
+        rule_classify({"facts": e.get("facts") or []})
+    rule_ms = (time.perf_counter() - t0) * 1000 / len(entries)
+    llm_ms = _mean_vertex_ms(args.cassette) or args.llm_ms
+
+    print(f"entries: {len(entries)} / rule {rule_ms:.3f} ms/fact / LLM {llm_ms:.0f} ms/call")
+    print(f"{'min_conf':>8} {'coverage':>9} {'agreement':>10} {'calls_saved':>12} {'time_saved':>11}")
+    for conf in sorted({0.5, 0.6, 0.7, 0.8, 0.9, args.min_confidence}):
+        r = evaluate(entries, conf)
+        cov = r["covered"] / r["n"]
+        acc = r["agree"] / r["covered"] if r["covered"] else 0.0
+        mark = " *" if conf == args.min_confidence else ""
+        print(
+            f"{conf:>8.2f} {cov:>8.0%} {acc:>10.0%} {r['covered']:>12d} "
+            f"{r['covered'] * llm_ms / 1000:>10.1f}s{mark}"
+        )
+
+    r = evaluate(entries, args.min_confidence)
+    print(f"confusion (llm->rule) @ {args.min_confidence}: {r['confusion']}")
+
+
+if __name__ == "__main__":
+    main()
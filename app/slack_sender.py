@@ -1,7 +1,328 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .cassette import default_cassette
+from .profiling import get_profiler
+from .runtime import env_int
+
+
+# Slack은 4,000자 넘는 메시지를 접거나 자르므로 여유를 둔다
+SLACK_MAX_CHARS = 3500
+SECTION_PREFIX = "*■ "
+# 분할 메시지 꼬리 "(i/n)" 자리
+_PART_RESERVE = 16
+
+
+def _hook_id(webhook_url: str) -> str:
+    # 스풀에는 웹훅 URL(비밀) 대신 해시만 남긴다
+    return hashlib.sha256(webhook_url.encode("utf-8")).hexdigest()[:16]
+
+
+def _split_long(block: str, limit: int) -> List[str]:
+    """
+    limit보다 긴 섹션은 줄 단위로, 한 줄도 길면 글자 단위로 나눈다.
+    """
+    out: List[str] = []
+    cur = ""
+    for line in block.split("\n"):
+        while len(line) > limit:
+            if cur:
+                out.append(cur)
+                cur = ""
+            out.append(line[:limit])
+            line = line[limit:]
+        if cur and len(cur) + 1 + len(line) > limit:
+            out.append(cur)
+            cur = line
+        else:
+            cur = f"{cur}\n{line}" if cur else line
+    if cur:
+        out.append(cur)
+    return out
+
+
+def split_message(text: str, limit: int = SLACK_MAX_CHARS) -> List[str]:
+    """
+    리포트를 섹션(`*■ 회사*` 헤더) 경계에서 limit자 이하 메시지들로 나눈다.
+    - 제목 등 첫 섹션 앞부분은 첫 메시지에
+    - 섹션 여러 개를 한 메시지에 채우되 섹션을 가르지 않는다 (한 섹션이 limit을 넘을 때만 줄 단위 분할)
+    - 여러 개로 나뉘면 각 메시지 끝에 (i/n)
+    """
+    body_limit = max(1, limit - _PART_RESERVE)
+    sections: List[List[str]] = [[]]
+    for line in (text or "").split("\n"):
+        if line.startswith(SECTION_PREFIX) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+
+    pieces: List[str] = []
+    for sec in sections:
+        block = "\n".join(sec).strip("\n")
+        if not block:
+            continue
+        pieces.extend([block] if len(block) <= body_limit else _split_long(block, body_limit))
+
+    chunks: List[str] = []
+    cur = ""
+    for p in pieces:
+        if cur and len(cur) + 2 + len(p) > body_limit:
+            chunks.append(cur)
+            cur = p
+        else:
+            cur = f"{cur}\n\n{p}" if cur else p
+    if cur:
+        chunks.append(cur)
+    if len(chunks) > 1:
+        chunks = [f"{c}\n_({i}/{len(chunks)})_" for i, c in enumerate(chunks, 1)]
+    return chunks or [text]
+
+
+def _pooled_session() -> requests.Session:
+    s = requests.Session()
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return s
+
+
+@dataclass(frozen=True)
+class SlackDelivery:
+    """
+    Slack 웹훅 전송: 분할 + 연결 재사용 + 재시도 + 디스크 스풀.
+
+    - 메시지는 split_message()로 나눠 순서대로, 공용 세션(keep-alive)으로 보낸다
+    - 429는 Retry-After만큼, 5xx/연결 오류는 지수 백오프로 max_retries회 재시도
+      (대기가 max_wait_sec를 넘으면 기다리지 않고 스풀)
+    - 끝내 못 보낸 조각(과 그 뒤 조각)은 data/spool/slack/ 에 남기고 예외 대신 False를 반환
+      → 다음 send()가 같은 웹훅의 스풀을 먼저 보내 순서를 지킨다 (python -m app.slack_sender redeliver 로도)
+    - 429 외 4xx(잘못된 payload 등)는 재시도해도 같으므로 그 조각만 rejected로 스풀하고 다음 조각을 보낸다
+    스풀 파일에는 웹훅 URL 대신 해시만 저장한다.
+    """
+    spool_dir: Path = Path("data/spool/slack")
+    max_chars: int = SLACK_MAX_CHARS
+    max_retries: int = 4
+    backoff_sec: float = 1.0
+    max_wait_sec: float = 60.0
+    timeout: int = 20
+    session: requests.Session = field(default_factory=_pooled_session, compare=False, repr=False)
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    # 웹훅별 전송 순서 보장 (테넌트 리포트는 병렬 전송)
+    _hook_locks: Dict[str, threading.Lock] = field(default_factory=dict, compare=False, repr=False)
+
+    @staticmethod
+    def from_env() -> "SlackDelivery":
+        return SlackDelivery(
+            spool_dir=Path(os.environ.get("SLACK_SPOOL_DIR", "data/spool/slack")),
+            max_chars=env_int("SLACK_MAX_CHARS", SLACK_MAX_CHARS),
+            max_retries=env_int("SLACK_MAX_RETRIES", 4),
+        )
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _hook_lock(self, hook: str) -> threading.Lock:
+        with self._lock:
+            return self._hook_locks.setdefault(hook, threading.Lock())
+
+    def _post(self, webhook_url: str, chunk: str) -> Tuple[bool, str, bool]:
+        """
+        Returns (ok, error, permanent).
+        """
+        cassette = default_cassette()
+
+        def post() -> Dict[str, Any]:
+            r = self.session.post(webhook_url, json={"text": chunk}, timeout=self.timeout)
+            return {"status": r.status_code, "text": r.text[:300], "retry_after": r.headers.get("Retry-After")}
+
+        error = ""
+        for attempt in range(self.max_retries + 1):
+            retry_after: Optional[str] = None
+            try:
+                with get_profiler().stage("slack"):
+                    # replay에서는 실제로 보내지 않는다. 본문이 녹화와 다르면 miss로 집계만 한다.
+                    resp = cassette.call(
+                        "slack",
+                        {"text": chunk},
+                        post,
+                        replay_default={"status": 200, "text": "ok"},
+                    )
+            except (requests.RequestException, RuntimeError) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                status = int(resp["status"])
+                if status < 300:
+                    return True, "", False
+                error = f"{status} {resp.get('text', '')}"
+                if status != 429 and status < 500:
+                    return False, error, True
+                retry_after = resp.get("retry_after")
+
+            if attempt == self.max_retries:
+                break
+            try:
+                delay = float(retry_after) if retry_after else self.backoff_sec * 2 ** attempt
+            except ValueError:
+                delay = self.backoff_sec * 2 ** attempt
+            if delay > self.max_wait_sec:
+                error += f" (retry after {delay:.0f}s)"
+                break
+            self._count("retries")
+            if not cassette.replaying:
+                time.sleep(delay)
+        return False, error, False
+
+    def _spool(self, webhook_url: str, chunks: List[str], error: str, *, rejected: bool = False) -> Path:
+        now = datetime.now(timezone.utc)
+        hook = _hook_id(webhook_url)
+        p = self.spool_dir / f"{now:%Y%m%dT%H%M%S%f}-{hook[:8]}.json"
+        entry = {
+            "webhook": hook,
+            "chunks": chunks,
+            "created_at": now.isoformat(timespec="seconds"),
+            "last_error": error[:300],
+            "rejected": rejected,
+        }
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(entry, ensure_ascii=False, indent=1), encoding="utf-8")
+        self._count("rejected" if rejected else "spooled", len(chunks))
+        print(f"[WARN] slack delivery {'rejected' if rejected else 'failed'} ({error[:120]}): {len(chunks)} message(s) spooled to {p}")
+        return p
+
+    def spooled(self, hook: Optional[str] = None) -> List[Tuple[Path, Dict[str, Any]]]:
+        if not self.spool_dir.exists():
+            return []
+        out: List[Tuple[Path, Dict[str, Any]]] = []
+        for p in sorted(self.spool_dir.glob("*.json")):
+            try:
+                e = json.loads(p.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                continue
+            if hook is None or e.get("webhook") == hook:
+                out.append((p, e))
+        return out
+
+    def _deliver(self, webhook_url: str, chunks: List[str]) -> Tuple[List[str], str, int]:
+        """
+        순서대로 보내고 (못 보낸 나머지, 마지막 오류, 거부 수)를 반환. 거부된 조각은 따로 스풀하고 넘어간다.
+        """
+        rejected = 0
+        for i, chunk in enumerate(chunks):
+            ok, error, permanent = self._post(webhook_url, chunk)
+            if ok:
+                self._count("delivered")
+            elif permanent:
+                rejected += 1
+                self._spool(webhook_url, [chunk], error, rejected=True)
+            else:
+                return chunks[i:], error, rejected
+        return [], "", rejected
+
+    def _flush(self, webhook_url: str, *, include_rejected: bool = False) -> bool:
+        """
+        이 웹훅의 스풀을 오래된 것부터 재전송. 전부 보냈으면 True.
+        호출자가 웹훅 잠금을 잡고 있어야 한다.
+        """
+        for p, e in self.spooled(_hook_id(webhook_url)):
+            if e.get("rejected") and not include_rejected:
+                continue
+            chunks = list(e.get("chunks") or [])
+            delivered = self.stats.get("delivered", 0)
+            # 다시 거부된 조각은 _deliver가 새 rejected 항목으로 남긴다
+            rest, error, _ = self._deliver(webhook_url, chunks)
+            self._count("redelivered", self.stats.get("delivered", 0) - delivered)
+            if rest:
+                e.update(chunks=rest, last_error=error[:300], rejected=False)
+                p.write_text(json.dumps(e, ensure_ascii=False, indent=1), encoding="utf-8")
+                return False
+            p.unlink()
+        return True
+
+    def send(self, webhook_url: str, text: str) -> bool:
+        """
+        전부 전달했으면 True. 실패/거부돼도 예외 없이 스풀에 남긴다.
+        """
+        chunks = split_message(text, self.max_chars)
+        hook = _hook_id(webhook_url)
+        with self._hook_lock(hook):
+            if not self._flush(webhook_url):
+                # 앞선 메시지가 아직 막혀 있으면 순서를 지키려고 바로 스풀
+                self._spool(webhook_url, chunks, "earlier messages still pending")
+                return False
+            rest, error, rejected = self._deliver(webhook_url, chunks)
+            if rest:
+                self._spool(webhook_url, rest, error)
+                return False
+        return not rejected
+
+    def redeliver(self, webhook_urls: List[str], *, include_rejected: bool = False) -> Dict[str, int]:
+        before = dict(self.stats)
+        for url in dict.fromkeys(u for u in webhook_urls if u):
+            with self._hook_lock(_hook_id(url)):
+                self._flush(url, include_rejected=include_rejected)
+        return {k: v - before.get(k, 0) for k, v in self.stats.items() if v != before.get(k, 0)}
+
+    def summary_line(self) -> str:
+        s = self.stats
+        return (
+            f"전송 {s.get('delivered', 0)} (재전송 {s.get('redelivered', 0)}) / 재시도 {s.get('retries', 0)} / "
+            f"스풀 {s.get('spooled', 0)} / 거부 {s.get('rejected', 0)}"
+        )
+
+
+_default_delivery: Optional[SlackDelivery] = None
+
+
+def default_slack_delivery() -> SlackDelivery:
+    global _default_delivery
+    if _default_delivery is None:
+        _default_delivery = SlackDelivery.from_env()
+    return _default_delivery
 
 
 def send_to_slack(webhook_url: str, text: str) -> None:
-    resp = requests.post(webhook_url, json={"text": text}, timeout=20)
-    if resp.status_code >= 300:
-        raise RuntimeError(f"Slack webhook failed: {resp.status_code} {resp.text}")
+    default_slack_delivery().send(webhook_url, text)
+
+
+def _known_webhooks() -> List[str]:
+    from .config import Settings
+    from .tenants import load_tenants
+
+    default = Settings.from_env().slack_webhook_url
+    return [default] + [t.webhook(default) for t in load_tenants()]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.slack_sender", description="Slack 스풀 조회/재전송")
+    ap.add_argument("cmd", choices=("list", "redeliver"))
+    ap.add_argument("--include-rejected", action="store_true", help="redeliver: 4xx로 거부된 메시지도 다시 시도")
+    args = ap.parse_args(argv)
+
+    delivery = default_slack_delivery()
+    if args.cmd == "list":
+        entries = delivery.spooled()
+        for p, e in entries:
+            mark = " [rejected]" if e.get("rejected") else ""
+            print(f"{p.name}: {len(e.get('chunks') or [])} message(s){mark} / {e.get('last_error', '')[:80]}")
+        print(f"{len(entries)} spooled")
+        return
+
+    # 스풀에는 URL 해시만 있으므로 환경변수(SLACK_WEBHOOK_URL, TENANTS_FILE)의 웹훅과 맞춰 본다
+    print(delivery.redeliver(_known_webhooks(), include_rejected=args.include_rejected))
+    print(f"remaining: {len(delivery.spooled())}")
+
+
+if __name__ == "__main__":
+    main()
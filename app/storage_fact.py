@@ -2,19 +2,103 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Protocol, Set, Tuple
 
 
 def _url_hash(url: str) -> str:
     return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
 
 
+def url_key(url: str) -> str:
+    """
+    URL 식별 키 (= 저장 파일명과 같은 URL 해시)
+    """
+    return _url_hash(url)
+
+
+def fact_key(payload: Dict[str, Any]) -> str:
+    meta = payload.get("meta", {}) or {}
+    return url_key(str(meta.get("url", "") or ""))
+
+
+def payload_date(payload: Dict[str, Any]) -> Optional[str]:
+    """
+    payload 기준 날짜(YYYY-MM-DD):
+    - meta.published_date가 있으면 그 날짜
+    - 없으면 meta.collected_at_utc의 날짜
+    """
+    meta = payload.get("meta", {}) or {}
+    pub = meta.get("published_date")
+    if isinstance(pub, str) and len(pub) >= 10:
+        return pub[:10]
+    collected_at = meta.get("collected_at_utc")
+    if isinstance(collected_at, str) and len(collected_at) >= 10:
+        return collected_at[:10]
+    return None
+
+
+def iso_week(date_str: str) -> str:
+    # "2026-10-19" -> "2026-W43"
+    y, w, _ = date.fromisoformat(date_str[:10]).isocalendar()
+    return f"{y}-W{w:02d}"
+
+
+class FactIndexer(Protocol):
+    """
+    FactStore에 연결되는 파생 인덱스(타임라인 등).
+    - on_save: payload 저장 직후
+    - on_signal: payload의 Signal(A/B/C) 분류 직후
+    """
+
+    def on_save(self, payload: Dict[str, Any]) -> None: ...
+
+    def on_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None: ...
+
+
+@dataclass(frozen=True)
+class UrlIndex:
+    """
+    저장된 URL 해시 집합 (메모리). 처음 조회할 때 base_dir를 한 번 훑고 이후 on_save로 갱신한다.
+    한 프로세스가 저장을 도맡는 데몬 모드용 — 여러 프로세스가 같은 저장소에 쓰면 쓰지 않는다.
+    """
+    base_dir: Path = Path("data/facts")
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    _keys: Set[str] = field(default_factory=set, compare=False, repr=False)
+    _loaded: list = field(default_factory=list, compare=False, repr=False)
+
+    def _ensure(self) -> None:
+        # 호출자가 _lock을 잡고 있어야 한다
+        if not self._loaded:
+            self._keys.update(p.stem for p in self.base_dir.glob("*/*.json"))
+            self._loaded.append(True)
+
+    def contains(self, url: str) -> bool:
+        with self._lock:
+            self._ensure()
+            return _url_hash(url) in self._keys
+
+    def on_save(self, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._ensure()
+            self._keys.add(fact_key(payload))
+
+    def on_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure()
+            return len(self._keys)
+
+
 @dataclass(frozen=True)
 class FactStore:
     base_dir: Path = Path("data/facts")
+    indexers: Tuple[FactIndexer, ...] = ()
 
     def path_for(self, *, url: str, date_utc: Optional[str] = None) -> Path:
         # date_utc: "YYYY-MM-DD"
@@ -26,6 +110,16 @@ class FactStore:
     def exists(self, *, url: str, date_utc: Optional[str] = None) -> bool:
         return self.path_for(url=url, date_utc=date_utc).exists()
 
+    def exists_any(self, *, url: str) -> bool:
+        """
+        날짜 파티션과 무관하게 같은 URL의 payload가 있는지 (백필/주간 실행 간 중복 방지)
+        """
+        for ix in self.indexers:
+            if isinstance(ix, UrlIndex):
+                return ix.contains(url)
+        h = _url_hash(url)
+        return any(True for _ in self.base_dir.glob(f"*/{h}.json"))
+
     def load(self, *, url: str, date_utc: Optional[str] = None) -> Dict[str, Any]:
         p = self.path_for(url=url, date_utc=date_utc)
         return json.loads(p.read_text(encoding="utf-8"))
@@ -54,4 +148,14 @@ class FactStore:
             "fact": fact_json,
         }
         p.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        for ix in self.indexers:
+            ix.on_save(payload)
         return p
+
+    def record_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        """
+        분류 결과를 연결된 인덱스에 반영한다. (payload 파일 자체는 수정하지 않음)
+        """
+        for ix in self.indexers:
+            ix.on_signal(payload, signal)
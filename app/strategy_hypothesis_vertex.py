@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from .vertex_llm import VertexLLM
+from .vertex_llm import FieldCallback, VertexLLM
 
 
 SYSTEM = """
@@ -34,11 +34,28 @@ USER = """
 {facts}
 """
 
+SCHEMA = {
+    "type": "object",
+    "required": ["hypothesis", "evidence"],
+    "properties": {
+        "hypothesis": {"type": "string"},
+        "evidence": {"type": "array", "items": {"type": "string"}},
+        "alt_hypothesis": {"type": "array", "items": {"type": "string"}},
+        "falsifiers": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
 
 @dataclass(frozen=True)
 class StrategyHypothesis:
     llm: VertexLLM
 
-    def infer(self, facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def infer(self, facts: List[Dict[str, Any]], on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
         prompt = USER.format(facts=json.dumps(facts, ensure_ascii=False))
-        return self.llm.generate_json(system_instruction=SYSTEM.strip(), user_input=prompt, temperature=0.0)
+        return self.llm.generate_json(
+            system_instruction=SYSTEM.strip(),
+            user_input=prompt,
+            temperature=0.0,
+            schema=SCHEMA,
+            on_field=on_field,
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# tenant_id는 리포트 파일명(weekly_strategy_report_<id>.md)에 들어간다
+_TENANT_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+@dataclass(frozen=True)
+class TenantProfile:
+    """
+    대응 옵션을 받는 사업부(테넌트) 설정.
+
+    - name: 프롬프트/리포트에 쓰는 이름 ("원티드 대응 옵션")
+    - role: 시스템 프롬프트의 담당자 역할
+    - context: 사업부 맥락 (있으면 프롬프트에 추가)
+    - rules: 사업부별 추가 규칙
+    - slack_webhook_url: 비어 있으면 기본 SLACK_WEBHOOK_URL
+    """
+    tenant_id: str
+    name: str
+    role: str
+    context: str = ""
+    rules: Tuple[str, ...] = ()
+    slack_webhook_url: str = ""
+
+    def webhook(self, default: str) -> str:
+        return self.slack_webhook_url or default
+
+
+WANTED = TenantProfile(
+    tenant_id="wanted",
+    name="원티드",
+    role="원티드랩의 채용사업개발 전략 담당자",
+)
+
+
+def load_tenants(path: Optional[str] = None) -> List[TenantProfile]:
+    """
+    TENANTS_FILE(JSON 배열)에서 테넌트 목록을 읽는다. 없으면 원티드 하나.
+
+    [{"id": "wanted_space", "name": "원티드스페이스", "role": "...", "context": "...",
+      "rules": ["..."], "slack_webhook_env": "SLACK_WEBHOOK_URL_SPACE"}]
+
+    웹훅은 파일에 직접 쓰지 않고 환경변수 이름(slack_webhook_env)으로 지정한다.
+    id는 영문/숫자/_/- 만 허용한다 (경로 문자가 파일명에 섞이지 않게).
+    """
+    path = path or os.environ.get("TENANTS_FILE", "")
+    if not path:
+        return [WANTED]
+
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    tenants: List[TenantProfile] = []
+    for t in raw:
+        if not _TENANT_ID_RE.fullmatch(str(t["id"])):
+            raise ValueError(f"Invalid tenant id in {path}: {t['id']!r} (allowed: A-Z a-z 0-9 _ -)")
+        env = (t.get("slack_webhook_env") or "").strip()
+        webhook = os.environ.get(env, "").strip() if env else ""
+        if env and not webhook:
+            print(f"[WARN] tenant {t.get('id')}: {env} is empty, using default Slack webhook")
+        tenants.append(
+            TenantProfile(
+                tenant_id=str(t["id"]),
+                name=str(t.get("name") or t["id"]),
+                role=str(t.get("role") or f"{t.get('name') or t['id']}의 전략 담당자"),
+                context=str(t.get("context") or ""),
+                rules=tuple(str(r) for r in (t.get("rules") or [])),
+                slack_webhook_url=webhook,
+            )
+        )
+
+    ids = [t.tenant_id for t in tenants]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate tenant id in {path}: {ids}")
+    return tenants or [WANTED]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from typing import List, Set
+
+_WS_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s%.]+")
+
+
+def normalize(text: str) -> str:
+    """
+    검색/비교용 정규화: NFKC, 소문자, 구두점 제거, 공백 1칸.
+    """
+    t = unicodedata.normalize("NFKC", text or "").lower()
+    t = _PUNCT_RE.sub(" ", t)
+    return _WS_RE.sub(" ", t).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Gemini 토큰 수 대략치: ASCII 4자/토큰, 한글 등 1.5자/토큰
+    """
+    ascii_n = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_n / 4 + (len(text) - ascii_n) / 1.5)
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """
+    한국어 친화 토큰: 어절 단위 문자 n-gram (어절 경계를 넘지 않음).
+    n보다 짧은 어절은 어절 자체를 토큰으로 쓴다.
+    예) "투자 유치" -> ["투자", "유치"], "리멤버" -> ["리멤", "멤버"]
+    """
+    out: List[str] = []
+    for word in normalize(text).split(" "):
+        if not word:
+            continue
+        if len(word) <= n:
+            out.append(word)
+            continue
+        out.extend(word[i : i + n] for i in range(len(word) - n + 1))
+    return out
+
+
+def ngram_set(text: str, n: int = 2) -> Set[str]:
+    return set(char_ngrams(text, n))
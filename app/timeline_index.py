@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .company_map import CompanyMapper
+from .storage_fact import fact_key, iso_week, payload_date
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[\\/:*?\"<>|\s]+", "_", name.strip()) or "_"
+
+
+@dataclass(frozen=True)
+class TimelineIndex:
+    """
+    경쟁사별 '분류된 Fact' 타임라인 인덱스.
+
+    data/index/timeline/<company>/<YYYY-Www>.jsonl
+    - 주(ISO week) 단위 버킷 파일에 append만 한다. (새 주가 와도 재빌드 없음)
+    - 같은 payload(fact_key)는 버킷당 한 번만 기록
+    - 읽을 때 버킷 이름순 → 버킷 내부 날짜순 정렬
+    - lookup(): 이미 분류된 payload의 Signal 재사용 (분류 캐시)
+    """
+    base_dir: Path = Path("data/index/timeline")
+    mapper: CompanyMapper = field(default_factory=CompanyMapper.default)
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    # 버킷 경로 -> {key: entry} (이 인스턴스가 읽거나 쓴 버킷만)
+    _keys: Dict[Path, Dict[str, Dict[str, Any]]] = field(default_factory=dict, compare=False, repr=False)
+
+    def _bucket(self, company: str, week: str) -> Path:
+        return self.base_dir / _safe_name(company) / f"{week}.jsonl"
+
+    def on_save(self, payload: Dict[str, Any]) -> None:
+        # 타임라인은 분류된 Fact만 담는다.
+        return None
+
+    def _locate(self, payload: Dict[str, Any]) -> Optional[Tuple[str, str, Path]]:
+        """
+        Returns (company, date, bucket path), or None if the payload is not indexed.
+        """
+        company = self.mapper.group_key(payload)
+        if company in ("미분류", "비교기사"):
+            return None
+        d = payload_date(payload)
+        if not d:
+            return None
+        return company, d, self._bucket(company, iso_week(d))
+
+    def _bucket_entries(self, p: Path) -> Dict[str, Dict[str, Any]]:
+        # 호출자가 _lock을 잡고 있어야 한다
+        entries = self._keys.get(p)
+        if entries is None:
+            entries = {e.get("key", ""): e for e in self._read_bucket(p)} if p.exists() else {}
+            self._keys[p] = entries
+        return entries
+
+    def lookup(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        이미 기록된 Signal({"signal_level", "reason"}) 또는 None.
+        """
+        loc = self._locate(payload)
+        if loc is None:
+            return None
+        with self._lock:
+            e = self._bucket_entries(loc[2]).get(fact_key(payload))
+        if e is None or not e.get("signal_level"):
+            return None
+        return {"signal_level": e["signal_level"], "reason": e.get("reason", "")}
+
+    def on_signal(self, payload: Dict[str, Any], signal: Dict[str, Any]) -> None:
+        loc = self._locate(payload)
+        if loc is None:
+            return
+        company, d, p = loc
+
+        key = fact_key(payload)
+        week = iso_week(d)
+
+        meta = payload.get("meta", {}) or {}
+        fact = payload.get("fact", {}) or {}
+        entry = {
+            "key": key,
+            "company": company,
+            "date": d,
+            "week": week,
+            "signal_level": (signal.get("signal_level") or "").strip(),
+            "reason": signal.get("reason", ""),
+            "title": meta.get("title", ""),
+            "url": meta.get("url", ""),
+            "facts": [
+                {
+                    "what_happened": f.get("what_happened", ""),
+                    "related_area": f.get("related_area"),
+                    "is_new_or_change": f.get("is_new_or_change", "unknown"),
+                }
+                for f in (fact.get("facts") or [])
+                if isinstance(f, dict)
+            ],
+        }
+
+        with self._lock:
+            entries = self._bucket_entries(p)
+            if key in entries:
+                return
+            p.parent.mkdir(parents=True, exist_ok=True)
+            with p.open("a", encoding="utf-8") as fp:
+                fp.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            entries[key] = entry
+
+    @staticmethod
+    def _read_bucket(p: Path) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for line in p.read_text(encoding="utf-8").splitlines():
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return out
+
+    def companies(self) -> List[str]:
+        if not self.base_dir.exists():
+            return []
+        names: List[str] = []
+        for d in sorted(self.base_dir.iterdir()):
+            if not d.is_dir():
+                continue
+            for b in sorted(d.glob("*.jsonl")):
+                entries = self._read_bucket(b)
+                if entries:
+                    names.append(entries[0].get("company") or d.name)
+                    break
+        return names
+
+    def weeks(self, company: str) -> List[str]:
+        d = self.base_dir / _safe_name(company)
+        if not d.exists():
+            return []
+        return sorted(p.stem for p in d.glob("*.jsonl"))
+
+    def read(self, company: str, *, since: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        since 이후 버킷만 읽어 날짜순으로 반환한다. (payload 트리는 읽지 않음)
+        """
+        min_week = iso_week(since.isoformat()) if since else ""
+        out: List[Dict[str, Any]] = []
+        for week in self.weeks(company):
+            if week < min_week:
+                continue
+            entries = self._read_bucket(self._bucket(company, week))
+            if since:
+                entries = [e for e in entries if e.get("date", "") >= since.isoformat()]
+            out.extend(sorted(entries, key=lambda e: e.get("date", "")))
+        return out
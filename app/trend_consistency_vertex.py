@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from .prompts import TREND_CONSISTENCY_PROMPT
+from .vertex_llm import VertexLLM
+
+
+SYSTEM = """
+너는 채용 플랫폼 시장의 전략 분석가다.
+경쟁사의 주차별 Fact 타임라인만 근거로 전략의 일관성을 평가한다. 추측 금지.
+출력은 반드시 JSON 하나만 반환한다.
+"""
+
+# TREND_CONSISTENCY_PROMPT의 중괄호는 format 치환 대상이 아니므로 이스케이프
+USER = TREND_CONSISTENCY_PROMPT.strip().replace("{", "{{").replace("}", "}}") + """
+
+[규칙]
+- consistency는 "높음" | "중간" | "낮음" 중 하나
+- supporting_points / conflicting_points는 타임라인의 주차(week)와 Fact를 인용
+- observe_period_months는 입력 기간(개월) 그대로
+
+[경쟁사] {company}
+[관찰 기간(개월)] {months}
+[타임라인(JSON 배열, 주차순)]
+{timeline}
+"""
+
+SCHEMA = {
+    "type": "object",
+    "required": ["consistency", "supporting_points", "conflicting_points"],
+    "properties": {
+        "consistency": {"enum": ["높음", "중간", "낮음"]},
+        "supporting_points": {"type": "array", "items": {"type": "string"}},
+        "conflicting_points": {"type": "array", "items": {"type": "string"}},
+        "observe_period_months": {"type": ["number", "string"]},
+    },
+}
+
+
+def compact_timeline(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    TimelineIndex 엔트리를 주차 버킷으로 묶어 프롬프트용으로 줄인다.
+    """
+    weeks: Dict[str, Dict[str, Any]] = {}
+    for e in entries:
+        w = weeks.setdefault(e.get("week", ""), {"week": e.get("week", ""), "signals": {}, "facts": []})
+        level = e.get("signal_level") or "?"
+        w["signals"][level] = w["signals"].get(level, 0) + 1
+        for f in e.get("facts", []) or []:
+            text = (f.get("what_happened") or "").strip()
+            if text:
+                w["facts"].append(f"[{level}] {text}")
+    return [weeks[k] for k in sorted(weeks)]
+
+
+@dataclass(frozen=True)
+class TrendConsistency:
+    llm: VertexLLM
+
+    def assess(self, company: str, entries: List[Dict[str, Any]], months: int) -> Dict[str, Any]:
+        prompt = USER.format(
+            company=company,
+            months=months,
+            timeline=json.dumps(compact_timeline(entries), ensure_ascii=False),
+        )
+        return self.llm.generate_json(
+            system_instruction=SYSTEM.strip(),
+            user_input=prompt,
+            temperature=0.0,
+            schema=SCHEMA,
+        )
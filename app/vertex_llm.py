@@ -1,21 +1,243 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 
 import vertexai
 from vertexai.generative_models import GenerativeModel, GenerationConfig
 
+from .cassette import default_cassette
+from .json_repair import JsonStream, repair_json, validate
+from .rate_limit import RateLimiter
+from .text_tokens import estimate_tokens
+
+
+REPAIR_SYSTEM = """
+너는 JSON 교정기다.
+입력된 JSON의 문법/스키마 오류만 고치고, 내용은 새로 만들어내지 않는다.
+출력은 반드시 JSON 하나만 반환한다.
+"""
+
+REPAIR_USER = """
+아래 JSON 출력에 오류가 있다. 오류만 고쳐서 JSON 하나로 다시 출력하라.
+
+[오류]
+{errors}
+
+[출력(JSON)]
+{text}
+"""
+
+# 이미 vertexai.init 한 (project, region) — 같은 프로세스에서 인스턴스를 다시 만들 때 재초기화 생략
+_INITIALIZED: set = set()
+
+CONCISE_HINT = """
+
+[재요청]
+직전 응답이 출력 한도에서 잘렸다. 같은 스키마로, 각 문자열을 더 짧게 써서 JSON만 다시 출력하라.
+"""
+
+# 최상위 JSON이 닫힌 뒤 이만큼 넘게 출력이 이어지면 폭주(공백/반복 출력)로 보고 끊는다
+RUNAWAY_TAIL_CHARS = 16
+
+FieldCallback = Callable[[str, Any], None]
+
+
+def _finished(finish: str) -> bool:
+    # 스트림 중간 조각은 FINISH_REASON_UNSPECIFIED(0)
+    return bool(finish) and "UNSPECIFIED" not in finish and finish != "0"
+
 
 @dataclass(frozen=True)
 class VertexLLM:
     project_id: str
     region: str
     model_name: str
+    # 여러 스레드가 같은 인스턴스를 쓸 때 분당 호출 수 제한 (None이면 제한 없음)
+    rate_limiter: Optional[RateLimiter] = field(default=None, compare=False, repr=False)
+    # 호출/복구 통계 (frozen이지만 dict 내용은 갱신)
+    stats: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+    # True면 스트리밍으로 받아 최상위 JSON이 닫히는 즉시 끊는다 (LLM_STREAM_MODE)
+    stream: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
 
     def __post_init__(self) -> None:
+        # replay에서는 자격 증명/네트워크 없이 돌 수 있게 초기화 생략
+        if default_cassette().replaying or (self.project_id, self.region) in _INITIALIZED:
+            return
         vertexai.init(project=self.project_id, location=self.region)
+        _INITIALIZED.add((self.project_id, self.region))
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def stream_line(self) -> str:
+        s = self.stats
+        n = s.get("stream_calls", 0)
+        if not n:
+            return ""
+        ttff_n = s.get("stream_first_field_n", 0)
+        ttff = f"{s.get('stream_first_field_ms', 0) // ttff_n}ms" if ttff_n else "-"
+        return (
+            f"스트리밍 {n}회 / 첫 필드 평균 {ttff} (전체 평균 {s.get('stream_total_ms', 0) // n}ms) / "
+            f"폭주 조기 종료 {s.get('stream_early_stop', 0)} (절약 최대 {s.get('stream_tokens_saved_max', 0)}토큰)"
+        )
+
+    def _stream_content(
+        self,
+        model: GenerativeModel,
+        user_input: str,
+        config: GenerationConfig,
+        *,
+        max_output_tokens: int,
+        on_field: Optional[FieldCallback],
+    ) -> Dict[str, Any]:
+        """
+        스트리밍 응답을 JsonStream으로 읽는다. 완결된 최상위 필드는 도착하는 대로 on_field(key, value)로 넘긴다.
+        최상위 값이 닫힌 뒤에는 종료 신호 또는 RUNAWAY_TAIL_CHARS 넘는 뒤따름 출력 중 먼저 오는 쪽에서 멈춘다
+        (후자면 스트림을 닫아 max_output_tokens까지 가는 폭주를 끊는다).
+        """
+        parser = JsonStream()
+        t0 = time.perf_counter()
+        first_ms: Optional[int] = None
+        used = 0
+        prompt_tokens = 0
+        finish = ""
+        cut = False
+        responses = model.generate_content(user_input, generation_config=config, stream=True)
+        try:
+            for chunk in responses:
+                try:
+                    piece = chunk.text or ""
+                except (ValueError, AttributeError):
+                    # 텍스트 없는 조각 (마지막 finish/usage 조각 등)
+                    piece = ""
+                fields = parser.feed(piece)
+                if fields and first_ms is None:
+                    first_ms = round((time.perf_counter() - t0) * 1000)
+                for key, value in fields:
+                    if on_field is not None:
+                        on_field(key, value)
+                usage = getattr(chunk, "usage_metadata", None)
+                used = int(getattr(usage, "candidates_token_count", 0) or 0) or used
+                prompt_tokens = int(getattr(usage, "prompt_token_count", 0) or 0) or prompt_tokens
+                try:
+                    finish = str(getattr(chunk.candidates[0], "finish_reason", "") or "") or finish
+                except (AttributeError, IndexError):
+                    pass
+                if _finished(finish):
+                    break
+                if parser.done and len(parser.tail) > RUNAWAY_TAIL_CHARS:
+                    cut = True
+                    break
+        finally:
+            close = getattr(responses, "close", None)
+            if callable(close):
+                close()
+
+        used = used or estimate_tokens(parser.text + parser.tail)
+        return {
+            "text": parser.text.strip(),
+            "usage": [prompt_tokens, used],
+            "hit_max": "MAX_TOKENS" in finish,
+            "first_field_ms": first_ms,
+            "total_ms": round((time.perf_counter() - t0) * 1000),
+            "early_stop": cut,
+            # 상한: 실제로 끊은 경우만, 끊지 않았다면 max_output_tokens까지 갔다고 가정한 값
+            # (모델이 곧 스스로 멈췄을 수도 있으므로 실제 절약은 이보다 작거나 같다)
+            "tokens_saved_max": max(0, max_output_tokens - used) if cut else 0,
+        }
+
+    def _generate_text(
+        self,
+        system_instruction: str,
+        user_input: str,
+        *,
+        temperature: float,
+        max_output_tokens: int,
+        on_field: Optional[FieldCallback] = None,
+    ) -> tuple[str, bool]:
+        """
+        Returns (text, hit_max_tokens).
+        stream=True면 on_field로 완결된 최상위 필드를 먼저 받는다 (replay에서는 녹화된 전체 텍스트 기준).
+        """
+        streamed: List[bool] = []
+
+        def call() -> Dict[str, Any]:
+            model = GenerativeModel(
+                self.model_name,
+                system_instruction=system_instruction,
+            )
+            config = GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                response_mime_type="application/json",
+            )
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.stream:
+                streamed.append(True)
+                return self._stream_content(
+                    model, user_input, config, max_output_tokens=max_output_tokens, on_field=on_field
+                )
+            resp = model.generate_content(user_input, generation_config=config)
+
+            finish = ""
+            try:
+                finish = str(getattr(resp.candidates[0], "finish_reason", "") or "")
+            except (AttributeError, IndexError):
+                pass
+            usage = getattr(resp, "usage_metadata", None)
+            return {
+                "text": (resp.text or "").strip(),
+                "hit_max": "MAX_TOKENS" in finish,
+                "usage": [
+                    int(getattr(usage, "prompt_token_count", 0) or 0),
+                    int(getattr(usage, "candidates_token_count", 0) or 0),
+                ],
+            }
+
+        self._count("calls")
+        request = {
+            "model": self.model_name,
+            "system": system_instruction,
+            "user": user_input,
+            "temperature": temperature,
+            "max_output_tokens": max_output_tokens,
+        }
+        out = default_cassette().call("vertex", request, call, label=self.model_name)
+        # 토큰 사용량: 응답 usage_metadata, 없으면(이전 녹화 등) 글자 수 추정
+        in_tok, out_tok = out.get("usage") or (0, 0)
+        self._count("in_tokens", in_tok or estimate_tokens(system_instruction + user_input))
+        self._count("out_tokens", out_tok or estimate_tokens(out["text"]))
+        if self.stream:
+            if not streamed and on_field is not None:
+                for key, value in JsonStream().feed(out["text"]):
+                    on_field(key, value)
+            self._count("stream_calls")
+            if out.get("first_field_ms") is not None:
+                self._count("stream_first_field_ms", out["first_field_ms"])
+                self._count("stream_first_field_n")
+            self._count("stream_total_ms", out.get("total_ms", 0))
+            self._count("stream_early_stop", int(bool(out.get("early_stop"))))
+            self._count("stream_tokens_saved_max", out.get("tokens_saved_max", 0))
+        return out["text"], out["hit_max"]
+
+    def _parse(self, text: str, schema: Optional[Dict[str, Any]]) -> tuple[Any, List[str], bool]:
+        """
+        Returns (value, errors, truncated). value is None if nothing could be recovered.
+        """
+        res = repair_json(text)
+        if res is None:
+            return None, ["not valid JSON"], False
+        if res.repaired:
+            self._count("repaired")
+        errors = validate(res.value, schema) if schema else []
+        return res.value, errors, res.truncated
 
     def generate_json(
         self,
@@ -24,32 +246,57 @@ class VertexLLM:
         *,
         temperature: float = 0.0,
         max_output_tokens: int = 2048,
+        schema: Optional[Dict[str, Any]] = None,
+        on_field: Optional[FieldCallback] = None,
     ) -> Dict[str, Any]:
         """
         Calls Gemini on Vertex AI and returns parsed JSON.
-        Raises ValueError if the model output is not valid JSON.
+
+        - stream=True면 최상위 JSON이 닫히는 즉시 생성을 끊고, 완결된 필드를 on_field(key, value)로 먼저 넘긴다
+          (재요청이 일어나면 on_field가 다시 호출될 수 있음)
+
+        - 깨진 JSON(코드펜스, 뒤따르는 텍스트, max_output_tokens 잘림)은 로컬에서 먼저 복구
+        - schema가 주어지면 검증하고, 실패 시 이 항목만 1회 재요청
+          - 잘림: 원래 요청 + 간결화 지시
+          - 그 외: 깨진 출력 + 오류 목록만 보내는 교정 요청(원문 재전송 없음)
+        Raises ValueError if the output is still not valid JSON.
         """
-        model = GenerativeModel(
-            self.model_name,
-            system_instruction=system_instruction,
+        text, hit_max = self._generate_text(
+            system_instruction,
+            user_input,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            on_field=on_field,
         )
+        if not text:
+            raise ValueError("Empty model response")
 
-        resp = model.generate_content(
-            user_input,
-            generation_config=GenerationConfig(
+        value, errors, truncated = self._parse(text, schema)
+        if value is not None and not errors:
+            return value
+
+        self._count("retried")
+        if hit_max or truncated:
+            text, _ = self._generate_text(
+                system_instruction,
+                user_input + CONCISE_HINT,
                 temperature=temperature,
                 max_output_tokens=max_output_tokens,
-                response_mime_type="application/json",
-            ),
-        )
+                on_field=on_field,
+            )
+        else:
+            text, _ = self._generate_text(
+                REPAIR_SYSTEM.strip(),
+                REPAIR_USER.format(errors="\n".join(f"- {e}" for e in errors[:10]), text=text[:6000]),
+                temperature=0.0,
+                max_output_tokens=max_output_tokens,
+            )
 
-        text = (resp.text or "").strip()
-        if not text:
-            raise ValueError("Empty model response")
+        value, errors, _ = self._parse(text, schema)
+        if value is not None and not errors:
+            return value
 
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError as e:
-            # Helpful debug payload (keep short)
-            snippet = text[:800]
-            raise ValueError(f"Model output is not valid JSON. Snippet: {snippet}") from e
+        self._count("failed")
+        # Helpful debug payload (keep short)
+        snippet = text[:800]
+        raise ValueError(f"Model output is not valid JSON ({'; '.join(errors[:3])}). Snippet: {snippet}")
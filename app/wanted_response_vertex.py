@@ -2,25 +2,26 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from .vertex_llm import VertexLLM
+from .tenants import WANTED, TenantProfile
+from .vertex_llm import FieldCallback, VertexLLM
 
 
 SYSTEM = """
-너는 원티드랩의 채용사업개발 전략 담당자다.
-경쟁사 가설을 바탕으로 원티드 대응 옵션을 제시한다.
+너는 {role}다.
+경쟁사 가설을 바탕으로 {name} 대응 옵션을 제시한다.
 출력은 반드시 JSON 하나만 반환한다.
 """
 
 USER = """
-아래 '경쟁사 전략 가설'을 바탕으로 원티드 대응 옵션을 3가지로 제시하라.
-
+아래 '경쟁사 전략 가설'을 바탕으로 {name} 대응 옵션을 3가지로 제시하라.
+{context}
 [규칙]
 - 반드시 3가지: Do Nothing / Defensive / Offensive
 - 실행 방안은 구체적인 액션 단위로
 - 리스크 포함
-- 출력은 JSON만
+{rules}- 출력은 JSON만
 
 [출력(JSON)]
 {{
@@ -33,11 +34,57 @@ USER = """
 {hypothesis}
 """
 
+_OPTION = {
+    "type": "object",
+    "properties": {
+        "actions": {"type": "array", "items": {"type": "string"}},
+        "impact": {"type": "string"},
+        "risks": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+SCHEMA = {
+    "type": "object",
+    "required": ["do_nothing", "defensive", "offensive"],
+    "properties": {
+        "do_nothing": {
+            "type": "object",
+            "required": ["why"],
+            "properties": {
+                "why": {"type": "string"},
+                "risks": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+        "defensive": dict(_OPTION, required=["actions"]),
+        "offensive": dict(_OPTION, required=["actions"]),
+    },
+}
+
 
 @dataclass(frozen=True)
-class WantedResponse:
+class TenantResponse:
+    """
+    테넌트(사업부) 관점의 대응 옵션. 기본은 원티드.
+    """
     llm: VertexLLM
+    tenant: TenantProfile = WANTED
+
+    def propose(self, hypothesis_json: Dict[str, Any], on_field: Optional[FieldCallback] = None) -> Dict[str, Any]:
+        t = self.tenant
+        prompt = USER.format(
+            name=t.name,
+            context=f"\n[우리 사업 맥락]\n{t.context}\n" if t.context else "",
+            rules="".join(f"- {r}\n" for r in t.rules),
+            hypothesis=json.dumps(hypothesis_json, ensure_ascii=False),
+        )
+        return self.llm.generate_json(
+            system_instruction=SYSTEM.format(role=t.role, name=t.name).strip(),
+            user_input=prompt,
+            temperature=0.0,
+            schema=SCHEMA,
+            on_field=on_field,
+        )
+
 
-    def propose(self, hypothesis_json: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = USER.format(hypothesis=json.dumps(hypothesis_json, ensure_ascii=False))
-        return self.llm.generate_json(system_instruction=SYSTEM.strip(), user_input=prompt, temperature=0.0)
+# 기존 이름 유지 (원티드 단일 테넌트)
+WantedResponse = TenantResponse
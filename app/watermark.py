@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """
+    증분 수집 기준 시각. data/state/<name>.json
+
+    - value: 지금까지 처리(또는 큐에 등록)한 기사 중 가장 늦은 published_at
+    - advance(): 뒤로는 움직이지 않는다
+    """
+    path: Path = Path("data/state/daily_watermark.json")
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def get(self) -> Optional[datetime]:
+        v = self._load().get("published_at")
+        return datetime.fromisoformat(v) if v else None
+
+    def advance(self, value: datetime, *, run_at: datetime) -> datetime:
+        cur = self.get()
+        if cur is not None and cur >= value:
+            value = cur
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "published_at": value.astimezone(timezone.utc).isoformat(),
+                    "last_run_at": run_at.astimezone(timezone.utc).isoformat(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+        return value
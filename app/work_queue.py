@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    bucket INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,          -- 작을수록 먼저 임대 (공정 스케줄 순위)
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending | leased | done | dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_status ON items(status, lease_until);
+"""
+
+BUCKETS = 1024
+
+
+def _bucket(key: str) -> int:
+    return int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % BUCKETS
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    id: int
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass(frozen=True)
+class WorkQueue:
+    """
+    파일 기반(stdlib sqlite3) 내구성 작업 큐.
+
+    - enqueue: key 단위 멱등 (이미 있는 key는 무시 — 완료된 작업은 다시 하지 않음)
+    - lease: 원자적으로 n건 임대 (priority → 등록순). 임대 만료(프로세스 종료 등)된 항목은 다른 워커가 다시 가져감
+    - reprioritize: 대기 항목의 priority를 실행마다 다시 매김 (남은 항목이 새 공정 스케줄을 앞지르지 않게)
+    - fail: max_attempts 도달 시 dead(데드레터)로 이동
+    - shard/shards: key 해시 버킷으로 여러 프로세스/CI matrix job에 나눠 처리
+    """
+    path: Path = Path("data/queue/extract.sqlite3")
+    max_attempts: int = 3
+    lease_sec: int = 300
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.executescript(SCHEMA_SQL)
+        # priority 컬럼이 없던 기존 큐 파일 마이그레이션
+        if "priority" not in {r[1] for r in conn.execute("PRAGMA table_info(items)")}:
+            try:
+                conn.execute("ALTER TABLE items ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e):
+                    raise
+        conn.execute("CREATE INDEX IF NOT EXISTS items_priority ON items(status, priority, id)")
+        return conn
+
+    def enqueue(self, key: str, payload: Dict[str, Any], priority: float = 0.0) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO items(key, bucket, payload, priority, enqueued_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, _bucket(key), json.dumps(payload, ensure_ascii=False), priority, now, now),
+            )
+            return cur.rowcount > 0
+
+    def pending(self) -> List[WorkItem]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, key, payload, attempts FROM items WHERE status='pending' ORDER BY priority, id"
+            ).fetchall()
+        return [WorkItem(id=r[0], key=r[1], payload=json.loads(r[2]), attempts=r[3]) for r in rows]
+
+    def reprioritize(self, priorities: Dict[str, float]) -> None:
+        """
+        key → priority. 대기/임대 만료 대상(pending, leased)만 바꾸고 done/dead는 그대로 둔다.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "UPDATE items SET priority=?, updated_at=? WHERE key=? AND status IN ('pending', 'leased')",
+                    [(p, now, k) for k, p in priorities.items()],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def lease(self, worker: str, n: int = 1, *, shard: int = 0, shards: int = 1) -> List[WorkItem]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 만료된 임대 중 시도 횟수를 다 쓴 항목은 데드레터로
+                conn.execute(
+                    "UPDATE items SET status='dead', last_error=COALESCE(last_error, 'lease expired'), updated_at=? "
+                    "WHERE status='leased' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                rows = conn.execute(
+                    "SELECT id, key, payload, attempts FROM items "
+                    "WHERE (status='pending' OR (status='leased' AND lease_until < ?)) AND bucket % ? = ? "
+                    "ORDER BY priority, id LIMIT ?",
+                    (now, max(1, shards), shard, n),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE items SET status='leased', worker=?, lease_until=?, attempts=attempts+1, updated_at=? "
+                    "WHERE id=?",
+                    [(worker, now + self.lease_sec, now, r[0]) for r in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [WorkItem(id=r[0], key=r[1], payload=json.loads(r[2]), attempts=r[3] + 1) for r in rows]
+
+    def complete(self, item_id: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE items SET status='done', lease_until=NULL, last_error=NULL, updated_at=? WHERE id=?",
+                (time.time(), item_id),
+            )
+
+    def fail(self, item_id: int, error: str) -> str:
+        """
+        실패 기록. 반환: 'pending'(재시도 예정) 또는 'dead'
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT attempts FROM items WHERE id=?", (item_id,)).fetchone()
+            status = "dead" if row and row[0] >= self.max_attempts else "pending"
+            conn.execute(
+                "UPDATE items SET status=?, lease_until=NULL, last_error=?, updated_at=? WHERE id=?",
+                (status, error[:500], time.time(), item_id),
+            )
+        return status
+
+    def counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()
+        return {s: n for s, n in rows}
+
+    def dead_items(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT key, attempts, last_error FROM items WHERE status='dead' ORDER BY updated_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"key": k, "attempts": a, "last_error": e} for k, a, e in rows]
+
+    def requeue_dead(self) -> int:
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "UPDATE items SET status='pending', attempts=0, updated_at=? WHERE status='dead'",
+                (time.time(),),
+            )
+            return cur.rowcount